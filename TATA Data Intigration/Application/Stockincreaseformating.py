@@ -1,64 +1,35 @@
-import openpyxl
-from openpyxl.styles import Alignment, Border, Side, Font, PatternFill
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import logging
 import pandas as pd
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.reader import read_excel
+from scs_core.writer import ReportWriter, BORDERED, CENTERED, YELLOW
 
 # Set up logging
 logging.basicConfig(filename='excel_processor.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def format_header(sheet):
-    yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-    bold_font = Font(bold=True)
-
-    for cell in sheet[1]:  # Assuming the first row is the header
-        cell.font = bold_font
-        cell.fill = yellow_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-
-def apply_borders(sheet):
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
-    for row in sheet.iter_rows():
-        for cell in row:
-            cell.border = thin_border
+# Stock increase files: yellow bold header, every cell centred with a thin border
+CELL_STYLE = dict(BORDERED, **CENTERED)
+HEADER_STYLE = dict(CELL_STYLE, bold=True, bg_color=YELLOW)
 
-def auto_fit_columns(sheet):
-    for column in sheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter  # Get the column letter (A, B, C, ...)
-        for cell in column:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except Exception as e:
-                logging.error(f"Error calculating width for cell {cell.coordinate}: {e}")
-        adjusted_width = (max_length + 2)
-        sheet.column_dimensions[column_letter].width = adjusted_width
+def save_formatted(sheets, file_path):
+    """Writes {sheet name: DataFrame} with the stock increase styles in one pass."""
+    with ReportWriter(file_path) as writer:
+        for sheet_name, df in sheets.items():
+            writer.write_sheet(df, sheet_name, header=HEADER_STYLE, body=CELL_STYLE)
 
 def process_excel_file(file_path):
+    temp_path = file_path + '.tmp'
     try:
-        workbook = openpyxl.load_workbook(file_path)
-        
-        for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
-            
-            for row in sheet.iter_rows():
-                for cell in row:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            format_header(sheet)
-            apply_borders(sheet)
-            auto_fit_columns(sheet)
-        
-        workbook.save(file_path)
+        # Rewrite the workbook with the styles instead of styling it cell by cell
+        sheets = read_excel(file_path, sheet_name=None, use_cache=False)
+        save_formatted(sheets, temp_path)
+        os.replace(temp_path, file_path)
         logging.info(f"Successfully processed: {file_path}")
     
     except PermissionError:
@@ -67,22 +38,22 @@ def process_excel_file(file_path):
     except Exception as e:
         logging.error(f"An error occurred while processing {file_path}: {e}")
         messagebox.showerror("Error", f"An error occurred while processing {file_path}. Check logs for details.")
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
 def convert_and_process_file(file_path):
     try:
         # Convert .xls or .csv to .xlsx using pandas
         if file_path.endswith('.xls') or file_path.endswith('.csv'):
             # Read the file into a DataFrame
-            df = pd.read_excel(file_path, engine='xlrd') if file_path.endswith('.xls') else pd.read_csv(file_path)
+            df = read_excel(file_path) if file_path.endswith('.xls') else pd.read_csv(file_path)
             
-            # Save the DataFrame as an .xlsx file
+            # Save the DataFrame as a formatted .xlsx file
             temp_xlsx = file_path.rsplit('.', 1)[0] + '.xlsx'
-            df.to_excel(temp_xlsx, index=False, engine='openpyxl')
-            
-            logging.info(f"Converted {file_path} to {temp_xlsx}")
+            save_formatted({'Sheet1': df}, temp_xlsx)
             
-            # Process the newly created .xlsx file
-            process_excel_file(temp_xlsx)
+            logging.info(f"Converted and formatted {file_path} as {temp_xlsx}")
             
             # Optionally, remove the temporary .xlsx file
             os.remove(temp_xlsx)
@@ -2,7 +2,12 @@
 # Contact: 9129572268
 # Copyright © 2024 Vishal. All Rights Reserved.
 
-import subprocess
+import os
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.registry import ScriptRegistry, format_record
 
 # List of your script paths and their names for the menu
 scripts = [
@@ -16,9 +21,15 @@ scripts = [
     ("8. StockuploadTATACV&PV", "C:/Users/Vishal/Desktop/TATA PCBU/StockuploadTATACV&PV.py")
 ]
 
-def run_script(script_path):
-    """Function to run the selected script."""
-    subprocess.run(["python", script_path])
+# Every script runs in this process, so pandas and the masters are loaded once per session
+registry = ScriptRegistry()
+for name, path in scripts:
+    registry.register(name, path)
+
+def run_script(name):
+    """Function to run the selected script and report its wall time."""
+    record = registry.run(name)
+    print(f"\n{format_record(record)}")
 
 def show_menu():
     """Function to show the main menu."""
@@ -45,13 +56,15 @@ def main():
         
         # If the user wants to exit, break the loop
         if choice == 0:
+            for record in registry.history:
+                print(format_record(record))
             print("Exiting the application.")
             break
         
         # Ensure the choice is valid
         if 1 <= choice <= 8:
-            selected_script = scripts[choice - 1][1]
-            print(f"\nRunning {scripts[choice - 1][0]}...\n")
+            selected_script = scripts[choice - 1][0]
+            print(f"\nRunning {selected_script}...\n")
             run_script(selected_script)
         else:
             print("Invalid choice. Please enter a number between 1 and 8.")
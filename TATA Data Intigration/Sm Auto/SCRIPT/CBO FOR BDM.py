@@ -3,6 +3,14 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from openpyxl.utils import get_column_letter
 from datetime import datetime
+import os
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "checklist"))
+from scs_core.locations import get_resolver
+from scs_core.partmaster import part_text
+from scs_core.quantities import parse_quantities
 
 def load_input_file():
     input_file_path.set(filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx;*.xls")]))
@@ -35,7 +43,7 @@ def process_files():
 
         # Convert 'Product' column to string
         if 'Product' in df.columns:
-            df['Product'] = df['Product'].astype(str)
+            df['Product'] = part_text(df['Product'])
         else:
             print("Column 'Product' not found in input data.")
 
@@ -63,7 +71,7 @@ def process_files():
         print("First few rows of input data after processing:")
         print(df.head())
 
-        # Remove 'ea' and convert to float then to int for specified columns
+        # Quantities like '1,234 ea' as integers (blanks 0)
         quantity_columns = [
             'Requested Quantity', 'Confirmed Quantity', 
             'Fulfilled Quantity', 'Invoiced Quantity', 
@@ -73,29 +81,20 @@ def process_files():
         for col in quantity_columns:
             if col in df.columns:
                 print(f"Processing column: {col}")
-                df[col] = df[col].str.replace('ea', '').str.replace(',', '').astype(float).fillna(0).astype(int)
+                df[col] = parse_quantities(df[col])
             else:
                 print(f"Column '{col}' not found in input data.")
 
-        # Load location mapping from 'Monthly data locations' sheet
+        # Location names come from the 'Monthly data locations' sheet (ZShip From -> Location Name)
+        locations = get_resolver()
         try:
-            location_mapping_df = pd.read_excel(location_path, sheet_name='Monthly data locations')
+            locations.index('ship_from', location_path)
         except ValueError as e:
-            messagebox.showerror("Error", "Sheet 'Monthly data locations' not found. Please check the sheet name.")
-            print("Available sheets:", pd.ExcelFile(location_path).sheet_names)
+            messagebox.showerror("Error", f"Location mapping file: {e}")
             return
 
-        print("Columns in location mapping file:", location_mapping_df.columns.tolist())
-
-        # Check if 'ZShip From' exists in mapping
-        if 'ZShip From' not in location_mapping_df.columns or 'Location Name' not in location_mapping_df.columns:
-            raise KeyError("'ZShip From' or 'Location Name' column not found in location mapping file.")
-
-        # Create location mapping dictionary
-        location_mapping = dict(zip(location_mapping_df['ZShip From'], location_mapping_df['Location Name']))
-
         # Add Location name based on mapping
-        df['Location name'] = df['ZShip From'].map(location_mapping)
+        df['Location name'] = locations.resolve(df['ZShip From'], 'ship_from', location_path)
 
         # Define the desired column order
         desired_columns = [
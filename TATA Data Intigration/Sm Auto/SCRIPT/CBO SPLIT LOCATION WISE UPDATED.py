@@ -6,6 +6,13 @@ from openpyxl import Workbook
 from openpyxl.styles import Font
 from datetime import datetime
 import os
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "checklist"))
+from scs_core.locations import get_resolver
+from scs_core.partmaster import part_text
+from scs_core.quantities import parse_quantities
 
 def load_input_file():
     input_file_path.set(filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx;*.xls")]))
@@ -43,7 +50,7 @@ def process_files():
 
         # Ensure 'Product' is treated as text
         if 'Product' in df.columns:
-            df['Product'] = df['Product'].astype(str)
+            df['Product'] = part_text(df['Product'])
         else:
             raise KeyError("Column 'Product' not found.")
 
@@ -71,21 +78,17 @@ def process_files():
         # Process numeric columns
         for col in ['Requested Quantity', 'Confirmed Quantity', 'Fulfilled Quantity', 'Invoiced Quantity', 'Pending Qty']:
             if col in df.columns:
-                df[col] = df[col].str.replace('ea', '').str.replace(',', '')
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+                df[col] = parse_quantities(df[col])
 
-        # Load location mapping file
+        # Load location mapping file ('Monthly data locations' sheet: ZShip From -> Location Name)
+        locations = get_resolver()
         try:
-            location_mapping_df = pd.read_excel(location_path, sheet_name='Monthly data locations')
-        except ValueError:
-            messagebox.showerror("Error", "Sheet 'Monthly data locations' not found.")
+            locations.index('ship_from', location_path)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Location mapping file: {e}")
             return
 
-        if 'ZShip From' not in location_mapping_df.columns or 'Location Name' not in location_mapping_df.columns:
-            raise KeyError("'ZShip From' or 'Location Name' column not found in location mapping file.")
-
-        location_mapping = dict(zip(location_mapping_df['ZShip From'], location_mapping_df['Location Name']))
-        df['Location'] = df['ZShip From'].map(location_mapping)
+        df['Location'] = locations.resolve(df['ZShip From'], 'ship_from', location_path)
 
         main_output_columns = [
             'Account', 'PartyName', 'Sales Order', 'External Partner',
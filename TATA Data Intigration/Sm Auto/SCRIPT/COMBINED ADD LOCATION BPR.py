@@ -1,6 +1,12 @@
 import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox
+import os
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "checklist"))
+from scs_core.locations import get_resolver
 
 class FileCombinerApp:
     def __init__(self, root):
@@ -69,12 +75,9 @@ class FileCombinerApp:
             return
         
         try:
-            # Read the location mapping file
-            mapping_df = pd.read_excel(mapping_file)
-            
-            # Ensure 'Sold_To_Party' and 'Location' columns are present
-            if 'Sold_To_Party' not in mapping_df.columns or 'Location' not in mapping_df.columns:
-                raise ValueError("Location mapping file must have 'Sold_To_Party' and 'Location' columns.")
+            # Read the location mapping file (raises when 'Sold_To_Party' or 'Location' is missing)
+            locations = get_resolver()
+            locations.index('sold_to', mapping_file)
             
             # Initialize an empty list to hold DataFrames
             dataframes = []
@@ -87,8 +90,8 @@ class FileCombinerApp:
                 if 'Sold_To_Party' not in df.columns:
                     raise ValueError(f"File {file_path} does not have 'Sold_To_Party' column.")
                 
-                # Merge with mapping to add 'Location'
-                df = df.merge(mapping_df, on='Sold_To_Party', how='left')
+                # Add the 'Location' of each Sold_To_Party
+                df['Location'] = locations.resolve(df['Sold_To_Party'], 'sold_to', mapping_file)
                 
                 # Append to the list of DataFrames
                 dataframes.append(df)
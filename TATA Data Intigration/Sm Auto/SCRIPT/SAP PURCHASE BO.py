@@ -1,8 +1,114 @@
-import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 from datetime import datetime
+import sys
+import argparse
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "checklist"))
+from scs_core.lazy import lazy_import, warm_up
+from scs_core.batch import run_pipeline, completed, nothing_to_do, show_result, print_result, add_output_arguments
+
+# pandas and the engine modules are imported on first use, so the window opens at once
+pd = lazy_import("pandas")
+
+def generate_output_file_name(output_folder, base_name):
+    count = 1
+    output_file_name = f"{base_name}.xlsx"
+    output_file_path = os.path.join(output_folder, output_file_name)
+
+    while os.path.exists(output_file_path):
+        output_file_name = f"{base_name} {count}.xlsx"
+        output_file_path = os.path.join(output_folder, output_file_name)
+        count += 1
+
+    return output_file_path
+
+def write_backorders(df, output_file_path):
+    """Writes df with 'Part No' as text and widths fitted to the content."""
+    with pd.ExcelWriter(output_file_path, engine='xlsxwriter') as writer:
+        df.to_excel(writer, index=False, sheet_name='Sheet1')
+        worksheet = writer.sheets['Sheet1']
+
+        # Set 'Part No' column to text format
+        if 'Part No' in df.columns:
+            part_no_col_idx = df.columns.get_loc('Part No')
+            text_format = writer.book.add_format({'num_format': '@'})  # Text format
+            worksheet.set_column(part_no_col_idx, part_no_col_idx, None, text_format)
+
+        # Auto-fit columns based on content width
+        for idx, col in enumerate(df.columns):
+            max_length = max(df[col].astype(str).apply(len).max(), len(col)) + 2
+            worksheet.set_column(idx, idx, max_length)
+
+def combine_backorders(base_folder, location_file, output_folder):
+    """Sm Auto BackOrder All Location (every SAP purchase backorder file of base_folder
+    with its Location) and the Filtered BackOrder Data file; returns a RunResult.
+    """
+    from scs_core.reader import read_excel
+    from scs_core.collector import FrameCollector
+    from scs_core.locations import get_resolver
+    from scs_core.partmaster import part_text
+
+    base_files = [f for f in os.listdir(base_folder) if f.endswith('.xlsx') and not f.startswith('~')]
+    if not base_files:
+        return nothing_to_do("No Excel files found in the selected folder.")
+
+    collector = FrameCollector()
+    locations = get_resolver()
+
+    for base_file in base_files:
+        base_data = read_excel(os.path.join(base_folder, base_file))
+
+        # Check for duplicates in base data before merging
+        if base_data.duplicated().any():
+            print(f"Duplicate rows found in {base_file}:")
+            print(base_data[base_data.duplicated()])
+
+        # Add the Location of each Division from the location file
+        merged_data = base_data.copy()
+        merged_data['Location'] = locations.resolve(base_data['Division'], 'division', location_file)
+
+        # Remove duplicates after merging
+        merged_data = merged_data.drop_duplicates()
+
+        # Ensure 'Part No' is treated as string
+        if 'Part No' in merged_data.columns:
+            merged_data['Part No'] = part_text(merged_data['Part No'])
+
+        collector.add(merged_data, source=base_file)
+
+    combined_data = collector.build()
+
+    output_file_path = generate_output_file_name(output_folder, "Sm Auto BackOrder All Location")
+    write_backorders(combined_data, output_file_path)
+    outputs = [output_file_path]
+
+    # Now create the filtered file (the combined file stands without it)
+    warnings = []
+    try:
+        outputs.append(create_filtered_file(combined_data, output_folder))
+    except Exception as e:
+        warnings.append(f"An error occurred while creating the filtered file: {e}")
+
+    return completed(f"Combined file created successfully as '{os.path.basename(output_file_path)}'!", outputs, warnings)
+
+def create_filtered_file(combined_data, output_folder):
+    """Writes the Filtered BackOrder Data file and returns its path."""
+    from scs_core.orders import order_families
+
+    # Filtered data based on criteria
+    # Keep all orders but only SAP-000 orders with Days Pending <= 3
+    sap_000 = (order_families(combined_data['Order Number']) == 'SAP-000').to_numpy()
+    filtered_data = combined_data[~sap_000 | (combined_data['Days Pending'] <= 3)]
+
+    # Remove records where 'Order Date' is before or on 13 Oct 2024
+    filtered_data = filtered_data[pd.to_datetime(filtered_data['Order Date'], errors='coerce') > '2024-10-13']
+
+    filtered_file_path = generate_output_file_name(output_folder, "Filtered BackOrder Data")
+    write_backorders(filtered_data, filtered_file_path)
+    return filtered_file_path
 
 class LocationMapperApp:
     def __init__(self, master):
@@ -47,114 +153,32 @@ class LocationMapperApp:
         self.output_folder_path = filedialog.askdirectory(title="Select Output Folder")
         self.output_folder_label.config(text=f"Output Folder: {self.output_folder_path.split('/')[-1]}")
 
-    def generate_output_file_name(self, base_name):
-        count = 1
-        output_file_name = f"{base_name}.xlsx"
-        output_file_path = os.path.join(self.output_folder_path, output_file_name)
-
-        while os.path.exists(output_file_path):
-            output_file_name = f"{base_name} {count}.xlsx"
-            output_file_path = os.path.join(self.output_folder_path, output_file_name)
-            count += 1
-
-        return output_file_path
-
     def combine_files(self):
-        try:
-            if not self.base_folder_path or not self.location_file_path or not self.output_folder_path:
-                messagebox.showwarning("Warning", "Please select all files and the output folder.")
-                return
-
-            base_files = [f for f in os.listdir(self.base_folder_path) if f.endswith('.xlsx') and not f.startswith('~')]
-            if not base_files:
-                messagebox.showwarning("Warning", "No Excel files found in the selected folder.")
-                return
-
-            combined_data = pd.DataFrame()
-            location_data = pd.read_excel(self.location_file_path)
-
-            for base_file in base_files:
-                base_data = pd.read_excel(os.path.join(self.base_folder_path, base_file))
-
-                # Check for duplicates in base data before merging
-                if base_data.duplicated().any():
-                    print(f"Duplicate rows found in {base_file}:")
-                    print(base_data[base_data.duplicated()])
-
-                # Merge data
-                merged_data = base_data.merge(location_data[['Code', 'Final Location']], left_on='Division', right_on='Code', how='left')
-                merged_data.rename(columns={'Final Location': 'Location'}, inplace=True)
-                merged_data = merged_data.drop(columns=['Code'], errors='ignore')
-
-                # Remove duplicates after merging
-                merged_data = merged_data.drop_duplicates()
-
-                # Ensure 'Part No' is treated as string
-                if 'Part No' in merged_data.columns:
-                    merged_data['Part No'] = merged_data['Part No'].astype(str)
-
-                combined_data = pd.concat([combined_data, merged_data], ignore_index=True)
-
-            output_file_path = self.generate_output_file_name("Sm Auto BackOrder All Location")
-
-            with pd.ExcelWriter(output_file_path, engine='xlsxwriter') as writer:
-                combined_data.to_excel(writer, index=False, sheet_name='Sheet1')
-                worksheet = writer.sheets['Sheet1']
-
-                # Set 'Part No' column to text format
-                if 'Part No' in combined_data.columns:
-                    part_no_col_idx = combined_data.columns.get_loc('Part No')
-                    text_format = writer.book.add_format({'num_format': '@'})  # Text format
-                    worksheet.set_column(part_no_col_idx, part_no_col_idx, None, text_format)
-
-                # Auto-fit columns based on content width
-                for idx, col in enumerate(combined_data.columns):
-                    max_length = max(combined_data[col].astype(str).apply(len).max(), len(col)) + 2
-                    worksheet.set_column(idx, idx, max_length)
-
-            # Now create the filtered file
-            self.create_filtered_file(combined_data)
-
-            messagebox.showinfo("Success", f"Combined file created successfully as '{os.path.basename(output_file_path)}'!")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {e}")
-
-    def create_filtered_file(self, combined_data):
-        try:
-            # Filtered data based on criteria
-            # Keep all orders but only SAP-000 orders with Days Pending <= 3
-            filtered_data = combined_data[
-                (combined_data['Order Number'].str.startswith("SAP-000", na=False) & (combined_data['Days Pending'] <= 3)) |
-                (~combined_data['Order Number'].str.startswith("SAP-000", na=False))
-            ]
-
-            # Remove records where 'Order Date' is before or on 13 Oct 2024
-            filtered_data = filtered_data[pd.to_datetime(filtered_data['Order Date'], errors='coerce') > '2024-10-13']
-
-            filtered_file_path = self.generate_output_file_name("Filtered BackOrder Data")
-
-            with pd.ExcelWriter(filtered_file_path, engine='xlsxwriter') as writer:
-                filtered_data.to_excel(writer, index=False, sheet_name='Sheet1')
-                worksheet = writer.sheets['Sheet1']
-
-                # Set 'Part No' column to text format
-                if 'Part No' in filtered_data.columns:
-                    part_no_col_idx = filtered_data.columns.get_loc('Part No')
-                    text_format = writer.book.add_format({'num_format': '@'})  # Text format
-                    worksheet.set_column(part_no_col_idx, part_no_col_idx, None, text_format)
-
-                # Auto-fit columns based on content width
-                for idx, col in enumerate(filtered_data.columns):
-                    max_length = max(filtered_data[col].astype(str).apply(len).max(), len(col)) + 2
-                    worksheet.set_column(idx, idx, max_length)
-
-            messagebox.showinfo("Success", f"Filtered file created successfully as '{os.path.basename(filtered_file_path)}'!")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while creating the filtered file: {e}")
-
-if __name__ == "__main__":
+        if not self.base_folder_path or not self.location_file_path or not self.output_folder_path:
+            messagebox.showwarning("Warning", "Please select all files and the output folder.")
+            return
+
+        show_result(run_pipeline(combine_backorders, self.base_folder_path, self.location_file_path, self.output_folder_path))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Combine SAP purchase backorder files with their locations")
+    parser.add_argument("base_folder", help="Folder with the backorder .xlsx files")
+    parser.add_argument("location_file", help="Location mapping file (Code -> Final Location)")
+    parser.add_argument("output_folder", help="Folder the combined and filtered files are written to")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    result = run_pipeline(combine_backorders, args.base_folder, args.location_file, args.output_folder)
+    return print_result(result, as_json=args.json)
+
+def run_gui():
     root = tk.Tk()
     app = LocationMapperApp(root)
+
+    # Load pandas, openpyxl and the engine while the folders are being picked
+    warm_up("pandas", "openpyxl", "xlsxwriter", "scs_core.reader", "scs_core.collector",
+            "scs_core.locations", "scs_core.partmaster", "scs_core.orders")
     root.mainloop()
+
+if __name__ == "__main__":
+    # Without arguments the window opens; with them the files are combined headless
+    sys.exit(main() if len(sys.argv) > 1 else run_gui())
@@ -2,8 +2,11 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import pandas as pd
 import os
-from openpyxl import load_workbook
-from openpyxl.styles import NamedStyle
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "checklist"))
+from scs_core.writer import ReportWriter, TEXT
 
 def select_sap_file():
     file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx;*.xls"), ("CSV files", "*.csv")])
@@ -29,36 +32,10 @@ def get_output_file_name(base_name, extension):
         new_file_name = f"{base_name} {counter}.{extension}"
     return new_file_name
 
-def auto_fit_columns(file_path):
-    """ Auto-fit columns in the Excel file. """
-    workbook = load_workbook(file_path)
-    for sheet in workbook.sheetnames:
-        worksheet = workbook[sheet]
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter  # Get the column letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = (max_length + 2)  # Add some padding
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-    workbook.save(file_path)
-
-def set_column_format_as_text(file_path, column_name):
-    """ Set the specified column's format to text. """
-    workbook = load_workbook(file_path)
-    worksheet = workbook.active
-
-    text_style = NamedStyle(name='text_style', number_format='@')  # Text format
-
-    for row in range(2, worksheet.max_row + 1):  # Start from row 2 to skip header
-        cell = worksheet[f"{column_name}{row}"]
-        cell.style = text_style  # Apply text style
-
-    workbook.save(file_path)
+def save_report(df, file_path):
+    """ Write df with fitted column widths and 'PartNumber' formatted as text, in one pass. """
+    with ReportWriter(file_path) as writer:
+        writer.write_sheet(df, "Sheet1", column_styles={'PartNumber': TEXT})
 
 def run_merge():
     sap_file = sap_entry.get()
@@ -105,9 +82,7 @@ def run_merge():
         output_file = get_output_file_name(os.path.join(output_dir, output_base_name), output_extension)
 
         # Save merged output to a single file with sheet name "Sheet1"
-        merged_df.to_excel(output_file, index=False, sheet_name='Sheet1')
-        auto_fit_columns(output_file)  # Auto-fit columns in the merged file
-        set_column_format_as_text(output_file, 'D')  # Set 'PartNumber' column (D) format to text
+        save_report(merged_df, output_file)
         messagebox.showinfo("Success", f"Merged file created successfully: {output_file}")
 
         # Define retail and tass locations
@@ -130,17 +105,13 @@ def run_merge():
         # Create Retail file
         retail_df = merged_df[merged_df['Location'].isin(retail_locations)]
         retail_file = os.path.join(output_dir, 'OemInvoice Retail.xlsx')
-        retail_df.to_excel(retail_file, index=False, sheet_name='Sheet1')
-        auto_fit_columns(retail_file)  # Auto-fit columns in the retail file
-        set_column_format_as_text(retail_file, 'D')  # Set 'PartNumber' column (D) format to text
+        save_report(retail_df, retail_file)
         print(f"Created file for retail locations: {retail_file}")
 
         # Create Tass file
         tass_df = merged_df[merged_df['Location'].isin(tass_locations)]
         tass_file = os.path.join(output_dir, 'OemInvoice Tass.xlsx')
-        tass_df.to_excel(tass_file, index=False, sheet_name='Sheet1')
-        auto_fit_columns(tass_file)  # Auto-fit columns in the tass file
-        set_column_format_as_text(tass_file, 'D')  # Set 'PartNumber' column (D) format to text
+        save_report(tass_df, tass_file)
         print(f"Created file for tass locations: {tass_file}")
 
     except Exception as e:
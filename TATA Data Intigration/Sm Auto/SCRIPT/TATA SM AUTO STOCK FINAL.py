@@ -1,8 +1,134 @@
-import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from openpyxl import load_workbook
 import traceback
+import os
+import sys
+import argparse
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "checklist"))
+from scs_core.lazy import lazy_import, warm_up
+from scs_core.batch import PipelineError, run_pipeline, completed, show_result, print_result, add_output_arguments
+
+# pandas and the engine modules are imported on first use, so the window opens at once
+pd = lazy_import("pandas")
+
+# Locations with their own stock upload file
+RETAIL_LOCATIONS = [
+    'Varanasi Retail',
+    'Lucknow STU Retail',
+    'Lucknow Retail',
+    'Gorakhpur Retail',
+    'Allahabad Retail',
+    'Chopan Retail',
+    'Faizabad Retail',
+    'Fatehpur Retail'
+]
+
+TASS_LOCATIONS = [
+    'Varanasi Tass',
+    'Lucknowes TASS'
+]
+
+def map_stock_files(input_files, output_dir):
+    """Stock Sm Auto Group All locations and the Retail / Tass stock upload files of
+    every SM Auto stock export in input_files; returns a RunResult.
+
+    A file that fails is reported as a warning and the other files are still processed.
+    """
+    outputs = []
+    error_messages = []
+
+    for input_file in input_files:
+        try:
+            outputs.extend(process_file(input_file, output_dir))
+        except Exception as e:
+            error_messages.append(f"Error processing {input_file}: {str(e)}")
+            print(traceback.format_exc())
+
+    if not outputs:
+        raise PipelineError("\n".join(error_messages) or "No input files given.")
+    if error_messages:
+        return completed("Some files could not be processed.", outputs, error_messages)
+    return completed("All files processed and saved successfully!", outputs)
+
+def process_file(input_file, output_dir):
+    """Maps one stock export and writes its files; returns their paths."""
+    from scs_core.locations import get_resolver
+
+    df = pd.read_excel(input_file)
+
+    if 'Site' not in df.columns:
+        raise ValueError(f"'Site' column is missing from the file: {input_file}")
+
+    # Map Site to Location (built-in SM Auto site table)
+    df['Location'] = get_resolver().resolve(df['Site'], 'site')
+
+    # Clean and convert quantity columns
+    clean_and_convert_qty(df)
+
+    # Save modified DataFrame with the new file name
+    output_file = f"{output_dir}/Stock Sm Auto Group All locations.xlsx"
+    save_formatted(df, output_file)
+
+    # Create files for specified locations
+    location_files = save_location_files(df, output_dir)
+
+    print(f"File processed and saved successfully: {output_file}")
+    return [output_file] + location_files
+
+def save_location_files(df, output_dir):
+    # Filter for retail locations and remove rows with Ending Qty <= 0
+    retail_df = df[(df['Location'].isin(RETAIL_LOCATIONS)) & (df['Ending Qty'] > 0)]
+    retail_df = format_output_dataframe(retail_df)
+
+    retail_file = f"{output_dir}/Stock upload Retail.xlsx"
+    save_formatted(retail_df, retail_file)
+    print(f"Retail locations file created: {retail_file}")
+
+    # Filter for tass locations and remove rows with Ending Qty <= 0
+    tass_df = df[(df['Location'].isin(TASS_LOCATIONS)) & (df['Ending Qty'] > 0)]
+    tass_df = format_output_dataframe(tass_df)
+
+    tass_file = f"{output_dir}/Stock upload Tass.xlsx"
+    save_formatted(tass_df, tass_file)
+    print(f"Tass locations file created: {tass_file}")
+    return [retail_file, tass_file]
+
+def format_output_dataframe(df):
+    """ Format the DataFrame to match required output structure. """
+    from scs_core.partmaster import part_text
+
+    output_df = pd.DataFrame({
+        'Partnumber': part_text(df['Product']),  # Ensuring Partnumber is treated as text
+        'Qty': df.get('Ending Qty', pd.Series(dtype='float')),  # Maintain Ending Qty as Qty
+        'Location': df['Location']  # Include Location
+    })
+
+    return output_df
+
+def clean_and_convert_qty(df):
+    from scs_core.quantities import parse_quantities
+
+    for qty_col in ['Opening Qty', 'Ending Qty']:
+        if qty_col in df.columns:
+            df[qty_col] = parse_quantities(df[qty_col], fill=None)
+        else:
+            raise ValueError(f"'{qty_col}' column is missing from the DataFrame.")
+
+def save_formatted(df, output_file):
+    """ Write df with Partnumber as text, General quantities and fitted widths. """
+    from scs_core.writer import ReportWriter, TEXT
+
+    column_styles = {'Partnumber': TEXT, 'Opening Qty': {'num_format': 'General'}, 'Ending Qty': {'num_format': 'General'}}
+    with ReportWriter(output_file) as writer:
+        writer.write_sheet(df, "Sheet1", column_styles=column_styles, widths=auto_fit_columns(df))
+
+def auto_fit_columns(df):
+    from scs_core.widths import column_widths
+
+    # Widths come from the DataFrame columns; a sample is enough on full stock exports
+    return column_widths(df, sample=50000)
 
 class ExcelMapperApp:
     def __init__(self, master):
@@ -36,156 +162,26 @@ class ExcelMapperApp:
             messagebox.showerror("Error", "Please select input files and output directory.")
             return
 
-        error_messages = []
-        
-        for input_file in self.input_files:
-            try:
-                self.process_file(input_file)
-            except Exception as e:
-                error_messages.append(f"Error processing {input_file}: {str(e)}")
-                print(traceback.format_exc())
-
-        if error_messages:
-            messagebox.showerror("Errors Encountered", "\n".join(error_messages))
-        else:
-            messagebox.showinfo("Success", "All files processed and saved successfully!")
-
-    def process_file(self, input_file):
-        df = pd.read_excel(input_file)
-
-        if 'Site' not in df.columns:
-            raise ValueError(f"'Site' column is missing from the file: {input_file}")
-
-        # Map Site to Location
-        site_location_mapping = self.get_site_location_mapping()
-        df['Location'] = df['Site'].map(site_location_mapping)
-
-        # Clean and convert quantity columns
-        self.clean_and_convert_qty(df)
-
-        # Save modified DataFrame with the new file name
-        output_file = f"{self.output_dir}/Stock Sm Auto Group All locations.xlsx"
-        df.to_excel(output_file, index=False, engine='openpyxl')
-
-        # Create files for specified locations
-        self.save_location_files(df)
-
-        # Adjust formats in the saved file
-        self.adjust_formats(output_file)
-
-        print(f"File processed and saved successfully: {output_file}")
-
-    def save_location_files(self, df):
-        # Define locations for Retail and Tass
-        retail_locations = [
-            'Varanasi Retail',
-            'Lucknow STU Retail',
-            'Lucknow Retail',
-            'Gorakhpur Retail',
-            'Allahabad Retail',
-            'Chopan Retail',
-            'Faizabad Retail',
-            'Fatehpur Retail'
-        ]
-
-        tass_locations = [
-            'Varanasi Tass',
-            'Lucknowes TASS'
-        ]
-
-        # Filter for retail locations and remove rows with Ending Qty <= 0
-        retail_df = df[(df['Location'].isin(retail_locations)) & (df['Ending Qty'] > 0)]
-        retail_df = self.format_output_dataframe(retail_df)
-
-        retail_file = f"{self.output_dir}/Stock upload Retail.xlsx"
-        retail_df.to_excel(retail_file, index=False, engine='openpyxl')
-        self.adjust_formats(retail_file)  # Adjust formats for retail file
-        print(f"Retail locations file created: {retail_file}")
-
-        # Filter for tass locations and remove rows with Ending Qty <= 0
-        tass_df = df[(df['Location'].isin(tass_locations)) & (df['Ending Qty'] > 0)]
-        tass_df = self.format_output_dataframe(tass_df)
-
-        tass_file = f"{self.output_dir}/Stock upload Tass.xlsx"
-        tass_df.to_excel(tass_file, index=False, engine='openpyxl')
-        self.adjust_formats(tass_file)  # Adjust formats for tass file
-        print(f"Tass locations file created: {tass_file}")
-
-    def format_output_dataframe(self, df):
-        """ Format the DataFrame to match required output structure. """
-        output_df = pd.DataFrame({
-            'Partnumber': df['Product'].astype(str),  # Ensuring Partnumber is treated as text
-            'Qty': df.get('Ending Qty', pd.Series(dtype='float')),  # Maintain Ending Qty as Qty
-            'Location': df['Location']  # Include Location
-        })
-
-        return output_df
-
-    def get_site_location_mapping(self):
-        return {
-            'C1.2VNS.RET': 'Varanasi Retail',
-            'C1.2VNS.SER': 'Varanasi Tass',
-            'C1.3LKO.INS': 'Lucknow STU Retail',
-            'C1.3LKO.RET': 'Lucknow Retail',
-            'C1.3LKO.SER': 'Lucknowes TASS',
-            'C1.3LKO.VOR': 'Lucknowvor Retail',
-            'C1.4GKP.RET': 'Gorakhpur Retail',
-            'C1.5ALD.RET': 'Allahabad Retail',
-            'C1.6SON.RET': 'Chopan Retail',
-            'C1.7FZP.RET': 'Faizabad Retail',
-            'C1.9FTP.RET': 'Fatehpur Retail'
-        }
-
-    def clean_and_convert_qty(self, df):
-        for qty_col in ['Opening Qty', 'Ending Qty']:
-            if qty_col in df.columns:
-                df[qty_col] = pd.to_numeric(
-                    df[qty_col].replace({'ea': '', ',': ''}, regex=True),
-                    errors='coerce'
-                )
-            else:
-                raise ValueError(f"'{qty_col}' column is missing from the DataFrame.")
-
-    def adjust_formats(self, output_file):
-        wb = load_workbook(output_file)
-        ws = wb.active
-
-        # Apply Text format to Partnumber
-        partnumber_col_idx = self.get_column_index(ws, 'Partnumber')
-        if partnumber_col_idx:
-            for cell in ws[ws.cell(row=1, column=partnumber_col_idx).column_letter]:
-                cell.number_format = '@'  # Set format to Text
-
-        # Apply General format to quantity columns
-        for col_name in ['Opening Qty', 'Ending Qty']:
-            col_idx = self.get_column_index(ws, col_name)
-            if col_idx:
-                for cell in ws[ws.cell(row=1, column=col_idx).column_letter]:
-                    cell.number_format = 'General'
-
-        # Auto-fit columns
-        self.auto_fit_columns(ws)
-
-        wb.save(output_file)
-
-    def get_column_index(self, ws, col_name):
-        for idx, cell in enumerate(ws[1], 1):  # Assuming first row has headers
-            if cell.value == col_name:
-                return idx
-        return None
-
-    def auto_fit_columns(self, ws):
-        for column in ws.columns:
-            max_length = 0
-            column = [cell for cell in column]
-            for cell in column:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            adjusted_width = (max_length + 2)
-            ws.column_dimensions[column[0].column_letter].width = adjusted_width
+        show_result(run_pipeline(map_stock_files, list(self.input_files), self.output_dir))
 
-# Create the main window
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Map SM Auto stock sites to locations and write the stock upload files")
+    parser.add_argument("input_files", nargs="+", help="SM Auto stock exports (.xlsx)")
+    parser.add_argument("--output-dir", required=True, help="Folder the output files are written to")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    return print_result(run_pipeline(map_stock_files, args.input_files, args.output_dir), as_json=args.json)
+
+def run_gui():
     root = tk.Tk()
     app = ExcelMapperApp(root)
+
+    # Load pandas, openpyxl and the engine while the files are being picked
+    warm_up("pandas", "openpyxl", "xlsxwriter", "scs_core.locations", "scs_core.partmaster",
+            "scs_core.quantities", "scs_core.writer")
     root.mainloop()
+
+# Create the main window
+if __name__ == "__main__":
+    # Without arguments the window opens; with them the files are mapped headless
+    sys.exit(main() if len(sys.argv) > 1 else run_gui())
@@ -1,8 +1,14 @@
 import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
+import os
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "checklist"))
+from scs_core.writer import ReportWriter, TEXT
+from scs_core.splitter import split_to_files, format_manifest
+from scs_core.partmaster import part_text
 
 class ExcelSplitterApp:
     def __init__(self, root):
@@ -65,27 +71,19 @@ class ExcelSplitterApp:
             df.rename(columns={'SKUCode': 'Partnumber', 'Norm': 'Qty'}, inplace=True)
             
             # Ensure 'Partnumber' is treated as text
-            df['Partnumber'] = df['Partnumber'].astype(str)
+            df['Partnumber'] = part_text(df['Partnumber'])
             
             # Keep only the required columns
             df = df[['Location', 'Partnumber', 'Qty']]
             
-            # Get the unique values in the 'Location' column
-            unique_values = df['Location'].unique()
-            
-            # Create separate files for each unique value
-            for value in unique_values:
-                # Sanitize the value for use in filenames
-                safe_value = str(value).replace('/', '_').replace('\\', '_')
-                
-                # Filter the data for the current unique value
-                filtered_df = df[df['Location'] == value]
-                
-                # Define the output file path
-                output_file = f"{output_folder}/{safe_value}.xlsx"
-                
-                # Save the filtered data to a new Excel file
-                self.save_to_excel(filtered_df, output_file)
+            # Create separate files for each location, partitioned in one groupby pass
+            manifest = split_to_files(df, 'Location', output_folder, write=self.save_to_excel)
+            print(format_manifest("Location files", manifest))
+
+            failed = [result for result in manifest if result.error]
+            if failed:
+                details = "\n".join(f"{os.path.basename(r.file)}: {r.error}" for r in failed)
+                raise ValueError(f"{len(failed)} files could not be saved:\n{details}")
             
             messagebox.showinfo("Success", "Files have been split and saved successfully.")
         
@@ -93,24 +91,9 @@ class ExcelSplitterApp:
             messagebox.showerror("Error", str(e))
 
     def save_to_excel(self, df, file_path):
-        # Create a new workbook and add a worksheet
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Sheet1"  # Set the sheet name to "Sheet1"
-
-        # Append the DataFrame header
-        ws.append(df.columns.tolist())
-        
-        # Append the DataFrame rows
-        for row in dataframe_to_rows(df, index=False, header=False):
-            ws.append(row)
-
-        # Format the 'Partnumber' column to ensure it is treated as text
-        for cell in ws['B']:
-            cell.number_format = '@'  # '@' format means text in Excel
-
-        # Save the workbook to the file path
-        wb.save(file_path)
+        # Write the rows to "Sheet1" with the 'Partnumber' column as text
+        with ReportWriter(file_path) as writer:
+            writer.write_sheet(df, "Sheet1", header=None, column_styles={'Partnumber': TEXT}, widths=None)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,10 +1,19 @@
 import os
+import multiprocessing
 import pandas as pd
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.styles import Font
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.reader import read_excel
+from scs_core.collector import FrameCollector
+from scs_core.dealertree import compile_tree
+from scs_core.jobs import JobPanel
 
 def log_error(message):
     """Logs errors to an error log file."""
@@ -23,21 +32,22 @@ def compile_excel_files(folder_path):
         return pd.DataFrame(), f"Permission denied: {folder_path}"
 
     excel_files = [f for f in files if f.endswith('.xlsx')]
-    compiled_df = pd.DataFrame()
 
     if not excel_files:
-        return compiled_df, "No Excel files found in the folder."
+        return pd.DataFrame(), "No Excel files found in the folder."
+
+    collector = FrameCollector()
 
     for file in excel_files:
         input_file = os.path.join(folder_path, file)
         try:
-            df = pd.read_excel(input_file, sheet_name=None)  # Read all sheets
+            df = read_excel(input_file, sheet_name=None)  # Read all sheets
             for sheet_name, sheet_data in df.items():
-                compiled_df = pd.concat([compiled_df, sheet_data], ignore_index=True)
+                collector.add(sheet_data, source=f"{file} [{sheet_name}]")
         except Exception as e:
             log_error(f"Error processing file {file}: {e}")
 
-    return compiled_df, None
+    return collector.build(), None
 
 def run_compile():
     """Runs the compilation process for all dealer folders."""
@@ -90,27 +100,71 @@ def run_compile():
     final_message = "\n".join(results)
     messagebox.showinfo("Processing Complete", f"Results:\n\n{final_message}")
 
-# Create the main window
-root = tk.Tk()
-root.title("TATA SCS Excel File Compiler")
+def run_tree_compile():
+    """Compiles every <brand>/<dealer>/<keyword> folder under the selected tree folder."""
+    tree_folder = tree_entry.get()
+    if not tree_folder:
+        messagebox.showwarning("Warning", "Please select the folder holding TATA PCBU and TATA CVBU.")
+        return
+    output_folder = tree_output_entry.get() or os.path.join(tree_folder, "Compiled")
+
+    # Runs on a worker thread (the dealers themselves in worker processes); the panel shows the progress
+    panel.start(compile_tree, tree_folder, output_folder, workers=workers_var.get())
+
+def browse_into(entry):
+    """Puts the selected folder into entry."""
+    folder_path = filedialog.askdirectory()
+    if folder_path:
+        entry.delete(0, tk.END)
+        entry.insert(0, folder_path)
+
+if __name__ == "__main__":
+    # Needed for the worker processes in the packaged .exe (they must not build this window)
+    multiprocessing.freeze_support()
+
+    # Create the main window
+    root = tk.Tk()
+    root.title("TATA SCS Excel File Compiler")
+
+    frame_header = tk.Frame(root, padx=10, pady=10)
+    frame_header.pack(fill=tk.X)
+
+    frame_buttons = tk.Frame(root, padx=10, pady=10)
+    frame_buttons.pack(fill=tk.X)
+
+    header_label = tk.Label(frame_header, text="TATA SCS Monthly Data Compiler", font=("Arial", 16, "bold"))
+    header_label.pack()
+
+    folder_entry = tk.Entry(frame_buttons, width=40)
+    folder_entry.pack(padx=5, pady=5)
+
+    browse_folder_button = tk.Button(frame_buttons, text="Browse Main Dealer Folder", command=lambda: folder_entry.insert(0, filedialog.askdirectory()), bg="lightgreen")
+    browse_folder_button.pack()
+
+    run_all_button = tk.Button(frame_buttons, text="Run All", command=run_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
+    run_all_button.pack()
 
-frame_header = tk.Frame(root, padx=10, pady=10)
-frame_header.pack(fill=tk.X)
+    # Whole dealer tree: every brand and dealer at once, in a pool of worker processes
+    frame_tree = tk.LabelFrame(root, text="All brands and dealers", padx=10, pady=10)
+    frame_tree.pack(fill=tk.X, padx=10, pady=5)
 
-frame_buttons = tk.Frame(root, padx=10, pady=10)
-frame_buttons.pack(fill=tk.X)
+    tree_entry = tk.Entry(frame_tree, width=40)
+    tree_entry.grid(row=0, column=0, padx=5, pady=5)
+    tk.Button(frame_tree, text="Browse Tree Folder", command=lambda: browse_into(tree_entry), bg="lightgreen").grid(row=0, column=1, padx=5, pady=5)
 
-header_label = tk.Label(frame_header, text="TATA SCS Monthly Data Compiler", font=("Arial", 16, "bold"))
-header_label.pack()
+    tree_output_entry = tk.Entry(frame_tree, width=40)
+    tree_output_entry.grid(row=1, column=0, padx=5, pady=5)
+    tk.Button(frame_tree, text="Browse Output Folder", command=lambda: browse_into(tree_output_entry), bg="lightgreen").grid(row=1, column=1, padx=5, pady=5)
 
-folder_entry = tk.Entry(frame_buttons, width=40)
-folder_entry.pack(padx=5, pady=5)
+    tk.Label(frame_tree, text="Worker processes:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+    workers_var = tk.IntVar(value=os.cpu_count() or 1)
+    tk.Spinbox(frame_tree, from_=1, to=os.cpu_count() or 1, textvariable=workers_var, width=5).grid(row=2, column=1, padx=5, pady=5, sticky="w")
 
-browse_folder_button = tk.Button(frame_buttons, text="Browse Main Dealer Folder", command=lambda: folder_entry.insert(0, filedialog.askdirectory()), bg="lightgreen")
-browse_folder_button.pack()
+    run_tree_button = tk.Button(frame_tree, text="Run Dealer Tree", command=run_tree_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
+    run_tree_button.grid(row=3, column=0, columnspan=2, pady=5)
 
-run_all_button = tk.Button(frame_buttons, text="Run All", command=run_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
-run_all_button.pack()
+    # Progress, elapsed time and rows per second of the tree compile, with Cancel
+    panel = JobPanel(frame_tree, title="Dealer Tree Compile").grid(row=4, column=0, columnspan=2, pady=5)
 
-# Start the GUI event loop
-root.mainloop()
+    # Start the GUI event loop
+    root.mainloop()
@@ -4,6 +4,12 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import xlsxwriter
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.orders import order_families
+from scs_core.splitter import split_to_files, format_manifest
 
 def load_location_mapping(mapping_file):
     """Load location mapping from an Excel file."""
@@ -15,6 +21,25 @@ def load_location_mapping(mapping_file):
         messagebox.showerror("PO Upload Data - Mapping File Error", f"Error loading location mapping: {e}")
         return {}
 
+def save_location_file(location_df, location_file_path):
+    """Write one location's rows with Partnumber as text, fitted widths and borders."""
+    with pd.ExcelWriter(location_file_path, engine='xlsxwriter') as writer:
+        location_df.to_excel(writer, sheet_name='Sheet1', index=False)
+        workbook = writer.book
+        worksheet = writer.sheets['Sheet1']
+        text_format = workbook.add_format({'num_format': '@'})
+        partnumber_col = location_df.columns.get_loc('Partnumber')
+        worksheet.set_column(partnumber_col, partnumber_col, None, text_format)
+        
+        for col_num, value in enumerate(location_df.columns.values):
+            max_length = max(location_df[value].astype(str).map(len).max(), len(value)) + 2
+            col_letter = chr(65 + col_num)
+            worksheet.set_column(f'{col_letter}:{col_letter}', max_length)
+        
+        worksheet.conditional_format(0, 0, len(location_df) + 1, len(location_df.columns) - 1,
+                                     {'type': 'no_blanks',
+                                      'format': workbook.add_format({'border': 1})})
+
 def process_files(input_folder, output_folder, start_date, end_date, date_format, mapping_file, exclude_v_code):
     # Ensure the output folder exists
     os.makedirs(output_folder, exist_ok=True)
@@ -29,7 +54,8 @@ def process_files(input_folder, output_folder, start_date, end_date, date_format
         messagebox.showerror("PO Upload Data - Date Error", str(ve))
         return
 
-    patterns_to_remove = ['EICPUR', 'ICPPUR', 'CPPUR', 'ECPUR', 'SAP-200', 'SAP-300', 'SAP-000']
+    # Order families left out of the upload (prefixes in 'Order prefixes.json')
+    families_to_remove = ['Non TATA', 'SAP-000', 'SAP-200', 'SAP-300']
     
     # Load location mapping if provided
     location_mapping = {}
@@ -56,7 +82,7 @@ def process_files(input_folder, output_folder, start_date, end_date, date_format
                 df = df[~df['Payer Code'].str.startswith('V', na=False)]
 
             filtered_df = df[(df['Purchase_Order_Date'] >= start_date) & (df['Purchase_Order_Date'] <= end_date)]
-            filtered_df = filtered_df[~filtered_df['Order #'].str.contains('|'.join(patterns_to_remove), na=False)]
+            filtered_df = filtered_df[~order_families(filtered_df['Order #']).isin(families_to_remove)]
 
             if all(col in filtered_df.columns for col in ['Part #', 'Recd Qty', 'Division Name']):
                 filtered_df = filtered_df[['Part #', 'Recd Qty', 'Division Name']]
@@ -81,29 +107,15 @@ def process_files(input_folder, output_folder, start_date, end_date, date_format
         messagebox.showwarning("PO Upload Data - No Data", "No data to process.")
         return
 
-    unique_locations = all_filtered_df['Location'].unique()
-    
-    for location in unique_locations:
-        location_df = all_filtered_df[all_filtered_df['Location'] == location]
-        location_file_name = f"{location.replace('/', '_').replace('\\', '_')}.xlsx"
-        location_file_path = os.path.join(output_folder, location_file_name)
-
-        with pd.ExcelWriter(location_file_path, engine='xlsxwriter') as writer:
-            location_df.to_excel(writer, sheet_name='Sheet1', index=False)
-            workbook = writer.book
-            worksheet = writer.sheets['Sheet1']
-            text_format = workbook.add_format({'num_format': '@'})
-            partnumber_col = location_df.columns.get_loc('Partnumber')
-            worksheet.set_column(partnumber_col, partnumber_col, None, text_format)
-            
-            for col_num, value in enumerate(location_df.columns.values):
-                max_length = max(location_df[value].astype(str).map(len).max(), len(value)) + 2
-                col_letter = chr(65 + col_num)
-                worksheet.set_column(f'{col_letter}:{col_letter}', max_length)
-            
-            worksheet.conditional_format(0, 0, len(location_df) + 1, len(location_df.columns) - 1,
-                                         {'type': 'no_blanks',
-                                          'format': workbook.add_format({'border': 1})})
+    # One file per location, written from a single groupby pass
+    manifest = split_to_files(all_filtered_df, 'Location', output_folder, write=save_location_file)
+    print(format_manifest("PO Upload Data - Location files", manifest))
+
+    failed = [result for result in manifest if result.error]
+    if failed:
+        details = "\n".join(f"{os.path.basename(r.file)}: {r.error}" for r in failed)
+        messagebox.showwarning("PO Upload Data - Write Error", f"{len(failed)} location files could not be saved:\n{details}")
+        return
 
     messagebox.showinfo("PO Upload Data - Success", "Files for each location processed and saved successfully.")
 
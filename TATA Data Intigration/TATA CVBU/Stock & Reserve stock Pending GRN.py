@@ -1,181 +1,250 @@
 import os
-import pandas as pd
+import argparse
 from tkinter import Tk, Label, Button, filedialog, messagebox, StringVar, BooleanVar, Checkbutton, Frame
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.lazy import lazy_import, warm_up
+from scs_core.batch import (PipelineError, run_pipeline, completed, nothing_to_do, show_result,
+                             print_result, add_output_arguments)
+
+# pandas and the engine modules are imported on first use, so the window opens at once
+pd = lazy_import("pandas")
 
 def load_location_mapping(mapping_file):
-    try:
-        mapping_df = pd.read_excel(mapping_file, engine='openpyxl')
-        if 'Code' not in mapping_df.columns or 'Final Location' not in mapping_df.columns:
-            raise ValueError("Mapping file must contain 'Code' and 'Final Location' columns.")
-        return dict(zip(mapping_df['Code'], mapping_df['Final Location']))
-    except Exception as e:
-        messagebox.showerror("Error", f"Error loading location mapping file: {e}")
-        return {}
-
-def process_file(file_path, location_mapping=None):
-    try:
-        df = pd.read_excel(file_path, engine='openpyxl')
-        if location_mapping:
-            df['Location'] = df['Location'].map(lambda x: location_mapping.get(x, x))
-        return df
-    except Exception as e:
-        messagebox.showwarning("Warning", f"Error reading file {file_path}: {e}")
-        return pd.DataFrame()
+    """Checks the mapping file and loads its Code -> Final Location index (once per session)."""
+    from scs_core.locations import get_resolver
+    get_resolver().index('code', mapping_file)
+
+# Row filters of each report, applied while the Base Stock files are parsed
+REPORT_SELECTIONS = {
+    'stock': {'Availability': 'On Hand', 'Status': 'Good'},
+    'reserve': {'Availability': 'Reserved'},
+    'pending_grn': {'Status': 'In Transit'},
+}
+
+def process_file(file_path, selections, mapping_file=None):
+    from scs_core.reader import read_excel_selections
+    from scs_core.locations import get_resolver
+
+    frames = read_excel_selections(file_path, selections)
+    if mapping_file:
+        for df in frames.values():
+            if 'Location' in df.columns:
+                df['Location'] = get_resolver().resolve(df['Location'], 'code', mapping_file, default=df['Location'])
+    return frames
 
 def generate_reports(input_folder, output_stock_folder, output_reserve_folder, pending_grn_folder, mapping_file, generate_stock, generate_reserve, generate_pending_grn):
-    location_mapping = load_location_mapping(mapping_file) if mapping_file else {}
+    """Stock upload, Reserve stock and Pending GRN files (those requested) from the Base
+    Stock exports in input_folder; returns a RunResult.
 
-    file_paths = [os.path.join(input_folder, file) for file in os.listdir(input_folder) if file.endswith('.xlsx')]
-    if not file_paths:
-        messagebox.showwarning("Warning", "No Excel files found in the selected folder.")
-        return
+    A file that cannot be read, an unusable mapping file or a report that cannot be
+    saved is reported as a warning and the other reports are still written.
+    """
+    from scs_core.locations import get_resolver
+    from scs_core.partmaster import part_text
+
+    warnings = []
 
-    compiled_df = pd.concat([process_file(file, location_mapping) for file in file_paths], ignore_index=True)
+    # Without a usable mapping file the location codes are kept as they are
+    if mapping_file:
+        try:
+            load_location_mapping(mapping_file)
+        except Exception as e:
+            warnings.append(f"Error loading location mapping file: {e}")
+            mapping_file = None
 
-    if generate_stock and output_stock_folder:
+    file_paths = [os.path.join(input_folder, file) for file in os.listdir(input_folder) if file.endswith('.xlsx')]
+    if not file_paths:
+        return nothing_to_do("No Excel files found in the selected folder.", warnings)
+
+    # Only the rows of the requested reports are kept; the full Base Stock is never held in memory
+    wanted = {
+        'stock': generate_stock and output_stock_folder,
+        'reserve': generate_reserve and output_reserve_folder,
+        'pending_grn': generate_pending_grn and pending_grn_folder,
+    }
+    selections = {name: where for name, where in REPORT_SELECTIONS.items() if wanted[name]}
+    if not selections:
+        return nothing_to_do("No report selected (each report needs its output folder).", warnings)
+
+    selected = {name: [] for name in selections}
+    for file in file_paths:
+        try:
+            frames = process_file(file, selections, mapping_file)
+        except Exception as e:
+            warnings.append(f"Error reading file {file}: {e}")
+            continue
+        for name, df in frames.items():
+            selected[name].append(df)
+    selected = {name: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+                for name, frames in selected.items()}
+
+    reports = []
+    if 'stock' in selected:
         stock_columns = ['Part #', 'Qty', 'Inventory Location']
-        if all(col in compiled_df.columns for col in stock_columns):
-            stock_df = compiled_df[(compiled_df['Availability'] == 'On Hand') & (compiled_df['Status'] == 'Good')]
-            stock_df = stock_df[stock_columns]
+        if all(col in selected['stock'].columns for col in stock_columns):
+            stock_df = selected['stock'][stock_columns]
             stock_df = stock_df.rename(columns={
                 'Part #': 'Partnumber',
                 'Inventory Location': 'Location'
             })
-            stock_df['Partnumber'] = stock_df['Partnumber'].astype(str)
-            stock_df['Location'] = stock_df['Location'].map(lambda x: location_mapping.get(x, x) if location_mapping else x)
-            save_and_format(os.path.join(output_stock_folder, "stock_upload.xlsx"), stock_df)
+            stock_df['Partnumber'] = part_text(stock_df['Partnumber'])
+            if mapping_file:
+                stock_df['Location'] = get_resolver().resolve(stock_df['Location'], 'code', mapping_file, default=stock_df['Location'])
+            reports.append((os.path.join(output_stock_folder, "stock_upload.xlsx"), stock_df))
         else:
-            messagebox.showerror("Error", "Required columns for stock upload are missing.")
+            warnings.append("Required columns for stock upload are missing.")
+
+    if 'reserve' in selected:
+        reports.append((os.path.join(output_reserve_folder, "reserve_stock.xlsx"), selected['reserve']))
+
+    if 'pending_grn' in selected:
+        reports.append((os.path.join(pending_grn_folder, "Pending_GRN.xlsx"), selected['pending_grn']))
 
-    if generate_reserve and output_reserve_folder:
-        reserve_df = compiled_df[compiled_df['Availability'] == 'Reserved']
-        save_and_format(os.path.join(output_reserve_folder, "reserve_stock.xlsx"), reserve_df)
+    outputs = []
+    for file_path, df in reports:
+        try:
+            save_and_format(file_path, df)
+            outputs.append(file_path)
+        except Exception as e:
+            warnings.append(f"Error saving file {file_path}: {e}")
 
-    if generate_pending_grn and pending_grn_folder:
-        pending_grn_df = compiled_df[compiled_df['Status'] == 'In Transit']
-        save_and_format(os.path.join(pending_grn_folder, "Pending_GRN.xlsx"), pending_grn_df)
+    if not outputs:
+        raise PipelineError("No report could be created.\n" + "\n".join(warnings))
+    return completed(f"{len(outputs)} Excel file(s) created and formatted successfully.", outputs, warnings)
 
 def save_and_format(file_path, df):
-    try:
-        df.to_excel(file_path, index=False, engine='openpyxl')
-        wb = load_workbook(file_path)
-        ws = wb.active
-
-        for col in ws.columns:
-            max_length = max(len(str(cell.value)) for cell in col if cell.value)
-            ws.column_dimensions[col[0].column_letter].width = max_length + 2
-
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-
-        wb.save(file_path)
-        messagebox.showinfo("Success", f"Excel file '{file_path}' has been created and formatted successfully.")
-    except Exception as e:
-        messagebox.showerror("Error", f"Error saving file {file_path}: {e}")
-
-def select_input_folder():
-    folder_selected = filedialog.askdirectory(title="Select Input Folder")
-    if folder_selected:
-        input_folder_var.set(folder_selected)
-
-def select_stock_folder():
-    folder_selected = filedialog.askdirectory(title="Select Output Folder for Stock Upload")
-    if folder_selected:
-        output_stock_folder_var.set(folder_selected)
-
-def select_reserve_folder():
-    folder_selected = filedialog.askdirectory(title="Select Output Folder for Reserve Stock")
-    if folder_selected:
-        output_reserve_folder_var.set(folder_selected)
-
-def select_pending_grn_folder():
-    folder_selected = filedialog.askdirectory(title="Select Output Folder for Pending GRN")
-    if folder_selected:
-        pending_grn_folder_var.set(folder_selected)
-
-def select_mapping_file():
-    file_selected = filedialog.askopenfilename(defaultextension=".xlsx",
-                                              filetypes=[("Excel files", "*.xlsx")],
-                                              title="Select Location Mapping File")
-    if file_selected:
-        mapping_file_var.set(file_selected)
-
-def process_files():
-    input_folder = input_folder_var.get()
-    output_stock_folder = output_stock_folder_var.get()
-    output_reserve_folder = output_reserve_folder_var.get()
-    pending_grn_folder = pending_grn_folder_var.get()
-    mapping_file = mapping_file_var.get()
-    generate_stock = stock_var.get()
-    generate_reserve = reserve_var.get()
-    generate_pending_grn = pending_grn_var.get()
-
-    if not input_folder:
-        messagebox.showwarning("Warning", "Please select an input folder.")
-        return
-
-    if not (generate_stock or generate_reserve or generate_pending_grn):
-        messagebox.showwarning("Warning", "Please select at least one report type to generate.")
-        return
-
-    try:
-        generate_reports(input_folder, output_stock_folder, output_reserve_folder, pending_grn_folder, mapping_file, generate_stock, generate_reserve, generate_pending_grn)
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {e}")
-
-# Create the main window
-root = Tk()
-root.title("Excel File Processor")
-root.geometry("700x500")
-root.resizable(False, False)
-
-# Create and place widgets in frames for better layout
-frame1 = Frame(root, padx=10, pady=10)
-frame1.pack(pady=10, fill='x')
-
-Label(frame1, text="Select Input Folder:", font=('Arial', 10, 'bold')).grid(row=0, column=0, sticky='w', padx=5, pady=5)
-input_folder_var = StringVar()
-Button(frame1, text="Browse", command=select_input_folder, relief='raised', width=20).grid(row=0, column=1, padx=5, pady=5)
-Label(frame1, textvariable=input_folder_var, wraplength=400).grid(row=0, column=2, padx=5, pady=5, sticky='w')
-
-Label(frame1, text="Select Output Folder for Stock Upload:", font=('Arial', 10, 'bold')).grid(row=1, column=0, sticky='w', padx=5, pady=5)
-output_stock_folder_var = StringVar()
-Button(frame1, text="Browse", command=select_stock_folder, relief='raised', width=20).grid(row=1, column=1, padx=5, pady=5)
-Label(frame1, textvariable=output_stock_folder_var, wraplength=400).grid(row=1, column=2, padx=5, pady=5, sticky='w')
-
-Label(frame1, text="Select Output Folder for Reserve Stock:", font=('Arial', 10, 'bold')).grid(row=2, column=0, sticky='w', padx=5, pady=5)
-output_reserve_folder_var = StringVar()
-Button(frame1, text="Browse", command=select_reserve_folder, relief='raised', width=20).grid(row=2, column=1, padx=5, pady=5)
-Label(frame1, textvariable=output_reserve_folder_var, wraplength=400).grid(row=2, column=2, padx=5, pady=5, sticky='w')
-
-Label(frame1, text="Select Output Folder for Pending GRN:", font=('Arial', 10, 'bold')).grid(row=3, column=0, sticky='w', padx=5, pady=5)
-pending_grn_folder_var = StringVar()
-Button(frame1, text="Browse", command=select_pending_grn_folder, relief='raised', width=20).grid(row=3, column=1, padx=5, pady=5)
-Label(frame1, textvariable=pending_grn_folder_var, wraplength=400).grid(row=3, column=2, padx=5, pady=5, sticky='w')
-
-Label(frame1, text="Select Location Mapping File (optional):", font=('Arial', 10, 'bold')).grid(row=4, column=0, sticky='w', padx=5, pady=5)
-mapping_file_var = StringVar()
-Button(frame1, text="Browse", command=select_mapping_file, relief='raised', width=20).grid(row=4, column=1, padx=5, pady=5)
-Label(frame1, textvariable=mapping_file_var, wraplength=400).grid(row=4, column=2, padx=5, pady=5, sticky='w')
-
-frame2 = Frame(root, padx=10, pady=10)
-frame2.pack(pady=10, fill='x')
-
-stock_var = BooleanVar()
-Checkbutton(frame2, text="Generate Stock Upload Report", variable=stock_var, font=('Arial', 10)).grid(row=0, column=0, sticky='w', padx=5, pady=5)
-
-reserve_var = BooleanVar()
-Checkbutton(frame2, text="Generate Reserve Stock Report", variable=reserve_var, font=('Arial', 10)).grid(row=1, column=0, sticky='w', padx=5, pady=5)
-
-pending_grn_var = BooleanVar()
-Checkbutton(frame2, text="Generate Pending GRN Report", variable=pending_grn_var, font=('Arial', 10)).grid(row=2, column=0, sticky='w', padx=5, pady=5)
-
-frame3 = Frame(root, padx=10, pady=10)
-frame3.pack(pady=10)
-
-Button(frame3, text="Run Process", command=process_files, relief='raised', width=20, font=('Arial', 12)).pack(padx=10, pady=10)
-
-root.mainloop()
+    from scs_core.writer import ReportWriter, HEADER, CENTERED
+
+    # Centred cells and fitted widths, written in one pass
+    with ReportWriter(file_path) as writer:
+        writer.write_sheet(df, "Sheet1", header=dict(HEADER, **CENTERED), body=CENTERED)
+
+def run_gui():
+    """Excel File Processor window: a thin wrapper over generate_reports."""
+    def select_input_folder():
+        folder_selected = filedialog.askdirectory(title="Select Input Folder")
+        if folder_selected:
+            input_folder_var.set(folder_selected)
+
+    def select_stock_folder():
+        folder_selected = filedialog.askdirectory(title="Select Output Folder for Stock Upload")
+        if folder_selected:
+            output_stock_folder_var.set(folder_selected)
+
+    def select_reserve_folder():
+        folder_selected = filedialog.askdirectory(title="Select Output Folder for Reserve Stock")
+        if folder_selected:
+            output_reserve_folder_var.set(folder_selected)
+
+    def select_pending_grn_folder():
+        folder_selected = filedialog.askdirectory(title="Select Output Folder for Pending GRN")
+        if folder_selected:
+            pending_grn_folder_var.set(folder_selected)
+
+    def select_mapping_file():
+        file_selected = filedialog.askopenfilename(defaultextension=".xlsx",
+                                                  filetypes=[("Excel files", "*.xlsx")],
+                                                  title="Select Location Mapping File")
+        if file_selected:
+            mapping_file_var.set(file_selected)
+
+    def process_files():
+        input_folder = input_folder_var.get()
+        output_stock_folder = output_stock_folder_var.get()
+        output_reserve_folder = output_reserve_folder_var.get()
+        pending_grn_folder = pending_grn_folder_var.get()
+        mapping_file = mapping_file_var.get()
+        generate_stock = stock_var.get()
+        generate_reserve = reserve_var.get()
+        generate_pending_grn = pending_grn_var.get()
+
+        if not input_folder:
+            messagebox.showwarning("Warning", "Please select an input folder.")
+            return
+
+        if not (generate_stock or generate_reserve or generate_pending_grn):
+            messagebox.showwarning("Warning", "Please select at least one report type to generate.")
+            return
+
+        show_result(run_pipeline(generate_reports, input_folder, output_stock_folder, output_reserve_folder, pending_grn_folder,
+                                 mapping_file, generate_stock, generate_reserve, generate_pending_grn))
+
+    # Create the main window
+    root = Tk()
+    root.title("Excel File Processor")
+    root.geometry("700x500")
+    root.resizable(False, False)
+
+    # Load pandas, openpyxl and the engine while the folders are being picked
+    warm_up("pandas", "openpyxl", "xlsxwriter", "scs_core.reader", "scs_core.locations",
+            "scs_core.partmaster", "scs_core.writer")
+
+    # Create and place widgets in frames for better layout
+    frame1 = Frame(root, padx=10, pady=10)
+    frame1.pack(pady=10, fill='x')
+
+    Label(frame1, text="Select Input Folder:", font=('Arial', 10, 'bold')).grid(row=0, column=0, sticky='w', padx=5, pady=5)
+    input_folder_var = StringVar()
+    Button(frame1, text="Browse", command=select_input_folder, relief='raised', width=20).grid(row=0, column=1, padx=5, pady=5)
+    Label(frame1, textvariable=input_folder_var, wraplength=400).grid(row=0, column=2, padx=5, pady=5, sticky='w')
+
+    Label(frame1, text="Select Output Folder for Stock Upload:", font=('Arial', 10, 'bold')).grid(row=1, column=0, sticky='w', padx=5, pady=5)
+    output_stock_folder_var = StringVar()
+    Button(frame1, text="Browse", command=select_stock_folder, relief='raised', width=20).grid(row=1, column=1, padx=5, pady=5)
+    Label(frame1, textvariable=output_stock_folder_var, wraplength=400).grid(row=1, column=2, padx=5, pady=5, sticky='w')
+
+    Label(frame1, text="Select Output Folder for Reserve Stock:", font=('Arial', 10, 'bold')).grid(row=2, column=0, sticky='w', padx=5, pady=5)
+    output_reserve_folder_var = StringVar()
+    Button(frame1, text="Browse", command=select_reserve_folder, relief='raised', width=20).grid(row=2, column=1, padx=5, pady=5)
+    Label(frame1, textvariable=output_reserve_folder_var, wraplength=400).grid(row=2, column=2, padx=5, pady=5, sticky='w')
+
+    Label(frame1, text="Select Output Folder for Pending GRN:", font=('Arial', 10, 'bold')).grid(row=3, column=0, sticky='w', padx=5, pady=5)
+    pending_grn_folder_var = StringVar()
+    Button(frame1, text="Browse", command=select_pending_grn_folder, relief='raised', width=20).grid(row=3, column=1, padx=5, pady=5)
+    Label(frame1, textvariable=pending_grn_folder_var, wraplength=400).grid(row=3, column=2, padx=5, pady=5, sticky='w')
+
+    Label(frame1, text="Select Location Mapping File (optional):", font=('Arial', 10, 'bold')).grid(row=4, column=0, sticky='w', padx=5, pady=5)
+    mapping_file_var = StringVar()
+    Button(frame1, text="Browse", command=select_mapping_file, relief='raised', width=20).grid(row=4, column=1, padx=5, pady=5)
+    Label(frame1, textvariable=mapping_file_var, wraplength=400).grid(row=4, column=2, padx=5, pady=5, sticky='w')
+
+    frame2 = Frame(root, padx=10, pady=10)
+    frame2.pack(pady=10, fill='x')
+
+    stock_var = BooleanVar()
+    Checkbutton(frame2, text="Generate Stock Upload Report", variable=stock_var, font=('Arial', 10)).grid(row=0, column=0, sticky='w', padx=5, pady=5)
+
+    reserve_var = BooleanVar()
+    Checkbutton(frame2, text="Generate Reserve Stock Report", variable=reserve_var, font=('Arial', 10)).grid(row=1, column=0, sticky='w', padx=5, pady=5)
+
+    pending_grn_var = BooleanVar()
+    Checkbutton(frame2, text="Generate Pending GRN Report", variable=pending_grn_var, font=('Arial', 10)).grid(row=2, column=0, sticky='w', padx=5, pady=5)
+
+    frame3 = Frame(root, padx=10, pady=10)
+    frame3.pack(pady=10)
+
+    Button(frame3, text="Run Process", command=process_files, relief='raised', width=20, font=('Arial', 12)).pack(padx=10, pady=10)
+
+    root.mainloop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stock upload, Reserve stock and Pending GRN files from Base Stock exports")
+    parser.add_argument("input_folder", help="Folder with the Base Stock .xlsx exports")
+    parser.add_argument("--stock", metavar="FOLDER", help="Write the Stock upload file to FOLDER")
+    parser.add_argument("--reserve", metavar="FOLDER", help="Write the Reserve stock file to FOLDER")
+    parser.add_argument("--pending-grn", metavar="FOLDER", help="Write the Pending GRN file to FOLDER")
+    parser.add_argument("--mapping", metavar="FILE", help="Location mapping file (Code -> Final Location)")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    if not (args.stock or args.reserve or args.pending_grn):
+        parser.error("give at least one of --stock, --reserve and --pending-grn")
+    result = run_pipeline(generate_reports, args.input_folder, args.stock, args.reserve, args.pending_grn, args.mapping,
+                          bool(args.stock), bool(args.reserve), bool(args.pending_grn))
+    return print_result(result, as_json=args.json)
+
+if __name__ == "__main__":
+    # Without arguments the window opens; with them the reports run headless
+    sys.exit(main() if len(sys.argv) > 1 else run_gui())
@@ -1,108 +1,94 @@
-import openpyxl
-from openpyxl.styles import Alignment, Border, Side, Font, PatternFill
 import os
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox
 import logging
 import pandas as pd
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.reader import read_excel
+from scs_core.writer import ReportWriter, BORDERED, CENTERED, YELLOW
+from scs_core.batch import completed, nothing_to_do
+from scs_core.jobs import Progress, JobPanel
 
 # Set up logging
 logging.basicConfig(filename='excel_processor.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def format_header(sheet):
-    yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-    bold_font = Font(bold=True)
-
-    for cell in sheet[1]:  # Assuming the first row is the header
-        cell.font = bold_font
-        cell.fill = yellow_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-
-def apply_borders(sheet):
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
-    for row in sheet.iter_rows():
-        for cell in row:
-            cell.border = thin_border
-
-def auto_fit_columns(sheet):
-    for column in sheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter  # Get the column letter (A, B, C, ...)
-        for cell in column:
-            try:
-                if cell.value and len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except Exception as e:
-                logging.error(f"Error calculating width for cell {cell.coordinate}: {e}")
-        adjusted_width = (max_length + 2)
-        sheet.column_dimensions[column_letter].width = adjusted_width
+# Stock increase files: yellow bold header, every cell centred with a thin border
+CELL_STYLE = dict(BORDERED, **CENTERED)
+HEADER_STYLE = dict(CELL_STYLE, bold=True, bg_color=YELLOW)
+
+def save_formatted(sheets, file_path):
+    """Writes {sheet name: DataFrame} with the stock increase styles in one pass."""
+    with ReportWriter(file_path) as writer:
+        for sheet_name, df in sheets.items():
+            writer.write_sheet(df, sheet_name, header=HEADER_STYLE, body=CELL_STYLE)
 
 def process_excel_file(file_path):
+    """Restyles one workbook in place; returns its row count (all sheets)."""
+    temp_path = file_path + '.tmp'
     try:
-        workbook = openpyxl.load_workbook(file_path)
-        
-        for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
-            
-            for row in sheet.iter_rows():
-                for cell in row:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            format_header(sheet)
-            apply_borders(sheet)
-            auto_fit_columns(sheet)
-        
-        workbook.save(file_path)
+        # Rewrite the workbook with the styles instead of styling it cell by cell
+        sheets = read_excel(file_path, sheet_name=None, use_cache=False)
+        save_formatted(sheets, temp_path)
+        os.replace(temp_path, file_path)
         logging.info(f"Successfully processed: {file_path}")
-    
-    except PermissionError:
-        logging.error(f"Permission denied: {file_path}. Ensure the file is not open and has write permissions.")
-        messagebox.showwarning("Warning", f"File is open or locked: {file_path}. Please close it before processing.")
-    except Exception as e:
-        logging.error(f"An error occurred while processing {file_path}: {e}")
-        messagebox.showerror("Error", f"An error occurred while processing {file_path}. Check logs for details.")
+        return sum(len(df) for df in sheets.values())
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
 def convert_and_process_file(file_path):
-    try:
-        # Convert .xls or .csv to .xlsx using pandas
-        if file_path.endswith('.xls') or file_path.endswith('.csv'):
-            # Read the file into a DataFrame
-            df = pd.read_excel(file_path, engine='xlrd') if file_path.endswith('.xls') else pd.read_csv(file_path)
-            
-            # Save the DataFrame as an .xlsx file
-            temp_xlsx = file_path.rsplit('.', 1)[0] + '.xlsx'
-            df.to_excel(temp_xlsx, index=False, engine='openpyxl')
-            
-            logging.info(f"Converted {file_path} to {temp_xlsx}")
-            
-            # Process the newly created .xlsx file
-            process_excel_file(temp_xlsx)
-            
-            # Optionally, remove the temporary .xlsx file
-            os.remove(temp_xlsx)
-        else:
-            process_excel_file(file_path)
-    except Exception as e:
-        logging.error(f"An error occurred during file conversion or processing {file_path}: {e}")
-        messagebox.showerror("Error", f"An error occurred with {file_path}. Check logs for details.")
-
-def process_folder(folder_path):
+    """Formats one .xlsx, .xls or .csv file; returns its row count."""
+    # Convert .xls or .csv to .xlsx using pandas
+    if file_path.endswith('.xls') or file_path.endswith('.csv'):
+        # Read the file into a DataFrame
+        df = read_excel(file_path) if file_path.endswith('.xls') else pd.read_csv(file_path)
+        
+        # Save the DataFrame as a formatted .xlsx file
+        temp_xlsx = file_path.rsplit('.', 1)[0] + '.xlsx'
+        save_formatted({'Sheet1': df}, temp_xlsx)
+        
+        logging.info(f"Converted and formatted {file_path} as {temp_xlsx}")
+        
+        # Optionally, remove the temporary .xlsx file
+        os.remove(temp_xlsx)
+        return len(df)
+    return process_excel_file(file_path)
+
+def process_folder(folder_path, progress=None):
+    """Formats every stock increase file of folder_path; returns a RunResult.
+
+    A file that fails (for example one open in Excel) is reported as a warning and
+    the others are still formatted. Every file is reported to progress
+    (scs_core.jobs), which also stops the run when the user cancels it.
+    """
     files = [f for f in os.listdir(folder_path) if f.endswith(('.xlsx', '.xls', '.csv'))]
-    
-    for index, filename in enumerate(files, start=1):
-        file_path = os.path.join(folder_path, filename)
-        convert_and_process_file(file_path)
-        progress_var.set((index / len(files)) * 100)
-        root.update_idletasks()  # Update progress bar
+    if not files:
+        return nothing_to_do("No .xlsx, .xls or .csv files found in the folder.")
+    progress = progress or Progress()
+    progress.expect(len(files))
 
-    messagebox.showinfo("Success", "All files have been processed successfully!")
+    warnings = []
+    for filename in files:
+        file_path = os.path.join(folder_path, filename)
+        rows = 0
+        try:
+            rows = convert_and_process_file(file_path)
+        except PermissionError:
+            logging.error(f"Permission denied: {file_path}. Ensure the file is not open and has write permissions.")
+            warnings.append(f"File is open or locked: {file_path}. Please close it before processing.")
+        except Exception as e:
+            logging.error(f"An error occurred while processing {file_path}: {e}")
+            warnings.append(f"An error occurred with {file_path}: {e}")
+        progress.step(filename, rows=rows)
+
+    if warnings:
+        return completed(f"{len(files) - len(warnings)} of {len(files)} files processed. Check logs for details.",
+                         warnings=warnings)
     logging.info("All files processed successfully.")
+    return completed("All files have been processed successfully!")
 
 def browse_folder():
     folder_path = filedialog.askdirectory()
@@ -113,7 +99,8 @@ def browse_folder():
 def start_processing():
     folder_path = folder_entry.get()
     if folder_path:
-        process_folder(folder_path)
+        # Runs on a worker thread; the panel shows the progress and then the result
+        panel.start(process_folder, folder_path)
     else:
         messagebox.showwarning("Warning", "Please select a folder first.")
 
@@ -128,10 +115,8 @@ folder_entry.grid(row=0, column=1, padx=10, pady=10)
 browse_button = tk.Button(root, text="Browse", command=browse_folder)
 browse_button.grid(row=0, column=2, padx=10, pady=10)
 
-# Progress bar
-progress_var = tk.DoubleVar()
-progress_bar = ttk.Progressbar(root, orient='horizontal', length=400, mode='determinate', variable=progress_var)
-progress_bar.grid(row=1, column=0, columnspan=3, padx=10, pady=10)
+# Progress bar, elapsed time and rows per second, with Cancel
+panel = JobPanel(root, title="Excel Files Processor").grid(row=1, column=0, columnspan=3, padx=10, pady=10)
 
 # Run button
 run_button = tk.Button(root, text="Run", command=start_processing, bg="green", fg="white")
@@ -4,48 +4,67 @@ from tkinter import Tk, Label, Button, filedialog, messagebox
 import tkinter as tk
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment, Font
-from tkinter.ttk import Progressbar
 import logging
-import threading
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.locations import get_resolver
+from scs_core.reader import read_excel
+from scs_core.partmaster import part_text
+from scs_core.batch import PipelineError, completed, nothing_to_do
+from scs_core.jobs import Progress, JobPanel
 
 logging.basicConfig(filename='error.log', level=logging.ERROR)
 
 def load_location_mapping(mapping_file):
+    """Checks the mapping file and loads its Code -> Final Location index (once per session)."""
+    get_resolver().index('code', mapping_file)
+
+def compile_and_process_excel_files(folder_path, output_file, mapping_file, progress=None):
+    """Stock upload file (the On Hand / Good rows of the Base Stock exports in folder_path,
+    with their Location) written to output_file; returns a RunResult.
+
+    Every export read is reported to progress (scs_core.jobs), which also stops the
+    run when the user cancels it. Without a usable mapping file the location codes
+    are kept, with a warning.
+    """
+    warnings = []
     try:
-        mapping_df = pd.read_excel(mapping_file, engine='openpyxl')
-        if 'Code' not in mapping_df.columns or 'Final Location' not in mapping_df.columns:
-            raise ValueError("Mapping file must contain 'Code' and 'Final Location' columns.")
-        return dict(zip(mapping_df['Code'], mapping_df['Final Location']))
+        load_location_mapping(mapping_file)
+        has_mapping = True
     except Exception as e:
-        messagebox.showerror("Error", f"Error loading location mapping file: {e}")
-        return {}
+        warnings.append(f"Error loading location mapping file: {e}")
+        has_mapping = False
 
-def compile_and_process_excel_files(folder_path, output_file, mapping_file):
-    location_mapping = load_location_mapping(mapping_file)
     try:
         files = os.listdir(folder_path)
     except (FileNotFoundError, PermissionError) as e:
-        messagebox.showerror("Error", f"{e}")
-        return
+        raise PipelineError(f"{e}")
 
     excel_files = [f for f in files if f.endswith('.xlsx')]
 
     if not excel_files:
-        messagebox.showinfo("Info", "No Excel files found in the folder.")
-        return
+        return nothing_to_do("No Excel files found in the folder.", warnings)
 
-    compiled_df = pd.concat([pd.read_excel(os.path.join(folder_path, file)) for file in excel_files], ignore_index=True)
+    progress = progress or Progress()
+    progress.expect(len(excel_files))
+    frames = []
+    for file in excel_files:
+        frames.append(read_excel(os.path.join(folder_path, file)))
+        progress.step(file, rows=len(frames[-1]))
+    compiled_df = pd.concat(frames, ignore_index=True)
 
     required_columns = ['Part #', 'Qty', 'Inventory Location', 'Availability', 'Status']
     if not all(col in compiled_df.columns for col in required_columns):
-        messagebox.showerror("Error", "Missing columns in DataFrame")
-        return
+        raise PipelineError("Missing columns in DataFrame")
 
     filtered_df = compiled_df[(compiled_df['Availability'] == 'On Hand') & (compiled_df['Status'] == 'Good')]
     filtered_df = filtered_df[['Part #', 'Qty', 'Inventory Location']]
     filtered_df = filtered_df.rename(columns={'Part #': 'Partnumber', 'Inventory Location': 'Location'})
-    filtered_df['Partnumber'] = filtered_df['Partnumber'].astype(str)
-    filtered_df['Location'] = filtered_df['Location'].map(lambda x: location_mapping.get(x, x))
+    filtered_df['Partnumber'] = part_text(filtered_df['Partnumber'])
+    if has_mapping:
+        filtered_df['Location'] = get_resolver().resolve(filtered_df['Location'], 'code', mapping_file, default=filtered_df['Location'])
 
     try:
         filtered_df.to_excel(output_file, index=False, engine='openpyxl')
@@ -73,10 +92,10 @@ def compile_and_process_excel_files(folder_path, output_file, mapping_file):
             cell.font = Font(bold=False)
 
         wb.save(output_file)
-        messagebox.showinfo("Success", f"Processed Excel file '{output_file}' successfully.")
     except Exception as e:
         logging.error(f"Error saving file {output_file}: {e}")
-        messagebox.showerror("Error", f"Error saving file {output_file}: {e}")
+        raise PipelineError(f"Error saving file {output_file}: {e}")
+    return completed(f"Processed Excel file '{output_file}' successfully.", [output_file], warnings)
 
 def select_folder():
     folder_selected = filedialog.askdirectory(initialdir=folder_path_var.get() or 'C:\\')
@@ -98,10 +117,8 @@ def process_files():
     if not all([folder_path, output_file, mapping_file]):
         messagebox.showwarning("Warning", "Please select folder, output file, and mapping file.")
         return
-    compile_and_process_excel_files(folder_path, output_file, mapping_file)
-
-def process_files_async():
-    threading.Thread(target=process_files).start()
+    # Runs on a worker thread; the panel shows the progress and then the result
+    panel.start(compile_and_process_excel_files, folder_path, output_file, mapping_file)
 
 root = Tk()
 root.title("Excel File Compiler")
@@ -122,12 +139,9 @@ Label(root, text="Select Mapping File:").grid(row=2, column=0, padx=5, pady=5)
 Button(root, text="Browse", command=select_mapping_file).grid(row=2, column=1, padx=5, pady=5)
 Label(root, textvariable=mapping_file_var).grid(row=2, column=2, padx=5, pady=5)
 
-Button(root, text="Process Files", command=process_files_async).grid(row=3, column=0, columnspan=3, pady=20)
-
-progress = Progressbar(root, orient="horizontal", length=300, mode="determinate")
-progress.grid(row=4, column=0, columnspan=3, pady=10)
+Button(root, text="Process Files", command=process_files).grid(row=3, column=0, columnspan=3, pady=20)
 
-status_var = tk.StringVar()
-Label(root, textvariable=status_var).grid(row=5, column=0, columnspan=3, pady=5)
+# Progress, elapsed time and rows per second of the running compile, with Cancel
+panel = JobPanel(root, title="Excel File Compiler", length=300).grid(row=4, column=0, columnspan=3, pady=10)
 
 root.mainloop()
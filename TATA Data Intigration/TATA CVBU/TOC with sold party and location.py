@@ -1,8 +1,15 @@
 import pandas as pd
 import glob
 from tkinter import Tk, Label, Button, StringVar, filedialog, messagebox
-from openpyxl import load_workbook
 import os
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.locations import get_resolver
+from scs_core.writer import ReportWriter
+from scs_core.splitter import split_to_files, format_manifest
+from scs_core.partmaster import part_text
 
 def process_files():
     try:
@@ -23,12 +30,10 @@ def process_files():
             messagebox.showerror("Error", "No location file selected.")
             return
 
-        # Load location data
+        # Load location data (Sold_To_Party -> Location index)
+        locations = get_resolver()
         try:
-            location_df = pd.read_excel(location_file)
-            if 'Sold_To_Party' not in location_df.columns or 'Code' not in location_df.columns or 'Location' not in location_df.columns:
-                messagebox.showerror("Error", "Location file must contain 'Sold_To_Party', 'Code', and 'Location' columns.")
-                return
+            locations.index('sold_to', location_file)
         except Exception as e:
             messagebox.showerror("Error", f"Error loading location file: {e}")
             return
@@ -54,7 +59,7 @@ def process_files():
                     filtered_df.columns = ['Partnumber', 'QTY', 'Sold_To_Party']
                     
                     # Convert 'Partnumber' column to text using .loc
-                    filtered_df.loc[:, 'Partnumber'] = filtered_df['Partnumber'].astype(str)
+                    filtered_df.loc[:, 'Partnumber'] = part_text(filtered_df['Partnumber'])
                     
                     # Append the filtered DataFrame to the main DataFrame
                     filtered_df['Original_File'] = os.path.basename(file)  # Add a column with the original file name
@@ -68,80 +73,39 @@ def process_files():
             messagebox.showerror("Error", "Column 'Sold_To_Party' not found in the data.")
             return
 
-        # Merge with location data
-        all_data = pd.merge(all_data, location_df, on='Sold_To_Party', how='left')
+        # Add the Location of each Sold_To_Party
+        all_data['Location'] = locations.resolve(all_data['Sold_To_Party'], 'sold_to', location_file)
 
         if all_data.empty:
             messagebox.showerror("Error", "No matching data found after merging with location data.")
             return
 
-        # Process and save data based on location
-        location_values = all_data['Location'].dropna().unique()
-        original_files = all_data['Original_File'].unique()
-
-        for location in location_values:
-            # Filter data where 'Location' matches the current value
-            matched_data = all_data[all_data['Location'] == location]
-
-            if matched_data.empty:
-                continue
-            
-            # Define the output file path for each location
-            match_output_file = f'{output_folder}/{location}_matched_data.xlsx'
-            
-            # Select only 'Partnumber' and 'QTY' columns
-            output_data = matched_data[['Partnumber', 'QTY']]
-            
-            output_data.to_excel(match_output_file, index=False)
-            adjust_column_width(match_output_file)
-
-        # Handle unmatched data
-        unmatched_data = all_data[all_data['Location'].isna()]
+        # Save 'Partnumber' and 'QTY' of each location, partitioned in one groupby pass
+        manifest = split_to_files(all_data, 'Location', output_folder, write=save_fitted,
+                                  name=lambda location: f'{location}_matched_data', columns=['Partnumber', 'QTY'])
 
-        for original_file in original_files:
-            unmatched_file_data = unmatched_data[unmatched_data['Original_File'] == original_file]
-
-            if unmatched_file_data.empty:
-                continue
-            
-            # Define the output file path for unmatched data
-            original_file_name = os.path.splitext(original_file)[0]  # Remove extension from original file name
-            unmatched_output_file = f'{output_folder}/{original_file_name}_unmatched_data.xlsx'
-            
-            # Select only 'Partnumber' and 'QTY' columns
-            output_data = unmatched_file_data[['Partnumber', 'QTY']]
-            
-            output_data.to_excel(unmatched_output_file, index=False)
-            adjust_column_width(unmatched_output_file)
+        # Handle unmatched data: one file per original file
+        unmatched_data = all_data[all_data['Location'].isna()]
+        manifest += split_to_files(unmatched_data, 'Original_File', output_folder, write=save_fitted,
+                                   name=lambda original_file: f'{os.path.splitext(original_file)[0]}_unmatched_data',
+                                   columns=['Partnumber', 'QTY'])
+        print(format_manifest("TOC location files", manifest))
+
+        failed = [result for result in manifest if result.error]
+        if failed:
+            details = "\n".join(f"{os.path.basename(r.file)}: {r.error}" for r in failed)
+            messagebox.showerror("Error", f"{len(failed)} files could not be saved:\n{details}")
+            return
 
         messagebox.showinfo("Success", "Data extraction complete. Files saved to the selected output folder.")
 
     except Exception as e:
         messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
-def adjust_column_width(file_path):
-    try:
-        # Load the workbook and select the active sheet
-        workbook = load_workbook(file_path)
-        sheet = workbook.active
-
-        # Iterate through all columns and set the width based on the maximum length of the content
-        for column in sheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(cell.value)
-                except:
-                    pass
-            adjusted_width = max_length + 2  # Add a little extra space
-            sheet.column_dimensions[column_letter].width = adjusted_width
-
-        # Save the adjusted workbook
-        workbook.save(file_path)
-    except Exception as e:
-        print(f"Error adjusting column width for {file_path}: {e}")
+def save_fitted(df, file_path):
+    """Write df with each column as wide as its longest value (measured on the DataFrame)."""
+    with ReportWriter(file_path) as writer:
+        writer.write_sheet(df, "Sheet1")
 
 # Function to select input folder
 def select_folder():
@@ -9,6 +9,11 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 from openpyxl.utils import get_column_letter
 import logging
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "checklist"))
+from scs_core.orders import order_families
 
 # Set up logging
 logging.basicConfig(filename='processing.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -47,8 +52,8 @@ def load_location_mapping(mapping_file):
 
 def filter_sap_backorders(df, filter_date):
     """Filter SAP backorders to keep only the specified date for 'SAP-000' and 'SAP-200'."""
-    # Identify rows where Order Number starts with 'SAP-000' or 'SAP-200'
-    sap_filter = df['OrderNumber'].str.startswith(('SAP-000', 'SAP-200'), na=False)
+    # Identify rows of the SAP-000 and SAP-200 order families
+    sap_filter = order_families(df['OrderNumber']).isin(['SAP-000', 'SAP-200']).to_numpy()
     sap_df = df[sap_filter]
     
     # Convert the filter_date to a pandas Timestamp
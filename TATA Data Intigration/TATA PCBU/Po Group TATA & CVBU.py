@@ -4,6 +4,11 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import xlsxwriter
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "checklist"))
+from scs_core.orders import order_families
 
 def load_location_mapping(mapping_file):
     """Load location mapping from an Excel file."""
@@ -30,7 +35,8 @@ def process_files(input_folder, output_file, start_date, date_format, mapping_fi
         return
 
     today = datetime.today()
-    patterns_to_remove = ['EICPUR', 'ICPPUR', 'CPPUR', 'ECPUR', 'SAP-200', 'SAP-300', 'SAP-000']
+    # Order families left out of the upload (prefixes in 'Order prefixes.json')
+    families_to_remove = ['Non TATA', 'SAP-000', 'SAP-200', 'SAP-300']
     location_mapping = load_location_mapping(mapping_file)
     all_filtered_df = pd.DataFrame()
 
@@ -47,7 +53,7 @@ def process_files(input_folder, output_file, start_date, date_format, mapping_fi
 
             df['Purchase_Order_Date'] = pd.to_datetime(df['Purchase_Order_Date'], errors='coerce')
             filtered_df = df[(df['Purchase_Order_Date'] >= start_date) & (df['Purchase_Order_Date'] <= today)]
-            filtered_df = filtered_df[~filtered_df['Order #'].str.contains('|'.join(patterns_to_remove), na=False)]
+            filtered_df = filtered_df[~order_families(filtered_df['Order #']).isin(families_to_remove)]
 
             if all(col in filtered_df.columns for col in ['Part #', 'Recd Qty', 'Division Name']):
                 filtered_df = filtered_df[['Part #', 'Recd Qty', 'Division Name']]
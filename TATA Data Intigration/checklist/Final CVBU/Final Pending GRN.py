@@ -1,10 +1,18 @@
 import os
-import pandas as pd
-from tkinter import Tk, filedialog, messagebox, StringVar, Label, Button
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, PatternFill, Border, Side, Font
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.utils import get_column_letter
+import argparse
+from tkinter import filedialog, messagebox, StringVar, Label, Button
+import sys
+
+# Shared SCS engine (scs_core) lives in the checklist folder
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from scs_core.registry import tool_window, run_window
+from scs_core.lazy import lazy_import, warm_up
+from scs_core.batch import (PipelineError, run_pipeline, completed, nothing_to_do,
+                             print_result, add_output_arguments)
+from scs_core.jobs import Progress, JobPanel
+
+# pandas and the engine modules are imported on first use, so the window opens at once
+pd = lazy_import("pandas")
 
 # Define columns to include
 NEW_COLUMNS = ["Location", "Vendor", "Month", "Year", "Casual/VOR"]
@@ -18,259 +26,203 @@ COLUMN_ORDER = [
     "Challan #", "Transaction Date", "Transaction Number", "Order Type", "Challan Date", "Challan Quantity",
     "Purchase_Order_Date", "Movement Type", "Condition", "Vendor Invoice #"
 ]
+# Columns the calculated fields and the summary cannot do without
+REQUIRED_COLUMNS = ["Division Name", "Order #", "Status", "Spares Order Type", "Invoice_Date", "Line Item Invoice Total"]
+
+# Amount columns exported as text ("Rs. 1,234.00")
+AMOUNT_COLUMNS = [
+    "Line Item Invoice Total", "Total_Invoice_Amount", "Discount Amount", "Other Charges Amount",
+    "Net Amount", "VAT", "CST VAT", "CST", "CST Surcharge", "LST", "LST Surcharge", "Additional Tax",
+    "TOT", "Octroi", "Weighted Avg", "Cash Discount", "Cash Discount Percentage", "Discount Per Part",
+    "Discount Per Part Percentage", "CGST", "IGST", "SGST", "UTGST", "TCS Amount"
+]
 
 LOCATION_MAPPING_FILE = r"\\tata_server\TATASERVER\TATA Data Intigration\checklist\All Location TATA CVBU & PCBU.xlsx"
 
-def process_pending_grn(input_folder, output_folder):
+def process_pending_grn(input_folder, output_folder, progress=None):
+    """Pending GRN report (In Transit rows and the Combined Summary) of the Intransit
+    exports in input_folder, written to output_folder; returns a RunResult.
+
+    Every export read is reported to progress (scs_core.jobs), which also stops
+    the run when the user cancels it.
+    """
+    from scs_core.reader import read_excel, SchemaError
+    from scs_core.collector import FrameCollector
+    from scs_core.money import format_failures
+
+    # Collect all Excel files in the input folder
+    file_paths = [os.path.join(input_folder, file) for file in os.listdir(input_folder) if file.endswith('.xlsx')]
+    if not file_paths:
+        return nothing_to_do("No Excel files found in the selected folder.")
+    progress = progress or Progress()
+    progress.expect(len(file_paths))
+
+    # Read only the report columns of the In Transit rows, skipping empty or all-NA files
+    collector = FrameCollector(compact=True)
+    for file in file_paths:
+        try:
+            df = read_excel(file, columns=REQUIRED_COLUMNS, optional_columns=COLUMN_ORDER,
+                            where={'Status': 'In Transit'})
+        except SchemaError as e:
+            raise PipelineError(f"{e}\nPlease check that it is an Intransit export.")
+        if not df.empty and not df.isna().all(axis=None):  # Exclude empty and all-NA DataFrames
+            collector.add(df, source=file)
+        progress.step(os.path.basename(file), rows=len(df))
+
+    if not collector.sources:  # If no valid DataFrames are found
+        return nothing_to_do("No valid data found in the provided files.")
+
+    # Concatenate the valid DataFrames (Status, Division Name, ... as categoricals)
+    compiled_df = collector.build()
+
+    # Filter for Pending GRN data
+    if 'Status' not in compiled_df.columns:
+        raise PipelineError("The files must contain a 'Status' column.")
+
+    pending_grn_df = compiled_df[compiled_df['Status'] == 'In Transit']
+
+    if pending_grn_df.empty:
+        return nothing_to_do("No Pending GRN records found.")
+
+    # Add new columns with formulas or mappings
+    pending_grn_df = add_calculated_columns(pending_grn_df)
+
+    # Replace all occurrences of 'Rs.' and handle float conversion
+    pending_grn_df, failed_amounts = replace_rs_and_convert_to_float(pending_grn_df)
+
+    # Reorder columns with new ones at the start
+    reordered_columns = NEW_COLUMNS + [col for col in COLUMN_ORDER if col in pending_grn_df.columns]
+    pending_grn_df = pending_grn_df[reordered_columns]
+
+    # Get a unique file name
+    output_file = get_unique_filename(output_folder, "Pending_GRN")
+
+    # Create Pivot Table for Combined Summary (the data sheet is still saved without it)
+    warnings = []
+    if failed_amounts:
+        warnings.append(format_failures(failed_amounts))
     try:
-        # Collect all Excel files in the input folder
-        file_paths = [os.path.join(input_folder, file) for file in os.listdir(input_folder) if file.endswith('.xlsx')]
-        if not file_paths:
-            messagebox.showwarning("Warning", "No Excel files found in the selected folder.")
-            return
-
-        # Read all files into DataFrames, skipping empty or all-NA ones
-        dfs = []
-        for file in file_paths:
-            df = pd.read_excel(file, engine='openpyxl')
-            if not df.empty and not df.isna().all(axis=None):  # Exclude empty and all-NA DataFrames
-                dfs.append(df)
-
-        if not dfs:  # If no valid DataFrames are found
-            messagebox.showinfo("Info", "No valid data found in the provided files.")
-            return
-
-        # Concatenate the valid DataFrames
-        compiled_df = pd.concat(dfs, ignore_index=True)
-
-        # Filter for Pending GRN data
-        if 'Status' not in compiled_df.columns:
-            messagebox.showerror("Error", "The files must contain a 'Status' column.")
-            return
-
-        pending_grn_df = compiled_df[compiled_df['Status'] == 'In Transit']
-
-        if pending_grn_df.empty:
-            messagebox.showinfo("Info", "No Pending GRN records found.")
-            return
-
-        # Add new columns with formulas or mappings
-        pending_grn_df = add_calculated_columns(pending_grn_df)
-
-        # Replace all occurrences of 'Rs.' and handle float conversion
-        pending_grn_df = replace_rs_and_convert_to_float(pending_grn_df)
-
-        # Reorder columns with new ones at the start
-        reordered_columns = NEW_COLUMNS + [col for col in COLUMN_ORDER if col in pending_grn_df.columns]
-        pending_grn_df = pending_grn_df[reordered_columns]
-
-        # Get a unique file name
-        output_file = get_unique_filename(output_folder, "Pending_GRN")
-
-        # Save the filtered data to an Excel file with styled headers
-        save_and_format(output_file, pending_grn_df)
-
-        # Create Pivot Table for Combined Summary
-        create_combined_summary_pivot(output_file, pending_grn_df)
-
+        summary_df = create_combined_summary_pivot(pending_grn_df)
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {e}")
+        warnings.append(f"Error generating pivot table: {e}")
+        summary_df = None
+
+    # Save the filtered data and the summary with styled headers in one pass
+    save_and_format(output_file, pending_grn_df, summary_df)
+    return completed(f"Pending GRN report saved to: {output_file}", outputs=[output_file], warnings=warnings)
 
 def add_calculated_columns(df):
     """Add the new columns with formulas or mapped data."""
-    # Load location mapping data
-    location_mapping = pd.read_excel(LOCATION_MAPPING_FILE, sheet_name="Sheet1")
-    location_dict = dict(zip(location_mapping.iloc[:, 0], location_mapping.iloc[:, 1]))
+    from scs_core.locations import get_resolver
+    from scs_core.classify import load_rules, add_classifications, format_dates
 
-    # Perform VLOOKUP-like mapping for Location
-    df["Location"] = df["Division Name"].map(location_dict).fillna(df["Division Name"])
+    # Perform VLOOKUP-like mapping for Location (Code -> Final Location of the location master)
+    df["Location"] = get_resolver().resolve(df["Division Name"], "code", LOCATION_MAPPING_FILE,
+                                            sheet_name="Sheet1", default=df["Division Name"])
 
-    # Classify Vendor based on the first five characters of "Order #"
-    df["Vendor"] = df["Order #"].apply(
-        lambda x: "Non TATA" if str(x).startswith(("CPPUR", "ECPUR", "ICPPUR", "EICPUR")) else "TATA Motors"
-    )
+    # Vendor (from the "Order #" prefix) and Casual/VOR (from the Spares Order Type),
+    # as set out in "Pending GRN rules.json"
+    add_classifications(df, load_rules(), names=["Vendor", "Casual/VOR"])
 
-    # Format Month and Year from Invoice Date
-    df["Month"] = pd.to_datetime(df["Invoice_Date"], errors="coerce").dt.strftime("%b-%y").fillna("")
-    df["Year"] = pd.to_datetime(df["Invoice_Date"], errors="coerce").dt.year.fillna("")
-
-    # Add Casual/VOR based on Spares Order Type
-    df["Casual/VOR"] = df["Spares Order Type"].apply(
-        lambda x: "VOR Purchase" if any(keyword in str(x) for keyword in ["VOR Order PVBU","VOR Order CVBU", "CP-VOR Order CVBU"]) else 
-                  ("Casual Purchase" if any(keyword in str(x) for keyword in ["Casual Order pcbu", "Casual Order PVBU", "Lub Order"]) else 
-                   "Casual Purchase")  # Default to Casual Purchasee if no match
-    )
+    # Format Month and Year from Invoice Date (parsed once)
+    invoice_date = pd.to_datetime(df["Invoice_Date"], errors="coerce")
+    df["Month"] = format_dates(invoice_date, "%b-%y")
+    df["Year"] = invoice_date.dt.year.fillna("")
 
     return df
 
 def replace_rs_and_convert_to_float(df):
-    """Replace all occurrences of 'Rs.' and convert columns to float where applicable."""
-    # Remove 'Rs.' and any non-numeric characters, and convert columns to numeric
-    df = df.applymap(lambda x: str(x).replace('Rs.', '').replace(',', '') if isinstance(x, str) else x)
-
-    # Convert columns that should be numeric to float
-    numeric_columns = [
-        "Line Item Invoice Total", "Total_Invoice_Amount", "Discount Amount", "Other Charges Amount",
-        "Net Amount", "VAT", "CST VAT", "CST", "CST Surcharge", "LST", "LST Surcharge", "Additional Tax", 
-        "TOT", "Octroi", "Weighted Avg", "Cash Discount", "Cash Discount Percentage", "Discount Per Part",
-        "Discount Per Part Percentage", "CGST", "IGST", "SGST", "UTGST", "TCS Amount"
-    ]
-
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')  # Convert to numeric, coercing errors to NaN
-
-    return df
-
-def save_and_format(file_path, df):
-    try:
-        df.to_excel(file_path, index=False, engine='openpyxl')
-        wb = load_workbook(file_path)
-        ws = wb.active
-
-        # Set column widths and apply header styles
-        light_green = PatternFill(start_color="CCFFCC", end_color="CCFFCC", fill_type="solid")
-        light_blue = PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid")
-
-        for col_idx, col_name in enumerate(df.columns, start=1):
-            ws.cell(row=1, column=col_idx).value = col_name
-
-            if col_name in NEW_COLUMNS:
-                ws.cell(row=1, column=col_idx).fill = light_green
-            else:
-                ws.cell(row=1, column=col_idx).fill = light_blue
-
-            max_length = max((len(str(cell.value)) for cell in ws[col_idx] if cell.value), default=10)
-            ws.column_dimensions[ws.cell(row=1, column=col_idx).column_letter].width = max_length + 2
-
-        border_style = Border(
-            left=Side(border_style="thin"),
-            right=Side(border_style="thin"),
-            top=Side(border_style="thin"),
-            bottom=Side(border_style="thin")
-        )
-
-        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-            for cell in row:
-                cell.border = border_style
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-
-        wb.save(file_path)
-        messagebox.showinfo("Success", f"Pending GRN report saved to: {file_path}")
-    except Exception as e:
-        messagebox.showerror("Error", f"Error saving file {file_path}: {e}")
-
-def create_combined_summary_pivot(file_path, df):
-    try:
-        wb = load_workbook(file_path)
-        summary_sheet = wb.create_sheet(title="Combined Summary")
-
-        # Ensure 'Year' and 'Month' are strings and handle missing values (NaN)
-        df['Year'] = df['Year'].apply(str).fillna('')
-        df['Month'] = df['Month'].apply(str).fillna('')
-
-        # Replace "Non TATA" with "TGP FROM CODEALER" in the 'Vendor' column
-        df["Vendor"] = df["Vendor"].replace("Non TATA", "TGP FROM CODEALER")
-        df["Vendor"] = df["Vendor"].replace("TATA Motors", "TGP FROM TATA")
-
-        # Pivot Table for Combined Summary: Summing Line Item Invoice Total
-        pivot_df = pd.pivot_table(
-            df,
-            index=["Vendor", "Casual/VOR", "Location"],
-            columns=["Month"],
-            values="Line Item Invoice Total",
-            aggfunc="sum",
-            fill_value=0
-        ).reset_index()
-
-        # Round float values to integers
-        pivot_df = pivot_df.round(0)
-
-        # Ensure the months are in the desired chronological order
-        month_order = ["Jan-24", "Feb-24", "Mar-24", "Apr-24", "May-24", "Jun-24", "Jul-24", "Aug-24", "Sep-24", "Oct-24", "Nov-24", "Dec-24"]
-        sorted_months = [col for col in month_order if col in pivot_df.columns]
-        static_columns = [col for col in ["Location", "Vendor", "Casual/VOR"] if col in pivot_df.columns]
-        pivot_df = pivot_df[static_columns + sorted_months]
-
-        # Remove month columns where the total is 0
-        non_zero_months = [col for col in sorted_months if pivot_df[col].sum() != 0]
-        pivot_df = pivot_df[static_columns + non_zero_months]
-
-        # Sort by 'Location' in ascending order
-        pivot_df = pivot_df.sort_values(by=["Location"], ascending=True)
-        
-        # Add a "Total" column for row-wise sum of all monthly columns
-        pivot_df["Total"] = pivot_df.iloc[:, len(static_columns):].sum(axis=1)
-
-        # Calculate Grand Total row
-        grand_total = pivot_df.iloc[:, len(static_columns):].sum(axis=0)
-        grand_total["Location"] = "Grand Total"
-        grand_total["Vendor"] = ""
-        grand_total["Casual/VOR"] = ""
-        pivot_df = pd.concat([pivot_df, pd.DataFrame([grand_total])], ignore_index=True)
-
-        # Write the pivot table to the new sheet
-        for row in dataframe_to_rows(pivot_df, index=False, header=True):
-            summary_sheet.append(row)
-
-        # Apply styles: Center alignment and borders
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        thin_border = Border(
-            left=Side(style="thin"), 
-            right=Side(style="thin"),
-            top=Side(style="thin"), 
-            bottom=Side(style="thin")
+    """Strip 'Rs.' and ',' from the amount columns and convert them to float.
+
+    Only AMOUNT_COLUMNS are touched; values that are still not numbers are left
+    blank. Returns (df, failed), failed being {column: values that could not be read}.
+    """
+    from scs_core.money import parse_amounts
+
+    return parse_amounts(df, AMOUNT_COLUMNS)
+
+def save_and_format(file_path, df, summary_df=None):
+    """Writes the Pending GRN sheet, and the Combined Summary when given, in a single pass."""
+    from scs_core.writer import ReportWriter, HEADER, CENTERED, BORDERED, LIGHT_BLUE, header_scheme
+
+    cell_style = dict(BORDERED, **CENTERED)
+    with ReportWriter(file_path) as writer:
+        # Light green headers for the computed columns, light blue for the source ones
+        writer.write_sheet(
+            df, "Sheet1",
+            header=dict(HEADER, **CENTERED),
+            header_styles=header_scheme(df.columns, NEW_COLUMNS),
+            body=cell_style,
         )
 
-        for row in summary_sheet.iter_rows():
-            for cell in row:
-                cell.alignment = center_alignment
-                cell.border = thin_border
-
-        # Apply styles to header row
-        header_fill = PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid")  # Light Blue
-        bold_font = Font(bold=True)
-
-        for cell in summary_sheet[1]:
-            cell.fill = header_fill
-            cell.font = bold_font
-
-        # Apply Grand Total row formatting (same as the header)
-        grand_total_row = summary_sheet.max_row
-        for cell in summary_sheet[grand_total_row]:
-            cell.fill = header_fill
-            cell.font = bold_font
-
-        # Bold the "Total" column
-        total_col_idx = summary_sheet.max_column
-        for row_idx in range(2, grand_total_row):  # Exclude header row
-            cell = summary_sheet.cell(row=row_idx, column=total_col_idx)
-            cell.font = Font(bold=True)
-
-        # Format cells to remove decimals
-        for row in summary_sheet.iter_rows(min_row=2, max_row=summary_sheet.max_row, min_col=4, max_col=summary_sheet.max_column):
-            for cell in row:
-                if isinstance(cell.value, (int, float)):  # Check if the value is numeric
-                    cell.number_format = '0'  # Format as integer (no decimals)
-
-        # Auto-fit column widths
-        for col_idx in range(1, summary_sheet.max_column + 1):
-            col_letter = get_column_letter(col_idx)
-            max_length = 0
-            for cell in summary_sheet[col_letter]:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            summary_sheet.column_dimensions[col_letter].width = max_length + 2
-
-        # Save the file with the pivot table and formatting
-        wb.save(file_path)
-        messagebox.showinfo("Success", f"Combined Summary pivot table saved to: {file_path}")
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Error generating pivot table: {e}")
+        if summary_df is not None:
+            # Grand Total row styled like the header, bold "Total" column, no decimals
+            column_styles = {col: {"num_format": "0"} for col in summary_df.columns[3:]}
+            column_styles["Total"] = {"num_format": "0", "bold": True}
+            writer.write_sheet(
+                summary_df, "Combined Summary",
+                header=dict(cell_style, bold=True, bg_color=LIGHT_BLUE),
+                body=cell_style,
+                column_styles=column_styles,
+                last_row={"bold": True, "bg_color": LIGHT_BLUE},
+            )
+
+def create_combined_summary_pivot(df):
+    """Builds the Combined Summary pivot (Vendor/Casual-VOR/Location by month) with totals."""
+    from scs_core.categories import compact_frame, as_plain
+
+    df = df.copy()
+
+    # Ensure 'Year' and 'Month' are strings and handle missing values (NaN)
+    df['Year'] = df['Year'].apply(str).fillna('')
+    df['Month'] = df['Month'].apply(str).fillna('')
+
+    # Replace "Non TATA" with "TGP FROM CODEALER" in the 'Vendor' column
+    df["Vendor"] = df["Vendor"].replace("Non TATA", "TGP FROM CODEALER")
+    df["Vendor"] = df["Vendor"].replace("TATA Motors", "TGP FROM TATA")
+
+    # Group on category codes instead of the repeated strings
+    df = compact_frame(df, categories=["Vendor", "Casual/VOR", "Location", "Month"])
+
+    # Pivot Table for Combined Summary: Summing Line Item Invoice Total
+    pivot_df = pd.pivot_table(
+        df,
+        index=["Vendor", "Casual/VOR", "Location"],
+        columns=["Month"],
+        values="Line Item Invoice Total",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True
+    ).reset_index()
+    pivot_df = as_plain(pivot_df)
+
+    # Round float values to integers
+    pivot_df = pivot_df.round(0)
+
+    # Ensure the months are in the desired chronological order
+    month_order = ["Jan-24", "Feb-24", "Mar-24", "Apr-24", "May-24", "Jun-24", "Jul-24", "Aug-24", "Sep-24", "Oct-24", "Nov-24", "Dec-24"]
+    sorted_months = [col for col in month_order if col in pivot_df.columns]
+    static_columns = [col for col in ["Location", "Vendor", "Casual/VOR"] if col in pivot_df.columns]
+    pivot_df = pivot_df[static_columns + sorted_months]
+
+    # Remove month columns where the total is 0
+    non_zero_months = [col for col in sorted_months if pivot_df[col].sum() != 0]
+    pivot_df = pivot_df[static_columns + non_zero_months]
+
+    # Sort by 'Location' in ascending order
+    pivot_df = pivot_df.sort_values(by=["Location"], ascending=True)
+    
+    # Add a "Total" column for row-wise sum of all monthly columns
+    pivot_df["Total"] = pivot_df.iloc[:, len(static_columns):].sum(axis=1)
+
+    # Calculate Grand Total row
+    grand_total = pivot_df.iloc[:, len(static_columns):].sum(axis=0)
+    grand_total["Location"] = "Grand Total"
+    grand_total["Vendor"] = ""
+    grand_total["Casual/VOR"] = ""
+    pivot_df = pd.concat([pivot_df, pd.DataFrame([grand_total])], ignore_index=True)
+
+    return pivot_df
 
 def get_unique_filename(folder_path, base_name):
     """Generate a unique filename to prevent overwriting."""
@@ -283,53 +235,76 @@ def get_unique_filename(folder_path, base_name):
         counter += 1
 
 # GUI Section
-def select_input_folder():
-    """Allow user to select the input folder."""
-    folder = filedialog.askdirectory(title="Select Input Folder")
-    if folder:
-        input_folder_var.set(folder)
-
-def select_output_folder():
-    """Allow user to select the output folder."""
-    folder = filedialog.askdirectory(title="Select Output Folder")
-    if folder:
-        output_folder_var.set(folder)
-
-def generate_report():
-    """Trigger the Pending GRN report generation."""
-    input_folder = input_folder_var.get()
-    output_folder = output_folder_var.get()
-
-    if not input_folder:
-        messagebox.showerror("Error", "Please select an input folder.")
-        return
-
-    if not output_folder:
-        messagebox.showerror("Error", "Please select an output folder.")
-        return
-
-    process_pending_grn(input_folder, output_folder)
-
-# Main Application Window
-root = Tk()
-root.title("Pending GRN Report Generator")
-root.geometry("600x300")
-root.resizable(False, False)
-
-# Variables to store folder paths
-input_folder_var = StringVar()
-output_folder_var = StringVar()
-
-# GUI Layout
-Label(root, text="Select Input Folder:", font=('Arial', 10, 'bold')).pack(pady=10, anchor='w', padx=20)
-Button(root, text="Browse", command=select_input_folder, width=20).pack(pady=5)
-Label(root, textvariable=input_folder_var, wraplength=500).pack(anchor='w', padx=20)
-
-Label(root, text="Select Output Folder:", font=('Arial', 10, 'bold')).pack(pady=10, anchor='w', padx=20)
-Button(root, text="Browse", command=select_output_folder, width=20).pack(pady=5)
-Label(root, textvariable=output_folder_var, wraplength=500).pack(anchor='w', padx=20)
-
-Button(root, text="Generate Pending GRN Report", command=generate_report, width=30, font=('Arial', 12)).pack(pady=20)
-
-# Run the GUI event loop
-root.mainloop()
+def run_gui(master=None):
+    """Pending GRN window: a thin wrapper over process_pending_grn."""
+    def select_input_folder():
+        """Allow user to select the input folder."""
+        folder = filedialog.askdirectory(title="Select Input Folder")
+        if folder:
+            input_folder_var.set(folder)
+
+    def select_output_folder():
+        """Allow user to select the output folder."""
+        folder = filedialog.askdirectory(title="Select Output Folder")
+        if folder:
+            output_folder_var.set(folder)
+
+    def generate_report():
+        """Trigger the Pending GRN report generation."""
+        input_folder = input_folder_var.get()
+        output_folder = output_folder_var.get()
+
+        if not input_folder:
+            messagebox.showerror("Error", "Please select an input folder.")
+            return
+
+        if not output_folder:
+            messagebox.showerror("Error", "Please select an output folder.")
+            return
+
+        # Runs on a worker thread; the panel shows the progress and then the result
+        panel.start(process_pending_grn, input_folder, output_folder)
+
+    # Main Application Window
+    # A Toplevel of the launcher's window when opened from it, else its own Tk root
+    root = tool_window(master)
+    root.title("Pending GRN Report Generator")
+    root.geometry("600x380")
+    root.resizable(False, False)
+
+    # Load pandas, openpyxl and the engine while the folders are being picked
+    warm_up("pandas", "openpyxl", "xlsxwriter", "scs_core.reader", "scs_core.collector",
+            "scs_core.locations", "scs_core.classify", "scs_core.money", "scs_core.writer")
+
+    # Variables to store folder paths
+    input_folder_var = StringVar(root)
+    output_folder_var = StringVar(root)
+
+    # GUI Layout
+    Label(root, text="Select Input Folder:", font=('Arial', 10, 'bold')).pack(pady=10, anchor='w', padx=20)
+    Button(root, text="Browse", command=select_input_folder, width=20).pack(pady=5)
+    Label(root, textvariable=input_folder_var, wraplength=500).pack(anchor='w', padx=20)
+
+    Label(root, text="Select Output Folder:", font=('Arial', 10, 'bold')).pack(pady=10, anchor='w', padx=20)
+    Button(root, text="Browse", command=select_output_folder, width=20).pack(pady=5)
+    Label(root, textvariable=output_folder_var, wraplength=500).pack(anchor='w', padx=20)
+
+    Button(root, text="Generate Pending GRN Report", command=generate_report, width=30, font=('Arial', 12)).pack(pady=20)
+
+    # Progress, elapsed time and rows per second of the running report, with Cancel
+    panel = JobPanel(root, title="Pending GRN").pack(pady=5)
+
+    # Run the GUI event loop
+    run_window(root)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pending GRN report from a folder of Intransit exports")
+    parser.add_argument("input_folder", help="Folder with the Intransit .xlsx exports")
+    parser.add_argument("output_folder", help="Folder the Pending_GRN workbook is written to")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    return print_result(run_pipeline(process_pending_grn, args.input_folder, args.output_folder), as_json=args.json)
+
+if __name__ == "__main__":
+    # Without arguments the window opens; with them the report runs headless
+    sys.exit(main() if len(sys.argv) > 1 else run_gui())
@@ -1,46 +1,74 @@
 import os
-import pandas as pd
+import sys
+import argparse
+import multiprocessing
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from openpyxl import load_workbook, Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import Font
+from scs_core.lazy import lazy_import, warm_up
+from scs_core.batch import completed, failed, show_result, print_result, add_output_arguments
+from scs_core.jobs import Progress, JobPanel
+from scs_core.registry import tool_window, run_window
+
+# pandas, openpyxl and the engine modules are imported on first use, so the window
+# opens at once (and the spawned read workers do not load them twice)
+pd = lazy_import("pandas")
+
+# Keywords selection and control layout
+keywords = [
+    "OTC INVOICE", "PURCHASE LINE PO", "Purchase Line Items",
+    "SPARE CONSUMPTION", "CLOSING STOCK", "stock transaction",
+    "channel partner", "Job Line Invoice", "sap purchase order reason"
+]
 
 def log_error(message):
     """Logs errors to an error log file."""
     with open("error_log.txt", "a") as f:
         f.write(f"{pd.Timestamp.now()}: {message}\n")
 
-def compile_excel_files(folder_path, output_file):
-    """Compiles all Excel files from a folder into a single output file."""
+def compile_excel_files(folder_path, output_file, parallel=False, workers=None, progress=None, incremental=False):
+    """Compiles all Excel files from a folder into a single output file.
+
+    Returns (message, reports, ok) where reports holds the per-file timings and failures
+    and ok is False when the folder could not be read or the output not saved.
+    Every workbook read is reported to progress (scs_core.jobs). With incremental=True
+    only new or changed files are read; the rest come from the folder's compile manifest.
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils.dataframe import dataframe_to_rows
+    from openpyxl.styles import Font
+    from scs_core.compiler import list_excel_files, compile_files
+    from scs_core.manifest import CompileManifest
+
     try:
-        files = os.listdir(folder_path)
+        excel_files = list_excel_files(folder_path)
     except FileNotFoundError:
         log_error(f"The folder path '{folder_path}' does not exist.")
-        return "Folder path does not exist."
+        return "Folder path does not exist.", [], False
     except PermissionError:
         log_error(f"Permission denied for folder path '{folder_path}'.")
-        return "Permission denied to access the folder."
+        return "Permission denied to access the folder.", [], False
 
-    excel_files = [f for f in files if f.endswith('.xlsx')]
+    manifest = None
+    removed = 0
+    if incremental:
+        # Files deleted from the folder since the last run drop out of the output
+        manifest = CompileManifest(folder_path)
+        removed = manifest.prune(excel_files)
+        if not excel_files:
+            manifest.save()
 
     if not excel_files:
-        return "No Excel files found in the folder."
+        return "No Excel files found in the folder.", [], True
 
-    compiled_df = pd.DataFrame()
+    # Read each Excel file (all sheets) without modifying any data, keeping file order
+    compiled_df, reports = compile_files(excel_files, parallel=parallel, workers=workers, progress=progress,
+                                         manifest=manifest)
+    for report in reports:
+        if report.error:
+            log_error(f"Error processing file {report.file}: {report.error}")
 
-    for file in excel_files:
-        input_file = os.path.join(folder_path, file)
-
-        try:
-            # Read each Excel file into a DataFrame without modifying any data
-            df = pd.read_excel(input_file, sheet_name=None)  # Read all sheets
-            # Combine all sheets in each Excel file
-            for sheet_name, sheet_data in df.items():
-                compiled_df = pd.concat([compiled_df, sheet_data], ignore_index=True)
-        except Exception as e:
-            log_error(f"Error processing file {file}: {e}")
-            return f"Error processing file {file}: {e}"
+    if compiled_df.empty:
+        return "No data could be read from the folder.", reports, False
 
     try:
         wb = Workbook()
@@ -69,102 +97,192 @@ def compile_excel_files(folder_path, output_file):
 
         # Save the file
         wb.save(output_file)
-        return f"File saved successfully as {output_file}"
+        failed = sum(1 for r in reports if r.error)
+        message = f"File saved successfully as {output_file}"
+        if failed:
+            message += f" ({failed} file(s) failed, see Compile Report.txt)"
+        if incremental:
+            unchanged = sum(1 for r in reports if r.cached)
+            message += f" ({len(reports) - unchanged} new or changed, {unchanged} unchanged, {removed} removed)"
+        return message, reports, True
 
     except Exception as e:
         log_error(f"Error saving file: {e}")
-        return f"Error saving file: {e}"
-
-def browse_folder(radio_value):
-    """Allows user to select a folder for input files."""
-    folder_path = filedialog.askdirectory()
-    folder_entries[radio_value].delete(0, tk.END)
-    folder_entries[radio_value].insert(0, folder_path)
-
-def browse_output_folder():
-    """Allows user to select a folder for output files."""
-    folder_path = filedialog.askdirectory()
-    output_folder_entry.delete(0, tk.END)
-    output_folder_entry.insert(0, folder_path)
-
-def run_compile():
-    """Runs the compilation process for all selected keywords and folders."""
-    output_folder = output_folder_entry.get()
-    if not output_folder:
-        messagebox.showwarning("TATA SCS Monthly Data", "Please select an output folder.")
-        return
+        return f"Error saving file: {e}", reports, False
 
-    results = []
+def compile_all(folder_map, output_folder, parallel=False, workers=None, progress=None, incremental=False):
+    """Compiles every keyword folder and writes the per-file report next to the outputs.
 
-    try:
-        # Process all keywords
-        for idx, keyword in enumerate(keywords):
-            folder_path = folder_entries[idx].get()
-            if folder_path:
-                output_file = os.path.join(output_folder, f"{keyword}.xlsx")
-                result = compile_excel_files(folder_path, output_file)
-                results.append(f"{keyword}: {result}")
-            else:
-                results.append(f"{keyword}: Skipped due to missing folder.")
+    progress (scs_core.jobs) counts the workbooks of all keyword folders together.
+    Returns a RunResult: an error listing every failed folder and file when any failed.
+    """
+    from scs_core.compiler import format_report
 
+    progress = progress or Progress()
+    results = []
+    failures = []
+    report_sections = []
+
+    for keyword in keywords:
+        folder_path = folder_map.get(keyword)
+        if folder_path:
+            output_file = os.path.join(output_folder, f"{keyword}.xlsx")
+            result, reports, ok = compile_excel_files(folder_path, output_file, parallel, workers, progress, incremental)
+            results.append(f"{keyword}: {result}")
+            if not ok:
+                failures.append(f"{keyword}: {result}")
+            failures.extend(f"{keyword}: {report.file}: {report.error}" for report in reports if report.error)
+            if reports:
+                report_sections.append(format_report(keyword, reports))
+        else:
+            results.append(f"{keyword}: Skipped due to missing folder.")
+
+    if report_sections:
+        with open(os.path.join(output_folder, "Compile Report.txt"), "w") as f:
+            f.write("\n\n".join(report_sections) + "\n")
+
+    message = "Processing complete:\n\n" + "\n".join(results)
+    if failures:
+        return failed(message, failures)
+    return completed(message)
+
+def run_headless(argv):
+    """Command line entry point, e.g. --folder "OTC INVOICE=D:\\Dealers\\OTC" --output D:\\Out --parallel
+
+    Returns the exit code: 1 when a folder or file failed.
+    """
+    parser = argparse.ArgumentParser(description="TATA SCS Monthly Data Compiler")
+    parser.add_argument("--folder", action="append", default=[], metavar="KEYWORD=PATH",
+                        help="Input folder for one keyword (repeatable)")
+    parser.add_argument("--output", required=True, help="Output folder")
+    parser.add_argument("--parallel", action="store_true", help="Read workbooks in a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Read only new or changed files; the rest come from the compile manifest")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
+    folder_map = {}
+    for item in args.folder:
+        keyword, _, path = item.partition("=")
+        if keyword not in keywords or not path:
+            parser.error(f"Unknown keyword or missing path in '{item}'. Keywords: {', '.join(keywords)}")
+        folder_map[keyword] = path
+
+    # Exit code 1 when a folder or file failed, so scheduled runs notice it
+    result = compile_all(folder_map, args.output, args.parallel, args.workers, incremental=args.incremental)
+    return print_result(result, as_json=args.json)
+
+def run_gui(master=None):
+    """TATA SCS Excel File Compiler window: a thin wrapper over compile_all."""
+    def browse_folder(radio_value):
+        """Allows user to select a folder for input files."""
+        folder_path = filedialog.askdirectory()
+        folder_entries[radio_value].delete(0, tk.END)
+        folder_entries[radio_value].insert(0, folder_path)
+
+    def browse_output_folder():
+        """Allows user to select a folder for output files."""
+        folder_path = filedialog.askdirectory()
+        output_folder_entry.delete(0, tk.END)
+        output_folder_entry.insert(0, folder_path)
+
+    def run_compile():
+        """Runs the compilation process for all selected keywords and folders."""
+        output_folder = output_folder_entry.get()
+        if not output_folder:
+            messagebox.showwarning("TATA SCS Monthly Data", "Please select an output folder.")
+            return
+
+        folder_map = {keyword: folder_entries[idx].get() for idx, keyword in enumerate(keywords)}
+        parallel = parallel_var.get()  # Tk variables are read here, not on the worker thread
+        incremental = incremental_var.get()
+
+        def compile_job(progress):
+            # Process all keywords
+            return compile_all(folder_map, output_folder, parallel=parallel, progress=progress,
+                               incremental=incremental)
+
+        # Runs on a worker thread; the panel shows the progress, then compile_finished the results
+        panel.start(compile_job)
+
+    def compile_finished(result):
+        """Shows the results of a Run All (on the Tk thread) and opens the output folder."""
         # Display final message box with all results
-        final_message = "\n".join(results)
-        messagebox.showinfo("TATA SCS Monthly Data", f"Processing complete:\n\n{final_message}")
+        show_result(result, "TATA SCS Monthly Data")
 
-    finally:
         # Optionally open the output folder
-        os.startfile(output_folder)  # For Windows
+        os.startfile(output_folder_entry.get())  # For Windows
 
-# Create the main window
-root = tk.Tk()
-root.title("TATA SCS Excel File Compiler")
+    # Create the main window
+    # A Toplevel of the launcher's window when opened from it, else its own Tk root
+    root = tool_window(master)
+    root.title("TATA SCS Excel File Compiler")
 
-# Create frames for better layout
-frame_header = tk.Frame(root, padx=10, pady=10)
-frame_header.pack(fill=tk.X)
+    # Load pandas, openpyxl and the engine while the folders are being picked
+    warm_up("pandas", "openpyxl", "scs_core.compiler", "scs_core.manifest")
 
-frame_inputs = tk.Frame(root, padx=10, pady=10)
-frame_inputs.pack(fill=tk.BOTH, expand=True)
+    # Create frames for better layout
+    frame_header = tk.Frame(root, padx=10, pady=10)
+    frame_header.pack(fill=tk.X)
 
-frame_buttons = tk.Frame(root, padx=10, pady=10)
-frame_buttons.pack(fill=tk.X)
+    frame_inputs = tk.Frame(root, padx=10, pady=10)
+    frame_inputs.pack(fill=tk.BOTH, expand=True)
 
-# Header Label
-header_label = tk.Label(frame_header, text="TATA SCS Monthly Data Compiler", font=("Arial", 16, "bold"))
-header_label.pack()
+    frame_buttons = tk.Frame(root, padx=10, pady=10)
+    frame_buttons.pack(fill=tk.X)
 
-# Keywords selection and control layout
-keywords = [
-    "OTC INVOICE", "PURCHASE LINE PO", "Purchase Line Items",
-    "SPARE CONSUMPTION", "CLOSING STOCK", "stock transaction",
-    "channel partner", "Job Line Invoice", "sap purchase order reason"
-]
+    # Header Label
+    header_label = tk.Label(frame_header, text="TATA SCS Monthly Data Compiler", font=("Arial", 16, "bold"))
+    header_label.pack()
+
+    folder_entries = {}
+    output_folder_entry = tk.Entry(frame_buttons, width=40)
+    output_folder_entry.pack(padx=5, pady=5)
+
+    # Output folder path button
+    browse_output_folder_button = tk.Button(frame_buttons, text="Browse Output Folder", command=browse_output_folder, bg="lightgreen")
+    browse_output_folder_button.pack()
+
+    run_buttons = []
+    for idx, keyword in enumerate(keywords):
+        tk.Label(frame_inputs, text=f"{keyword}:", font=("Arial", 12, "bold")).grid(row=idx, column=0, padx=5, pady=5, sticky="w")
+
+        tk.Label(frame_inputs, text="Folder:", font=("Arial", 10)).grid(row=idx, column=1, padx=5, pady=5, sticky="w")
+        folder_entry = tk.Entry(frame_inputs, width=40)
+        folder_entry.grid(row=idx, column=2, padx=5, pady=5, sticky="ew")
+        folder_entries[idx] = folder_entry
+        browse_folder_button = tk.Button(frame_inputs, text="Browse Folder", command=lambda v=idx: browse_folder(v), bg="lightblue")
+        browse_folder_button.grid(row=idx, column=3, padx=5, pady=5)
+
+    # Parallel reading of workbooks (one worker process per CPU)
+    parallel_var = tk.BooleanVar(root, value=False)
+    parallel_check = tk.Checkbutton(frame_buttons, text="Parallel read (faster for many files)", variable=parallel_var)
+    parallel_check.pack()
+
+    # Incremental compile: files already read on an earlier run come from the compile manifest
+    incremental_var = tk.BooleanVar(root, value=False)
+    incremental_check = tk.Checkbutton(frame_buttons, text="Only read new or changed files", variable=incremental_var)
+    incremental_check.pack()
 
-folder_entries = {}
-output_folder_entry = tk.Entry(frame_buttons, width=40)
-output_folder_entry.pack(padx=5, pady=5)
+    # Run All button
+    run_all_button = tk.Button(frame_buttons, text="Run All", command=run_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
+    run_all_button.pack()
 
-# Output folder path button
-browse_output_folder_button = tk.Button(frame_buttons, text="Browse Output Folder", command=browse_output_folder, bg="lightgreen")
-browse_output_folder_button.pack()
+    # Progress, elapsed time and rows per second of the running compile, with Cancel
+    panel = JobPanel(frame_buttons, title="TATA SCS Monthly Data", on_finish=compile_finished).pack(pady=5)
 
-run_buttons = []
-for idx, keyword in enumerate(keywords):
-    tk.Label(frame_inputs, text=f"{keyword}:", font=("Arial", 12, "bold")).grid(row=idx, column=0, padx=5, pady=5, sticky="w")
+    # Configure column weights for expanding
+    frame_inputs.grid_columnconfigure(2, weight=1)
 
-    tk.Label(frame_inputs, text="Folder:", font=("Arial", 10)).grid(row=idx, column=1, padx=5, pady=5, sticky="w")
-    folder_entry = tk.Entry(frame_inputs, width=40)
-    folder_entry.grid(row=idx, column=2, padx=5, pady=5, sticky="ew")
-    folder_entries[idx] = folder_entry
-    browse_folder_button = tk.Button(frame_inputs, text="Browse Folder", command=lambda v=idx: browse_folder(v), bg="lightblue")
-    browse_folder_button.grid(row=idx, column=3, padx=5, pady=5)
+    # Start the GUI event loop
+    run_window(root)
 
-# Run All button
-run_all_button = tk.Button(frame_buttons, text="Run All", command=run_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
-run_all_button.pack()
+if __name__ == "__main__":
+    # Needed for the worker processes in the packaged .exe
+    multiprocessing.freeze_support()
 
-# Configure column weights for expanding
-frame_inputs.grid_columnconfigure(2, weight=1)
+    if len(sys.argv) > 1:
+        sys.exit(run_headless(sys.argv[1:]))
 
-# Start the GUI event loop
-root.mainloop()
+    run_gui()
@@ -6,13 +6,23 @@ from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.styles import Font
 
+from scs_core.reader import read_excel
+from scs_core.registry import tool_window, run_window
+from scs_core.collector import FrameCollector
+from scs_core.batch import completed
+from scs_core.jobs import Progress, JobPanel
+
 def log_error(message):
     """Logs errors to an error log file."""
     with open("error_log.txt", "a") as f:
         f.write(f"{pd.Timestamp.now()}: {message}\n")
 
-def compile_excel_files(folder_path):
-    """Compiles all Excel files from a folder into a DataFrame."""
+def compile_excel_files(folder_path, progress=None):
+    """Compiles all Excel files from a folder into a DataFrame.
+
+    Every workbook read is reported to progress (scs_core.jobs), which also stops
+    the run when the user cancels it.
+    """
     try:
         files = os.listdir(folder_path)
     except FileNotFoundError:
@@ -23,29 +33,30 @@ def compile_excel_files(folder_path):
         return pd.DataFrame(), f"Permission denied: {folder_path}"
 
     excel_files = [f for f in files if f.endswith('.xlsx')]
-    compiled_df = pd.DataFrame()
 
     if not excel_files:
-        return compiled_df, "No Excel files found in the folder."
+        return pd.DataFrame(), "No Excel files found in the folder."
+
+    collector = FrameCollector()
+    progress = progress or Progress()
+    progress.expect(len(excel_files))
 
     for file in excel_files:
         input_file = os.path.join(folder_path, file)
+        rows = 0
         try:
-            df = pd.read_excel(input_file, sheet_name=None)  # Read all sheets
+            df = read_excel(input_file, sheet_name=None)  # Read all sheets
             for sheet_name, sheet_data in df.items():
-                compiled_df = pd.concat([compiled_df, sheet_data], ignore_index=True)
+                collector.add(sheet_data, source=f"{file} [{sheet_name}]")
+                rows += len(sheet_data)
         except Exception as e:
             log_error(f"Error processing file {file}: {e}")
+        progress.step(file, rows=rows)
 
-    return compiled_df, None
-
-def run_compile():
-    """Runs the compilation process for all dealer folders."""
-    main_folder = folder_entry.get()
-    if not main_folder:
-        messagebox.showwarning("Warning", "Please select the main dealer folder.")
-        return
+    return collector.build(), None
 
+def compile_dealer_folders(main_folder, progress=None):
+    """Compiles every keyword subfolder of main_folder into <keyword>.xlsx next to it; returns a RunResult."""
     results = []
 
     dealer_names = [
@@ -57,7 +68,7 @@ def run_compile():
     for dealer in dealer_names:
         dealer_folder = os.path.join(main_folder, dealer)
         if os.path.isdir(dealer_folder):
-            compiled_df, error = compile_excel_files(dealer_folder)
+            compiled_df, error = compile_excel_files(dealer_folder, progress)
             if compiled_df.empty:
                 results.append(f"{dealer}: {error if error else 'No data to compile.'}")
                 continue
@@ -88,29 +99,48 @@ def run_compile():
             results.append(f"{dealer}: Skipped (folder not found).")
 
     final_message = "\n".join(results)
-    messagebox.showinfo("Processing Complete", f"Results:\n\n{final_message}")
+    return completed(f"Results:\n\n{final_message}")
+
+def run_gui(master=None):
+    """TATA SCS Excel File Compiler window: a thin wrapper over compile_dealer_folders."""
+    def run_compile():
+        """Runs the compilation process for all dealer folders."""
+        main_folder = folder_entry.get()
+        if not main_folder:
+            messagebox.showwarning("Warning", "Please select the main dealer folder.")
+            return
+
+        # Runs on a worker thread; the panel shows the progress and then the results
+        panel.start(compile_dealer_folders, main_folder)
+
+    # Create the main window
+    # A Toplevel of the launcher's window when opened from it, else its own Tk root
+    root = tool_window(master)
+    root.title("TATA SCS Excel File Compiler")
+
+    frame_header = tk.Frame(root, padx=10, pady=10)
+    frame_header.pack(fill=tk.X)
 
-# Create the main window
-root = tk.Tk()
-root.title("TATA SCS Excel File Compiler")
+    frame_buttons = tk.Frame(root, padx=10, pady=10)
+    frame_buttons.pack(fill=tk.X)
 
-frame_header = tk.Frame(root, padx=10, pady=10)
-frame_header.pack(fill=tk.X)
+    header_label = tk.Label(frame_header, text="TATA SCS Monthly Data Compiler", font=("Arial", 16, "bold"))
+    header_label.pack()
 
-frame_buttons = tk.Frame(root, padx=10, pady=10)
-frame_buttons.pack(fill=tk.X)
+    folder_entry = tk.Entry(frame_buttons, width=40)
+    folder_entry.pack(padx=5, pady=5)
 
-header_label = tk.Label(frame_header, text="TATA SCS Monthly Data Compiler", font=("Arial", 16, "bold"))
-header_label.pack()
+    browse_folder_button = tk.Button(frame_buttons, text="Browse Main Dealer Folder", command=lambda: folder_entry.insert(0, filedialog.askdirectory()), bg="lightgreen")
+    browse_folder_button.pack()
 
-folder_entry = tk.Entry(frame_buttons, width=40)
-folder_entry.pack(padx=5, pady=5)
+    run_all_button = tk.Button(frame_buttons, text="Run All", command=run_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
+    run_all_button.pack()
 
-browse_folder_button = tk.Button(frame_buttons, text="Browse Main Dealer Folder", command=lambda: folder_entry.insert(0, filedialog.askdirectory()), bg="lightgreen")
-browse_folder_button.pack()
+    # Progress, elapsed time and rows per second of the running compile, with Cancel
+    panel = JobPanel(frame_buttons, title="Processing Complete").pack(pady=5)
 
-run_all_button = tk.Button(frame_buttons, text="Run All", command=run_compile, bg="blue", fg="white", font=('Arial', 12, 'bold'))
-run_all_button.pack()
+    # Start the GUI event loop
+    run_window(root)
 
-# Start the GUI event loop
-root.mainloop()
+if __name__ == "__main__":
+    run_gui()
@@ -1,30 +1,32 @@
 import os
-import pandas as pd
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter.simpledialog import askstring
-from tkcalendar import DateEntry  # For date picker
-from openpyxl import Workbook
-from openpyxl.styles import Font, Border, Side
-from openpyxl.utils import get_column_letter
 import logging
+from scs_core.registry import tool_window, run_window
+from scs_core.lazy import lazy_import, warm_up
+
+# pandas and the engine modules are imported on first use, so the window opens at once
+pd = lazy_import("pandas")
 
 # Set up logging
 logging.basicConfig(filename='processing.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def read_file(file_path):
-    """Read file based on its extension."""
+def read_file(file_path, columns=None):
+    """Read file based on its extension, parsing only the given columns when provided."""
+    from scs_core.reader import read_excel
+
     file_path_str = str(file_path)  # Ensure file path is a string
     try:
-        if file_path_str.endswith('.xlsx'):
-            return pd.read_excel(file_path)
+        if file_path_str.endswith(('.xlsx', '.xls')):
+            # Engine (openpyxl/calamine/xlrd) is chosen by the shared reader
+            return read_excel(file_path, columns=columns)
         elif file_path_str.endswith('.csv'):
-            return pd.read_csv(file_path)
-        elif file_path_str.endswith('.xls'):
-            return pd.read_excel(file_path, engine='xlrd')
+            return pd.read_csv(file_path, usecols=columns)
         elif file_path_str.endswith('.json'):
-            return pd.read_json(file_path)
+            df = pd.read_json(file_path)
+            return df[columns] if columns else df
         else:
             raise ValueError("Unsupported file format")
     except Exception as e:
@@ -35,20 +37,12 @@ def validate_columns(df, required_columns):
     """Validate if the required columns are in the DataFrame."""
     return all(column in df.columns for column in required_columns)
 
-def load_location_mapping(mapping_file):
-    """Load location mapping from a file."""
-    location_df = read_file(mapping_file)
-    
-    # Check if the required columns exist in the dataframe
-    if 'Code' not in location_df.columns or 'Final Location' not in location_df.columns:
-        raise ValueError("Mapping file must contain 'Code' and 'Final Location' columns.")
-    
-    return dict(zip(location_df['Code'], location_df['Final Location']))
-
 def filter_sap_backorders(df, filter_date):
     """Filter SAP backorders to keep only the specified date for 'SAP-000' and 'SAP-200'."""
-    # Identify rows where Order Number starts with 'SAP-000' or 'SAP-200'
-    sap_filter = df['OrderNumber'].str.startswith(('SAP-000', 'SAP-200'), na=False)
+    from scs_core.orders import order_families
+
+    # Identify rows of the SAP-000 and SAP-200 order families
+    sap_filter = order_families(df['OrderNumber']).isin(['SAP-000', 'SAP-200']).to_numpy()
     sap_df = df[sap_filter]
     
     # Convert the filter_date to a pandas Timestamp
@@ -68,14 +62,18 @@ def filter_sap_backorders(df, filter_date):
     
     return df_filtered
 
-def process_sap_purchase_backorders(file_paths, location_mapping, filter_date):
+def process_sap_purchase_backorders(file_paths, mapping_file, filter_date):
     """Process SAP purchase backorder files with filtering."""
-    combined_df = pd.DataFrame()
+    from scs_core.collector import FrameCollector
+    from scs_core.locations import get_resolver
+    from scs_core.partmaster import part_text
+
+    collector = FrameCollector(columns=['Location', 'OrderNumber', 'OrderDate', 'PartNumber', 'POQty'])
     required_columns = ['Division', 'Order Number', 'Order Date', 'Part No', 'Pending Qty.']
     
     for file_path in file_paths:
         try:
-            df = read_file(file_path)
+            df = read_file(file_path, columns=required_columns)
             if not validate_columns(df, required_columns):
                 raise ValueError(f"File {file_path} does not contain required columns.")
             
@@ -87,28 +85,36 @@ def process_sap_purchase_backorders(file_paths, location_mapping, filter_date):
                 'Pending Qty.': 'POQty'
             }, inplace=True)
             
-            df['PartNumber'] = df['PartNumber'].astype(str)
-            df['Location'] = df['Location'].map(location_mapping).fillna(df['Location'])  # Use original code if not in mapping
+            df['PartNumber'] = part_text(df['PartNumber'])
+            df['Location'] = get_resolver().resolve(df['Location'], 'code', mapping_file, default=df['Location'])  # Use original code if not in mapping
             df['OrderDate'] = pd.to_datetime(df['OrderDate'], format='%d/%m/%Y')
             
             # Apply the filtering function
             df_filtered = filter_sap_backorders(df, filter_date)
             
             # Combine remaining data
-            combined_df = pd.concat([combined_df, df_filtered[['Location', 'OrderNumber', 'OrderDate', 'PartNumber', 'POQty']]], ignore_index=True)
+            collector.add(df_filtered, source=file_path)
             
         except Exception as e:
             logging.error(f"Error processing SAP file {file_path}: {e}")
     
-    return combined_df
+    return collector.build()
+
+# Columns the OEM invoice upload needs from each Intransit export
+INTRANSIT_COLUMNS = ['Division Name', 'Order #', 'Part #', 'Recd Qty', 'Invoice_Date', 'Status']
 
-def process_intransit_files(folder_path, max_invoice_days, location_mapping):
+def process_intransit_files(folder_path, max_invoice_days, mapping_file):
     """Process intransit files."""
-    combined_df = pd.DataFrame()
+    from scs_core.reader import SchemaError
+    from scs_core.collector import FrameCollector
+    from scs_core.locations import get_resolver
+    from scs_core.partmaster import part_text
+
+    collector = FrameCollector()
     
     for file_path in Path(folder_path).glob("*"):
         try:
-            df = read_file(file_path)
+            df = read_file(file_path, columns=INTRANSIT_COLUMNS)
             df.rename(columns={
                 'Division Name': 'Location',
                 'Order #': 'OrderNumber',
@@ -117,7 +123,7 @@ def process_intransit_files(folder_path, max_invoice_days, location_mapping):
                 'Invoice_Date': 'OrderDate'
             }, inplace=True)
             
-            df['PartNumber'] = df['PartNumber'].astype(str)
+            df['PartNumber'] = part_text(df['PartNumber'])
             df['Days Since Invoice'] = (pd.Timestamp.today() - pd.to_datetime(df['OrderDate'], format='%d/%m/%Y')).dt.days
             df_filtered = df[
                 (df['Days Since Invoice'] > 0) & 
@@ -126,54 +132,28 @@ def process_intransit_files(folder_path, max_invoice_days, location_mapping):
             ]
             
             df_filtered = df_filtered.dropna(how='all', axis=1)
-            df_filtered['Location'] = df_filtered['Location'].map(location_mapping).fillna(df_filtered['Location'])  # Use original code if not in mapping
-            combined_df = pd.concat([combined_df, df_filtered], ignore_index=True)
+            df_filtered['Location'] = get_resolver().resolve(df_filtered['Location'], 'code', mapping_file, default=df_filtered['Location'])  # Use original code if not in mapping
+            collector.add(df_filtered, source=file_path.name)
+        except SchemaError:
+            # A wrong export in the Intransit folder must stop the run, not vanish from the output
+            raise
         except Exception as e:
             logging.error(f"Error processing Intransit file {file_path}: {e}")
     
-    combined_df = combined_df.dropna(how='all', axis=1)
+    combined_df = collector.build().dropna(how='all', axis=1)
     
     return combined_df[['Location', 'OrderNumber', 'OrderDate', 'PartNumber', 'POQty']]
 
 def save_output(final_output, output_folder_path, file_format='xlsx'):
     """Save the output to a specified file format."""
+    from scs_core.writer import ReportWriter, HEADER, BORDERED
+
     try:
         if file_format == 'xlsx':
             output_file_path = os.path.join(output_folder_path, "OEMInvoice.xlsx")
-            with pd.ExcelWriter(output_file_path, engine='openpyxl') as writer:
-                final_output.to_excel(writer, index=False, sheet_name='Sheet1')
-                workbook = writer.book
-                worksheet = writer.sheets['Sheet1']
-                
-                # Apply borders around all cells
-                thin_border = Border(left=Side(border_style='thin'), 
-                                     right=Side(border_style='thin'),
-                                     top=Side(border_style='thin'),
-                                     bottom=Side(border_style='thin'))
-                for row in worksheet.iter_rows():
-                    for cell in row:
-                        cell.border = thin_border
-
-                # Adjust column width to fit data
-                for col in worksheet.columns:
-                    max_length = 0
-                    column_letter = get_column_letter(col[0].column)
-                    for cell in col:
-                        try:
-                            if cell.value:
-                                max_length = max(max_length, len(str(cell.value)))
-                        except:
-                            pass
-                    adjusted_width = (max_length + 2)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-
-                # Ensure no header formatting
-                for cell in worksheet[1]:
-                    cell.font = Font(bold=False)  # Ensure headers are not bold
-                    cell.fill = openpyxl.styles.PatternFill(fill_type=None)  # No fill color
-
-                # Save the workbook
-                workbook.save(output_file_path)
+            # Thin borders everywhere, plain (not bold) header, widths measured on the DataFrame
+            with ReportWriter(output_file_path) as writer:
+                writer.write_sheet(final_output, "Sheet1", header=dict(HEADER, bold=False), body=BORDERED)
         elif file_format == 'csv':
             output_file_path = os.path.join(output_folder_path, "OEMInvoice.csv")
             final_output.to_csv(output_file_path, index=False)
@@ -188,18 +168,22 @@ def save_output(final_output, output_folder_path, file_format='xlsx'):
 
 def combine_and_save_output(sap_files, intransit_folder_path, output_folder_path, mapping_file, filter_date, max_invoice_days=90, file_format='xlsx'):
     """Combine and save the final output."""
+    from scs_core.locations import get_resolver
+
     try:
-        location_mapping = load_location_mapping(mapping_file)
+        # Code -> Final Location index of the mapping file (checks its columns up front)
+        get_resolver().index('code', mapping_file)
+        get_resolver().clear_unmatched()
         
         # Process SAP files if provided
         if sap_files:
-            sap_output = process_sap_purchase_backorders(sap_files, location_mapping, filter_date)
+            sap_output = process_sap_purchase_backorders(sap_files, mapping_file, filter_date)
         else:
             sap_output = pd.DataFrame(columns=['Location', 'OrderNumber', 'OrderDate', 'PartNumber', 'POQty'])
         
         # Process Intransit files if folder path is provided
         if intransit_folder_path:
-            intransit_output = process_intransit_files(intransit_folder_path, max_invoice_days, location_mapping)
+            intransit_output = process_intransit_files(intransit_folder_path, max_invoice_days, mapping_file)
         else:
             intransit_output = pd.DataFrame(columns=['Location', 'OrderNumber', 'OrderDate', 'PartNumber', 'POQty'])
         
@@ -214,6 +198,7 @@ def combine_and_save_output(sap_files, intransit_folder_path, output_folder_path
         final_output['OEMInvoiceQty'] = ''
         
         # Save the output
+        logging.info(get_resolver().unmatched_report())
         save_output(final_output, output_folder_path, file_format)
     except ValueError as ve:
         messagebox.showerror("Error", str(ve))
@@ -221,7 +206,7 @@ def combine_and_save_output(sap_files, intransit_folder_path, output_folder_path
         logging.error(f"Error occurred: {e}")
         messagebox.showerror("Error", str(e))
 
-def run_gui():
+def run_gui(master=None):
     """Set up and run the GUI."""
     def select_sap_files():
         sap_paths = filedialog.askopenfilenames(filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("JSON files", "*.json")])
@@ -267,36 +252,42 @@ def run_gui():
                 messagebox.showerror("Error", str(e))
 
     # Set up GUI
-    root = tk.Tk()
+    # A Toplevel of the launcher's window when opened from it, else its own Tk root
+    root = tool_window(master)
     root.title("Data Processing")
 
+    # Load pandas, openpyxl and the engine while the files are being picked
+    warm_up("pandas", "openpyxl", "xlsxwriter", "scs_core.reader", "scs_core.collector",
+            "scs_core.locations", "scs_core.partmaster", "scs_core.orders", "scs_core.writer")
+
     tk.Label(root, text="Select SAP Purchase Backorder Files:").pack()
-    sap_files_var = tk.StringVar()
+    sap_files_var = tk.StringVar(root)
     tk.Entry(root, textvariable=sap_files_var, width=100).pack()
     tk.Button(root, text="Browse", command=select_sap_files).pack()
 
     tk.Label(root, text="Select Intransit Folder:").pack()
-    intransit_folder_var = tk.StringVar()
+    intransit_folder_var = tk.StringVar(root)
     tk.Entry(root, textvariable=intransit_folder_var, width=100).pack()
     tk.Button(root, text="Browse", command=select_intransit_folder).pack()
 
     tk.Label(root, text="Select Output Folder:").pack()
-    output_folder_var = tk.StringVar()
+    output_folder_var = tk.StringVar(root)
     tk.Entry(root, textvariable=output_folder_var, width=100).pack()
     tk.Button(root, text="Browse", command=select_output_folder).pack()
 
     tk.Label(root, text="Select Location Mapping File:").pack()
-    mapping_file_var = tk.StringVar()
+    mapping_file_var = tk.StringVar(root)
     tk.Entry(root, textvariable=mapping_file_var, width=100).pack()
     tk.Button(root, text="Browse", command=select_mapping_file).pack()
 
     tk.Label(root, text="Select Date (dd/mm/yyyy):").pack()
+    from tkcalendar import DateEntry  # For date picker
     date_entry = DateEntry(root, date_pattern='dd/mm/yyyy')
     date_entry.pack()
 
     tk.Button(root, text="Run Processing", command=run_processing).pack()
 
-    root.mainloop()
+    run_window(root)
 
 if __name__ == "__main__":
     run_gui()
@@ -4,20 +4,9 @@ import pandas as pd
 from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.styles import Alignment
+from scs_core.registry import tool_window, run_window
 
-def select_input_file():
-    global input_file_path
-    input_file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
-    if input_file_path:
-        input_label.config(text=f"Selected File: {input_file_path}")
-
-def select_output_directory():
-    global output_directory
-    output_directory = filedialog.askdirectory()
-    if output_directory:
-        output_label.config(text=f"Output Folder: {output_directory}")
-
-def transform_and_save_excel():
+def transform_and_save_excel(input_file_path, output_directory):
     try:
         if not input_file_path or not output_directory:
             messagebox.showwarning("Warning", "Please select an input file and output directory.")
@@ -71,34 +60,49 @@ def transform_and_save_excel():
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-# Setup the GUI
-root = tk.Tk()
-root.title("Excel Transformer")
+def run_gui(master=None):
+    """Excel Transformer window."""
+    paths = {"input": "", "output": ""}
+
+    def select_input_file():
+        paths["input"] = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
+        if paths["input"]:
+            input_label.config(text=f"Selected File: {paths['input']}")
+
+    def select_output_directory():
+        paths["output"] = filedialog.askdirectory()
+        if paths["output"]:
+            output_label.config(text=f"Output Folder: {paths['output']}")
+
+    # Setup the GUI (a Toplevel of the launcher's window when opened from it, else its own Tk root)
+    root = tool_window(master)
+    root.title("Excel Transformer")
 
-# Enhancements for better GUI appearance
-root.geometry('500x300')  # Bigger window size
-root.config(bg='light grey')  # Background color
+    # Enhancements for better GUI appearance
+    root.geometry('500x300')  # Bigger window size
+    root.config(bg='light grey')  # Background color
 
-# Heading Label
-heading_label = tk.Label(root, text="Order Data Sent", font=('Helvetica', 16, 'bold'), bg='light grey')
-heading_label.pack(pady=10)  # Add some vertical padding
+    # Heading Label
+    heading_label = tk.Label(root, text="Order Data Sent", font=('Helvetica', 16, 'bold'), bg='light grey')
+    heading_label.pack(pady=10)  # Add some vertical padding
 
-input_file_path = ''
-output_directory = ''
+    input_label = tk.Label(root, text="No file selected.", bg='light grey')
+    input_label.pack(pady=10)
 
-input_label = tk.Label(root, text="No file selected.", bg='light grey')
-input_label.pack(pady=10)
+    output_label = tk.Label(root, text="No output directory selected.", bg='light grey')
+    output_label.pack(pady=10)
 
-output_label = tk.Label(root, text="No output directory selected.", bg='light grey')
-output_label.pack(pady=10)
+    select_input_button = tk.Button(root, text="Select Input File", command=select_input_file, height=2, width=20)
+    select_input_button.pack(pady=5)
 
-select_input_button = tk.Button(root, text="Select Input File", command=select_input_file, height=2, width=20)
-select_input_button.pack(pady=5)
+    select_output_button = tk.Button(root, text="Select Output Directory", command=select_output_directory, height=2, width=20)
+    select_output_button.pack(pady=5)
 
-select_output_button = tk.Button(root, text="Select Output Directory", command=select_output_directory, height=2, width=20)
-select_output_button.pack(pady=5)
+    transform_button = tk.Button(root, text="Transform and Save Output",
+                                 command=lambda: transform_and_save_excel(paths["input"], paths["output"]), height=2, width=20)
+    transform_button.pack(pady=10)
 
-transform_button = tk.Button(root, text="Transform and Save Output", command=transform_and_save_excel, height=2, width=20)
-transform_button.pack(pady=10)
+    run_window(root)
 
-root.mainloop()
+if __name__ == "__main__":
+    run_gui()
@@ -1,11 +1,15 @@
-import subprocess
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 from tkinter import font
 import os
 import sys
-import pandas as pd
+import multiprocessing
+from scs_core.registry import ScriptRegistry, format_record
+from scs_core.lazy import lazy_import, warm_up
+
+# pandas is imported on first use, so the window opens at once
+pd = lazy_import("pandas")
 
 # Function to get the path of a file
 def resource_path(relative_path):
@@ -58,7 +62,7 @@ scripts = [
     "Po locationwise TATA & CVBU.py",
     "Resrve Stock Final.py",
     "Final Pending GRN.py",
-    "WIP FINAL.py"
+    "WIP FINAL.py",
     "Resrve Stock Final.py",
     "Resrve Stock Final CVBU",
     "Monthly Data Compiler by Folder",
@@ -67,88 +71,106 @@ scripts = [
     "TOC compilar file wise.py"
 ]
 
-# Function to run the selected script
+# Function to show a finished run and its wall time (called on the Tk thread)
+def show_record(record):
+    runs_list.insert(0, format_record(record))
+    if record.error:
+        status_label.config(text=f"'{record.name}': {record.error}", fg="red")
+    else:
+        status_label.config(text=f"Script '{record.name}' Run Successfully in {record.seconds:.1f}s.", fg="green")
+    print(format_record(record))
+
+# Every script runs in this process, so pandas, the masters and the parse cache
+# are loaded once per session instead of once per run. Each one opens its window
+# (run_gui) as a Toplevel of this one, and every run from it lands in the runs list
+registry = ScriptRegistry(on_record=show_record)
+for script in scripts:
+    registry.register(script, resource_path(script), window="run_gui")
+
+# Function to open the selected script's window (on the Tk thread, like every window)
 def run_script(script):
-    try:
-        # Use sys._MEIPASS if running from a packaged .exe
-        script_path = resource_path(script)
-        print(f"\nRunning script: {script_path}")
-
-        # Run the script and capture output
-        result = subprocess.run(["python", script_path], check=True, capture_output=True, text=True)
-
-        # If successful, show output in messagebox and status
-        messagebox.showinfo("Success", f"Script '{script}' Run Successfully!")
-        status_label.config(text=f"Script '{script}' Run Successfully.", fg="green")
-        print(f"Script Output: {result.stdout}")  # Print output in terminal
-
-    except subprocess.CalledProcessError as e:
-        # Handle errors by displaying detailed output
-        messagebox.showerror("Error", f"Error running script: {e}\nExit code: {e.returncode}\n{e.stderr}")
-        status_label.config(text=f"Error: {e.stderr}", fg="red")
-        print(f"Error: {e.stderr}")  # Print error message
+    print(f"\nOpening script: {registry.report(script).path}")
+    error = registry.open_window(script, root)
+    if error:
+        messagebox.showerror("Error", f"Error running script '{script}': {error}")
+    else:
+        status_label.config(text=f"Opened '{script}'.", fg="green")
 
 # Function to handle the script selection from the dropdown
 def on_menu_select(event=None):
     selected_script = script_menu.get()
     if selected_script:
-        if selected_script in scripts:
+        if selected_script in registry.names():
             run_script(selected_script)
 
-# Creating the main window
-root = tk.Tk()
-root.title("TATA Team Script Runner")
-root.config(bg="#f0f0f0")
+if __name__ == "__main__":
+    # Reports that read in a process pool start workers that re-import this file
+    # (as __mp_main__ under Windows spawn); they must not build a second launcher
+    multiprocessing.freeze_support()
+
+    # Creating the main window
+    root = tk.Tk()
+    root.title("TATA Team Script Runner")
+    root.config(bg="#f0f0f0")
+
+    # Set the window icon
+    root.iconbitmap(icon_path)  # Path to your icon file
+
+    # Displaying the copyright message in the window
+    copyright_text = display_copyright()
 
-# Set the window icon
-root.iconbitmap(icon_path)  # Path to your icon file
+    # Adding a header label
+    header_font = font.Font(family="Helvetica", size=16, weight="bold")
+    header_label = tk.Label(root, text="Spare Care Solution", font=header_font, bg="#f0f0f0", fg="#333")
+    header_label.pack(pady=10)
 
-# Displaying the copyright message in the window
-copyright_text = display_copyright()
+    # Adding a label to display your name
+    name_label = tk.Label(root, text="Vishal", font=("Helvetica", 14), bg="#f0f0f0", fg="#333")
+    name_label.pack(pady=5)
 
-# Adding a header label
-header_font = font.Font(family="Helvetica", size=16, weight="bold")
-header_label = tk.Label(root, text="Spare Care Solution", font=header_font, bg="#f0f0f0", fg="#333")
-header_label.pack(pady=10)
+    # Displaying copyright message
+    copyright_label = tk.Label(root, text=copyright_text, font=("Helvetica", 10), bg="#f0f0f0", fg="#555")
+    copyright_label.pack(pady=5)
 
-# Adding a label to display your name
-name_label = tk.Label(root, text="Vishal", font=("Helvetica", 14), bg="#f0f0f0", fg="#333")
-name_label.pack(pady=5)
+    # Displaying your phone number
+    phone_label = tk.Label(root, text="Contact: 9129572268", font=("Helvetica", 10), bg="#f0f0f0", fg="#555")
+    phone_label.pack(pady=5)
 
-# Displaying copyright message
-copyright_label = tk.Label(root, text=copyright_text, font=("Helvetica", 10), bg="#f0f0f0", fg="#555")
-copyright_label.pack(pady=5)
+    # Adding a label to prompt for input
+    label = tk.Label(root, text="Select a script from the menu below:", bg="#f0f0f0")
+    label.pack(pady=10)
 
-# Displaying your phone number
-phone_label = tk.Label(root, text="Contact: 9129572268", font=("Helvetica", 10), bg="#f0f0f0", fg="#555")
-phone_label.pack(pady=5)
+    # Dropdown menu to select the script (showing actual script file names)
+    script_menu = ttk.Combobox(root, values=registry.names(), state="readonly")
+    script_menu.pack(pady=10, padx=20, fill='x')
 
-# Adding a label to prompt for input
-label = tk.Label(root, text="Select a script from the menu below:", bg="#f0f0f0")
-label.pack(pady=10)
+    # Add a button to run the selected script
+    run_button = tk.Button(root, text="Run Selected Script", width=20, height=2, bg="#4CAF50", fg="white", command=on_menu_select)
+    run_button.pack(pady=20)
 
-# Dropdown menu to select the script (showing actual script file names)
-script_menu = ttk.Combobox(root, values=scripts, state="readonly")
-script_menu.pack(pady=10, padx=20, fill='x')
+    # Add a "Exit" button
+    exit_button = tk.Button(root, text="Exit", width=20, bg="#f44336", fg="white", command=root.quit)
+    exit_button.pack(pady=10)
 
-# Add a button to run the selected script
-run_button = tk.Button(root, text="Run Selected Script", width=20, height=2, bg="#4CAF50", fg="white", command=on_menu_select)
-run_button.pack(pady=20)
+    # Status label to display script execution status
+    status_label = tk.Label(root, text="Select a script and press Run", bg="#f0f0f0", fg="black")
+    status_label.pack(pady=10)
 
-# Add a "Exit" button
-exit_button = tk.Button(root, text="Exit", width=20, bg="#f44336", fg="white", command=root.quit)
-exit_button.pack(pady=10)
+    # Wall time of every run this session, newest first
+    runs_label = tk.Label(root, text="Runs this session:", bg="#f0f0f0")
+    runs_label.pack()
+    runs_list = tk.Listbox(root, height=5, width=70)
+    runs_list.pack(pady=5, padx=20, fill='x')
 
-# Status label to display script execution status
-status_label = tk.Label(root, text="Select a script and press Run", bg="#f0f0f0", fg="black")
-status_label.pack(pady=10)
+    # Add a button to process the Excel files
+    excel_button = tk.Button(root, text="Process Excel Files", width=20, height=2, bg="#2196F3", fg="white", command=process_excel_files)
+    excel_button.pack(pady=20)
 
-# Add a button to process the Excel files
-excel_button = tk.Button(root, text="Process Excel Files", width=20, height=2, bg="#2196F3", fg="white", command=process_excel_files)
-excel_button.pack(pady=20)
+    # Configure the window to be resizable and auto-fit based on content
+    root.resizable(True, True)
 
-# Configure the window to be resizable and auto-fit based on content
-root.resizable(True, True)
+    # Load pandas and the Excel engines in the background; the first run finds them loaded
+    warm_up("pandas", "openpyxl", "xlsxwriter")
 
-# Run the Tkinter event loop
-root.mainloop()
+    # Run the Tkinter event loop
+    root.mainloop()
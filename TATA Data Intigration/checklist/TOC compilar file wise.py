@@ -4,6 +4,7 @@ from tkinter import filedialog, messagebox, ttk
 from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
 import os
+from scs_core.registry import tool_window, run_window
 
 def process_file(input_path, output_path, progress_var, progress_bar, total_files):
     try:
@@ -50,65 +51,71 @@ def process_file(input_path, output_path, progress_var, progress_bar, total_file
     except Exception as e:
         return f"Error processing {input_path}: {str(e)}"
 
-def browse_input():
-    filenames = filedialog.askopenfilenames(filetypes=[("Excel files", "*.xlsx")])
-    input_file_entry.delete(0, tk.END)
-    input_file_entry.insert(0, ';'.join(filenames))
-
-def browse_output():
-    foldername = filedialog.askdirectory()
-    output_folder_entry.delete(0, tk.END)
-    output_folder_entry.insert(0, foldername)
+# Initialize processed files counter (read by process_file)
+processed_files = [0]
 
-def run_process():
-    input_paths = input_file_entry.get().split(';')
-    output_path = output_folder_entry.get()
+def run_gui(master=None):
+    """Excel File Processor window: runs process_file on every selected workbook."""
+    def browse_input():
+        filenames = filedialog.askopenfilenames(filetypes=[("Excel files", "*.xlsx")])
+        input_file_entry.delete(0, tk.END)
+        input_file_entry.insert(0, ';'.join(filenames))
+
+    def browse_output():
+        foldername = filedialog.askdirectory()
+        output_folder_entry.delete(0, tk.END)
+        output_folder_entry.insert(0, foldername)
+
+    def run_process():
+        input_paths = input_file_entry.get().split(';')
+        output_path = output_folder_entry.get()
     
-    if not input_paths or not output_path:
-        messagebox.showwarning("Input Error", "Please select both input files and output folder.")
-        return
-
-    total_files = len(input_paths)
-    if total_files == 0:
-        messagebox.showwarning("Input Error", "No files selected.")
-        return
-
-    # Initialize progress bar
-    progress_var = tk.DoubleVar()
-    progress_bar = ttk.Progressbar(root, orient="horizontal", length=300, mode="determinate", variable=progress_var)
-    progress_bar.grid(row=3, column=0, columnspan=3, padx=10, pady=10)
-    progress_var.set(0)
-
-    # Initialize processed files counter
-    processed_files[0] = 0
+        if not input_paths or not output_path:
+            messagebox.showwarning("Input Error", "Please select both input files and output folder.")
+            return
+
+        total_files = len(input_paths)
+        if total_files == 0:
+            messagebox.showwarning("Input Error", "No files selected.")
+            return
+
+        # Initialize progress bar
+        progress_var = tk.DoubleVar(root)
+        progress_bar = ttk.Progressbar(root, orient="horizontal", length=300, mode="determinate", variable=progress_var)
+        progress_bar.grid(row=3, column=0, columnspan=3, padx=10, pady=10)
+        progress_var.set(0)
+
+        # Initialize processed files counter
+        processed_files[0] = 0
     
-    # Process each file
-    results = []
-    for file in input_paths:
-        result = process_file(file, output_path, progress_var, progress_bar, total_files)
-        results.append(result)
-        processed_files[0] += 1
+        # Process each file
+        results = []
+        for file in input_paths:
+            result = process_file(file, output_path, progress_var, progress_bar, total_files)
+            results.append(result)
+            processed_files[0] += 1
 
-    # Show completion message
-    messagebox.showinfo("Completed", "\n".join(results))
+        # Show completion message
+        messagebox.showinfo("Completed", "\n".join(results))
 
-# Set up the GUI
-root = tk.Tk()
-root.title("Excel File Processor")
+    # Set up the GUI
+    # A Toplevel of the launcher's window when opened from it, else its own Tk root
+    root = tool_window(master)
+    root.title("Excel File Processor")
 
-tk.Label(root, text="Input Files:").grid(row=0, column=0, padx=10, pady=5, sticky='e')
-input_file_entry = tk.Entry(root, width=50)
-input_file_entry.grid(row=0, column=1, padx=10, pady=5)
-tk.Button(root, text="Browse", command=browse_input).grid(row=0, column=2, padx=10, pady=5)
+    tk.Label(root, text="Input Files:").grid(row=0, column=0, padx=10, pady=5, sticky='e')
+    input_file_entry = tk.Entry(root, width=50)
+    input_file_entry.grid(row=0, column=1, padx=10, pady=5)
+    tk.Button(root, text="Browse", command=browse_input).grid(row=0, column=2, padx=10, pady=5)
 
-tk.Label(root, text="Output Folder:").grid(row=1, column=0, padx=10, pady=5, sticky='e')
-output_folder_entry = tk.Entry(root, width=50)
-output_folder_entry.grid(row=1, column=1, padx=10, pady=5)
-tk.Button(root, text="Browse", command=browse_output).grid(row=1, column=2, padx=10, pady=5)
+    tk.Label(root, text="Output Folder:").grid(row=1, column=0, padx=10, pady=5, sticky='e')
+    output_folder_entry = tk.Entry(root, width=50)
+    output_folder_entry.grid(row=1, column=1, padx=10, pady=5)
+    tk.Button(root, text="Browse", command=browse_output).grid(row=1, column=2, padx=10, pady=5)
 
-tk.Button(root, text="Run", command=run_process).grid(row=2, column=1, padx=10, pady=20)
+    tk.Button(root, text="Run", command=run_process).grid(row=2, column=1, padx=10, pady=20)
 
-# Initialize processed files counter
-processed_files = [0]
+    run_window(root)
 
-root.mainloop()
+if __name__ == "__main__":
+    run_gui()
@@ -1,44 +1,57 @@
 import tkinter as tk
 from tkinter import filedialog, StringVar
 import os
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 import calendar
-from openpyxl.styles import PatternFill, Alignment, Border, Side, Font
+from scs_core.lazy import lazy_import, warm_up
+from scs_core.batch import completed
+from scs_core.jobs import Progress, JobPanel
+
+# pandas and the engine modules are imported on first use, so the window opens at once
+pd = lazy_import("pandas")
 
 # Global variables to hold the file paths (initialized as empty strings)
 LOCATION_MASTER_PATH = ""
 PART_MASTER_PATH = ""
 
 # Function to clean the data and add required columns
-def clean_data(input_files, output_path):
+def clean_data(input_files, output_path, progress=None):
+    """WIP report (Data, Order status wise and Location monthwise sheets) of the
+    input files, written to output_path; returns a RunResult.
+
+    Every file read is reported to progress (scs_core.jobs), which also stops the
+    run when the user cancels it.
+    """
     global LOCATION_MASTER_PATH, PART_MASTER_PATH
-    
-    # Load the location master file
-    location_master = pd.read_excel(LOCATION_MASTER_PATH)
-    location_master.rename(columns={"Code": "Division", "Final Location": "Location"}, inplace=True)
+    from scs_core.reader import read_excel
+    from scs_core.categories import as_plain
+    from scs_core.collector import FrameCollector
+    from scs_core.locations import get_resolver
+    from scs_core.partmaster import get_partmaster, part_text
+    from scs_core.writer import ReportWriter
+
+    # Division -> Location index of the location master file (shared by the session)
+    locations = get_resolver()
 
-    # Load the part master file
-    part_master = pd.read_excel(PART_MASTER_PATH)
-    part_master.rename(columns={"Part Number": "Part No", "LandedCost": "Rate"}, inplace=True)
+    # Part master lookups come from the shared Partmaster index (read once per session)
+    part_master = get_partmaster(PART_MASTER_PATH)
 
-    all_data = []
+    # Location, Order Status, Type, ... are kept as categoricals in the combined data
+    collector = FrameCollector(compact=True)
+    progress = progress or Progress()
+    progress.expect(len(input_files))
 
     for file in input_files:
         # Read the file into a DataFrame
-        df = pd.read_excel(file)
+        df = read_excel(file)
         
         # Data cleaning steps
         df = df[~df['Order Number'].str.startswith('ICPOTC')]
         df = df[df['Order Type'].isin(['Service Order', 'OTC Sales'])]
         df = df[~df['Order Item Status'].isin(['Cancelled', 'Invoiced'])]
-        df['Part No'] = df['Part No'].astype(str)
+        df['Part No'] = part_text(df['Part No'])
         df = df[df['Qty Shipped'] > 0]
-        df = pd.merge(df, location_master, on="Division", how="left")
-        df['Location'] = df['Location'].fillna(df['Division'])
-        df = pd.merge(df, part_master[['Part No', 'Rate', 'Category']], on="Part No", how="left")
+        df['Location'] = locations.resolve(df['Division'], 'division', LOCATION_MASTER_PATH, default=df['Division'])
+        df = part_master.attach(df, 'Part No', {'LandedCost': 'Rate', 'Category': 'Category'})
         df['Rate'] = df['Rate'].fillna(0)
         df['Category'] = df['Category'].fillna("")
         df['Value'] = round(df['Rate'] * df['Qty Shipped'], 2)  # Rounded value
@@ -51,12 +64,14 @@ def clean_data(input_files, output_path):
             'Qty Shipped', 'Rate', 'Category', 'Value', 'Year', 'Month'
         ]
         df = df[required_columns]
-        all_data.append(df)
+        collector.add(df, source=file)
+        progress.step(os.path.basename(file), rows=len(df))
 
-    final_data = pd.concat(all_data, ignore_index=True)
+    final_data = collector.build()
 
     # Create the summary by Location and Order Status (dynamic types)
-    summary_by_location_status = final_data.groupby(['Location', 'Order Status', 'Type'])['Value'].sum().reset_index()
+    summary_by_location_status = final_data.groupby(['Location', 'Order Status', 'Type'], observed=True)['Value'].sum().reset_index()
+    summary_by_location_status = as_plain(summary_by_location_status)
 
     # Pivot the data so that Type values (Paid, Warranty, etc.) become rows
     summary_pivot = summary_by_location_status.pivot_table(index=['Location', 'Order Status'], columns='Type', values='Value', aggfunc='sum', fill_value=0)
@@ -69,7 +84,8 @@ def clean_data(input_files, output_path):
     summary_pivot.loc[('Grand Total', ''), :] = summary_pivot.sum(axis=0)
 
     # Create the Location monthwise summary
-    summary_data = final_data.groupby(['Year', 'Month', 'Location'])['Value'].sum().reset_index()
+    summary_data = final_data.groupby(['Year', 'Month', 'Location'], observed=True)['Value'].sum().reset_index()
+    summary_data = as_plain(summary_data)
 
     # Add a 'Month-Year' column for sorting and display
     summary_data['Month Number'] = summary_data['Month'].apply(lambda x: list(calendar.month_abbr).index(x[:3]))
@@ -93,102 +109,36 @@ def clean_data(input_files, output_path):
     location_monthwise_pivot['Grand Total'] = location_monthwise_pivot.sum(axis=1)
     location_monthwise_pivot.loc[('Grand Total', ''), :] = location_monthwise_pivot.sum(axis=0)
 
-    # Write all three sheets to the output Excel file
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+    # Write all three sheets to the output Excel file, formatted as they are written
+    with ReportWriter(output_path) as writer:
         # Write the raw data sheet
-        final_data.to_excel(writer, sheet_name='Data', index=False)
+        format_sheet(writer, final_data, 'Data')
 
         # Write the summary by Order Status sheet
-        summary_pivot.to_excel(writer, sheet_name='Order status wise')
+        format_sheet(writer, summary_pivot.reset_index(), 'Order status wise', is_summary=True, highlight_total_row=True)
 
         # Write the Location monthwise sheet
-        location_monthwise_pivot.to_excel(writer, sheet_name='Location monthwise sheet')
+        format_sheet(writer, location_monthwise_pivot.reset_index(), 'Location monthwise sheet', is_summary=True, highlight_total_row=True)
 
-    add_excel_formatting(output_path)
     print(f"Data has been cleaned, summarized, and saved to: {output_path}")
+    return completed(f"Report generated and saved to: {output_path}", [output_path])
 
-# Function to add Excel formatting
-def add_excel_formatting(output_path):
-    wb = load_workbook(output_path)
-
-    # Format main data sheet
-    if 'Data' in wb.sheetnames:
-        data_sheet = wb['Data']
-        format_sheet(data_sheet)
-
-    # Format summary sheet
-    if 'Location monthwise sheet' in wb.sheetnames:
-        summary_sheet = wb['Location monthwise sheet']
-        format_sheet(summary_sheet, is_summary=True, highlight_total_row=True)
-
-    # Format order status summary sheet
-    if 'Order status wise' in wb.sheetnames:
-        status_sheet = wb['Order status wise']
-        format_sheet(status_sheet, is_summary=True, highlight_total_row=True)
-
-    wb.save(output_path)
-
-def format_sheet(sheet, is_summary=False, highlight_total_row=False):
-    green_fill = PatternFill(start_color="00FF00", end_color="00FF00", fill_type="solid")
-    bold_font = Font(bold=True)
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
-                         top=Side(style='thin'), bottom=Side(style='thin'))
-    center_alignment = Alignment(horizontal='center', vertical='center')
-
-    # Apply header formatting
-    for cell in sheet[1]:
-        cell.fill = green_fill
-        cell.font = bold_font
-        cell.border = thin_border
-        cell.alignment = center_alignment
-
-    # Apply borders and center alignment to all cells
-    for row in sheet.iter_rows():
-        for cell in row:
-            cell.border = thin_border
-            cell.alignment = center_alignment
-
-    # Autofit column widths
-    for col in sheet.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        sheet.column_dimensions[column].width = max_length + 2
-
-    if highlight_total_row:
-        # Find the "Grand Total" row
-        for row in sheet.iter_rows():
-            for cell in row:
-                if cell.value == "Grand Total":
-                    for grand_cell in row:
-                        grand_cell.fill = green_fill
-                        grand_cell.font = bold_font
-                        grand_cell.alignment = center_alignment
+# Report styles: thin borders and centred text on every cell, green bold header
+GREEN = "#00FF00"
+CELL_STYLE = {"border": 1, "align": "center", "valign": "vcenter"}
 
+# Function to write one formatted sheet
+def format_sheet(writer, df, sheet_name, is_summary=False, highlight_total_row=False):
+    """Writes df with the report styles; column widths come from the DataFrame."""
+    column_styles = {}
     if is_summary:
         # Format all numerical cells as integers
-        for row in sheet.iter_rows(min_row=2):  # Skip header row
-            for cell in row:
-                if isinstance(cell.value, (int, float)):
-                    cell.number_format = '0'  # Format without decimals
-
-# Function to open file dialog to select Location Master file
-def select_location_master_file():
-    global LOCATION_MASTER_PATH
-    file = filedialog.askopenfilename(title="Select Location Master File", filetypes=(("Excel Files", "*.xlsx"), ("All Files", "*.*")))
-    if file:
-        LOCATION_MASTER_PATH = file
-        location_master_file_var.set(file)
-
-# Function to open file dialog to select Part Master file
-def select_part_master_file():
-    global PART_MASTER_PATH
-    file = filedialog.askopenfilename(title="Select Part Master File", filetypes=(("Excel Files", "*.xlsx"), ("All Files", "*.*")))
-    if file:
-        PART_MASTER_PATH = file
-        part_master_file_var.set(file)
+        column_styles = {col: {"num_format": "0"} for col in df.columns if pd.api.types.is_numeric_dtype(df[col])}
+
+    # The Grand Total row is the last row of the summaries
+    last_row = {"bold": True, "bg_color": GREEN} if highlight_total_row else None
+    writer.write_sheet(df, sheet_name, header=dict(CELL_STYLE, bold=True, bg_color=GREEN), body=CELL_STYLE,
+                       column_styles=column_styles, last_row=last_row)
 
 # Function to open file dialog to select input folder
 def select_input_folder():
@@ -218,8 +168,8 @@ def generate_report():
         return
 
     output_path = get_unique_filename(output_folder, "Wip Reports.xlsx")
-    clean_data(input_files, output_path)
-    print(f"Report generated and saved to: {output_path}")
+    # Runs on a worker thread; the panel shows the progress and then the result
+    panel.start(clean_data, input_files, output_path)
 
 # Function to create a unique output file name
 def get_unique_filename(folder, base_filename):
@@ -237,7 +187,11 @@ def get_unique_filename(folder, base_filename):
 # GUI Setup
 root = tk.Tk()
 root.title("Generate WIP Report")
-root.geometry("600x500")
+root.geometry("600x580")
+
+# Load pandas, openpyxl and the engine while the folders are being picked
+warm_up("pandas", "openpyxl", "xlsxwriter", "scs_core.reader", "scs_core.collector",
+        "scs_core.locations", "scs_core.partmaster", "scs_core.writer")
 
 input_folder_var = StringVar()
 output_folder_var = StringVar()
@@ -267,4 +221,7 @@ tk.Button(root, text="Browse", command=select_part_master_file).pack(pady=5)
 # Generate report button
 tk.Button(root, text="Generate Report", command=generate_report, font=('Arial', 12, 'bold'), bg='green', fg='white').pack(pady=20)
 
+# Progress, elapsed time and rows per second of the running report, with Cancel
+panel = JobPanel(root, title="Generate WIP Report").pack(pady=5)
+
 root.mainloop()
@@ -0,0 +1 @@
+"""Shared engine for the TATA SCS data tools (reading, compiling and writing dealer exports)."""
@@ -0,0 +1,112 @@
+"""Headless runs of the report pipelines.
+
+A pipeline is a plain function of paths and parameters: it raises PipelineError
+for problems the user has to fix and returns a RunResult instead of showing
+dialogs, so the same function serves the Tk window, the command line and
+scheduled batches on the server:
+
+    result = run_pipeline(process_pending_grn, input_folder, output_folder)
+    show_result(result, "Pending GRN")          # Tk window
+    sys.exit(print_result(result))              # command line (exit code 1 on error)
+"""
+import sys
+import json
+import logging
+from collections import namedtuple
+
+# status is OK, EMPTY (nothing to process), CANCELLED or ERROR; outputs are the files written
+# and warnings the problems the run carried on past (a bad file, a missing mapping)
+RunResult = namedtuple("RunResult", ["status", "message", "outputs", "warnings"])
+
+OK = "ok"
+EMPTY = "empty"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+# Warnings listed in one dialog
+DIALOG_WARNING_LIMIT = 15
+
+
+class PipelineError(Exception):
+    """A problem with the inputs of a pipeline, reported to the user as it is."""
+
+
+class Cancelled(Exception):
+    """Raised inside a pipeline when the user has cancelled the run (see scs_core.jobs)."""
+
+
+def completed(message, outputs=(), warnings=()):
+    return RunResult(OK, message, list(outputs), list(warnings))
+
+
+def nothing_to_do(message, warnings=()):
+    return RunResult(EMPTY, message, [], list(warnings))
+
+
+def failed(message, warnings=()):
+    return RunResult(ERROR, message, [], list(warnings))
+
+
+def cancelled(message="Cancelled.", warnings=()):
+    return RunResult(CANCELLED, message, [], list(warnings))
+
+
+def run_pipeline(pipeline, *args, **kwargs):
+    """Runs pipeline and returns its RunResult; never raises.
+
+    PipelineError becomes an error result with its own message, Cancelled a
+    cancelled result, any other exception an "An error occurred" result with the
+    traceback in the log.
+    """
+    try:
+        result = pipeline(*args, **kwargs)
+    except Cancelled as e:
+        return cancelled(str(e) or "Cancelled.")
+    except PipelineError as e:
+        return failed(str(e))
+    except Exception as e:
+        logging.exception(f"{getattr(pipeline, '__name__', 'pipeline')} failed")
+        return failed(f"An error occurred: {e}")
+    return result if isinstance(result, RunResult) else completed("Done.")
+
+
+def format_result(result):
+    """Plain-text report of a run: the message, then the outputs and warnings."""
+    lines = [result.message]
+    lines.extend(f"  wrote {path}" for path in result.outputs)
+    lines.extend(f"  warning: {warning}" for warning in result.warnings)
+    return "\n".join(lines)
+
+
+def print_result(result, as_json=False):
+    """Prints result for the command line and returns the exit code (1 on error)."""
+    if as_json:
+        print(json.dumps(result._asdict(), indent=2, default=str))
+    else:
+        print(format_result(result), file=sys.stderr if result.status == ERROR else sys.stdout)
+    return 1 if result.status == ERROR else 0
+
+
+def show_result(result, title=None):
+    """Shows result in a dialog (error, warning or information)."""
+    from tkinter import messagebox
+
+    warnings = result.warnings[:DIALOG_WARNING_LIMIT]
+    if len(result.warnings) > DIALOG_WARNING_LIMIT:
+        warnings.append(f"... and {len(result.warnings) - DIALOG_WARNING_LIMIT} more")
+    text = "\n\n".join([result.message] + (["\n".join(warnings)] if warnings else []))
+
+    if result.status == ERROR:
+        messagebox.showerror(title or "Error", text)
+    elif result.warnings:
+        messagebox.showwarning(title or "Warning", text)
+    elif result.status in (EMPTY, CANCELLED):
+        messagebox.showinfo(title or "Info", text)
+    else:
+        messagebox.showinfo(title or "Success", text)
+
+
+def add_output_arguments(parser):
+    """Adds the --json switch every pipeline command line has."""
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    return parser
@@ -0,0 +1,326 @@
+"""On-disk cache of parsed workbooks.
+
+Entries are keyed by the file path, size, modification time and content hash plus
+the read options, and are stored as Parquet (pickle for frames Parquet cannot hold).
+The cache is bounded in size and evicts the least recently used entries first.
+
+    python -m scs_core.cache --info
+    python -m scs_core.cache --clear [FILE ...]
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet support for DataFrame.to_parquet)
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+DEFAULT_MAX_MB = 2048
+INDEX_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+
+def default_cache_dir():
+    """Cache folder: SCS_CACHE_DIR, else a per-user folder under LOCALAPPDATA/home."""
+    if os.environ.get("SCS_CACHE_DIR"):
+        return os.environ["SCS_CACHE_DIR"]
+    base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    return os.path.join(base, "TATA SCS", "cache")
+
+
+def file_fingerprint(file_path):
+    """Returns path, size, mtime and a content hash identifying one version of a file."""
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {
+        "path": os.path.normcase(os.path.abspath(file_path)),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "hash": digest.hexdigest(),
+    }
+
+
+def _json_default(value):
+    # Sets (e.g. allowed filter values) must hash the same in every process
+    if isinstance(value, (set, frozenset)):
+        return sorted(map(str, value))
+    return str(value)
+
+
+def write_frame(folder, name, df):
+    """Saves df as folder/name.parquet (name.pkl when Parquet cannot hold it); returns the file name."""
+    if HAS_PARQUET:
+        file_name = f"{name}.parquet"
+        try:
+            df.to_parquet(os.path.join(folder, file_name))
+            return file_name
+        except Exception:
+            # Mixed-type object columns or non-string headers: keep the exact frame instead
+            pass
+    file_name = f"{name}.pkl"
+    with open(os.path.join(folder, file_name), "wb") as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return file_name
+
+
+def read_frame(folder, file_name):
+    """Loads a frame saved by write_frame."""
+    file_path = os.path.join(folder, file_name)
+    if file_name.endswith(".parquet"):
+        return pd.read_parquet(file_path)
+    with open(file_path, "rb") as f:
+        return pickle.load(f)
+
+
+class FileLock:
+    """Exclusive lock shared by every process (pool workers, other tools) using one file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        if os.name == "nt":
+            import msvcrt
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after 10 seconds; keep waiting
+        else:
+            import fcntl
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+        return False
+
+
+class ParseCache:
+    """Size-bounded LRU store of parsed DataFrames (or dicts of sheet DataFrames).
+
+    The index is shared by the process pool of a parallel compile, so every change
+    to it is made under a lock file, on an index re-read while the lock is held.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("SCS_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # Index handling
+
+    @contextmanager
+    def _locked(self):
+        # The thread lock keeps one process's threads in turn, the lock file the processes
+        with self._lock, FileLock(os.path.join(self.cache_dir, LOCK_FILE)):
+            yield
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        # Write to a temporary file first so a crash never leaves a half-written index
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path())
+
+    @staticmethod
+    def make_key(fingerprint, options):
+        raw = json.dumps([fingerprint, options], sort_keys=True, default=_json_default)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # Public API
+
+    def get(self, file_path, options, fingerprint=None):
+        """Returns the cached result for this version of file_path, or None."""
+        key = self.make_key(fingerprint or file_fingerprint(file_path), options)
+        with self._locked():
+            entry = self._load_index().get(key)
+        if entry is None:
+            return None
+        try:
+            # Read outside the lock, so the pool workers load their frames side by side
+            result = self._read_entry(entry)
+        except Exception as e:
+            result = None
+            error = e
+        with self._locked():
+            index = self._load_index()
+            if key not in index:
+                # Evicted by another process meanwhile; a frame read in full is still this file's
+                return result
+            if result is None:
+                logging.warning(f"Dropping unreadable cache entry for {file_path}: {error}")
+                self._remove_entry(index, key)
+            else:
+                index[key]["last_used"] = time.time()
+            self._save_index(index)
+        return result
+
+    def put(self, file_path, options, result, fingerprint=None):
+        """Stores a parsed DataFrame (or {sheet: DataFrame}) for this version of file_path."""
+        fingerprint = fingerprint or file_fingerprint(file_path)
+        key = self.make_key(fingerprint, options)
+        try:
+            # The frames are written outside the lock; they are not reachable until indexed
+            entry = self._write_entry(key, fingerprint, result)
+        except Exception as e:
+            logging.warning(f"Could not cache {file_path}: {e}")
+            return
+        with self._locked():
+            index = self._load_index()
+            # Older versions of the same file can never be hit again
+            for old_key, old_entry in list(index.items()):
+                if old_entry["path"] == fingerprint["path"] and old_entry["hash"] != fingerprint["hash"]:
+                    self._remove_entry(index, old_key)
+            index[key] = entry
+            self._evict(index)
+            self._save_index(index)
+
+    def invalidate(self, file_path=None):
+        """Removes the entries of one file, or every entry when file_path is None."""
+        with self._locked():
+            index = self._load_index()
+            target = os.path.normcase(os.path.abspath(file_path)) if file_path else None
+            removed = 0
+            for key, entry in list(index.items()):
+                if target is None or entry["path"] == target:
+                    self._remove_entry(index, key)
+                    removed += 1
+            self._save_index(index)
+            return removed
+
+    def info(self):
+        """Returns (number of entries, total bytes) currently in the cache."""
+        with self._locked():
+            index = self._load_index()
+        return len(index), sum(entry["bytes"] for entry in index.values())
+
+    # Entry storage
+
+    def _write_entry(self, key, fingerprint, result):
+        sheets = None
+        frames = {"": result}
+        if isinstance(result, dict):
+            sheets = list(result.keys())
+            frames = {str(i): df for i, df in enumerate(result.values())}
+
+        files = []
+        for suffix, df in frames.items():
+            files.append(self._write_frame(f"{key}{'_' + suffix if suffix else ''}", df))
+
+        return {
+            "path": fingerprint["path"],
+            "hash": fingerprint["hash"],
+            "files": files,
+            "sheets": sheets,
+            "bytes": sum(os.path.getsize(os.path.join(self.cache_dir, f)) for f in files),
+            "last_used": time.time(),
+        }
+
+    def _write_frame(self, name, df):
+        return write_frame(self.cache_dir, name, df)
+
+    def _read_frame(self, file_name):
+        return read_frame(self.cache_dir, file_name)
+
+    def _read_entry(self, entry):
+        frames = [self._read_frame(f) for f in entry["files"]]
+        if entry["sheets"] is None:
+            return frames[0]
+        return dict(zip(entry["sheets"], frames))
+
+    def _remove_entry(self, index, key):
+        entry = index.pop(key)
+        for file_name in entry["files"]:
+            try:
+                os.remove(os.path.join(self.cache_dir, file_name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Still open in another process (Windows); it is overwritten or swept with the next entry
+                logging.warning(f"Could not remove cache file {file_name}: {e}")
+
+    def _evict(self, index):
+        total = sum(entry["bytes"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]["bytes"]
+            self._remove_entry(index, key)
+
+
+_default_cache = None
+
+
+def get_cache():
+    """Returns the process-wide cache shared by every reader."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
+
+
+def cache_enabled():
+    return os.environ.get("SCS_CACHE", "1") != "0"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TATA SCS parsed-workbook cache")
+    parser.add_argument("--clear", nargs="*", metavar="FILE", help="Clear the whole cache or only the given files")
+    parser.add_argument("--info", action="store_true", help="Show the cache location and size")
+    args = parser.parse_args(argv)
+
+    cache = get_cache()
+    if args.clear is not None:
+        if args.clear:
+            removed = sum(cache.invalidate(path) for path in args.clear)
+        else:
+            removed = cache.invalidate()
+        print(f"Removed {removed} cache entries.")
+    count, size = cache.info()
+    print(f"Cache: {cache.cache_dir}\nEntries: {count}, {size / 1024 / 1024:.1f} MB of {cache.max_bytes / 1024 / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
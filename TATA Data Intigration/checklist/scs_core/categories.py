@@ -0,0 +1,147 @@
+"""Compact storage for the repeated text columns of compiled exports.
+
+A compiled Base Stock or Intransit frame repeats the same few Locations, Status and
+Availability values millions of times, each row holding its own Python string.
+compact_frame() turns those columns into categoricals (one small integer code per
+row, so == filters and groupbys work on the codes) and makes equal part numbers
+share one string object:
+
+    collector = FrameCollector(compact=True)        # or compact_frame(df)
+    df.groupby(['Location', 'Catg'], observed=True)
+
+Groupbys and pivots on categorical columns need observed=True, or pandas adds a
+row for every combination of categories. as_plain() turns small summaries back
+into text columns before Grand Total rows are added to them.
+
+    python -m scs_core.categories --benchmark
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality columns of the SAP / DMS exports and of the columns the reports add
+CATEGORY_COLUMNS = (
+    "Inventory Location", "Location", "Availability", "Status", "Division", "Division Name",
+    "Vendor", "Casual/VOR", "Catg", "Category", "Order Type", "Order Status", "Order Item Status",
+    "Type", "Spares Order Type", "Product Category", "Product Line", "Dealer Name", "Month",
+)
+
+# Part number columns: too many distinct values for a useful categorical, but repeated a lot
+PART_COLUMNS = ("Part #", "Part No", "Part Number", "Partnumber")
+
+# A column is only made categorical when it has at most this many distinct values per row
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _is_text(series):
+    return pd.api.types.infer_dtype(series, skipna=True) == "string"
+
+
+def intern_strings(series):
+    """series with equal strings sharing one object (object dtype and values unchanged)."""
+    codes, uniques = pd.factorize(series)
+    values = np.asarray(uniques, dtype=object)[codes]
+    values[codes < 0] = np.nan
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+
+def compact_frame(df, categories=CATEGORY_COLUMNS, parts=PART_COLUMNS):
+    """Returns df with the text columns of categories as categoricals and parts interned.
+
+    Columns that are missing, hold anything but text (e.g. numeric codes mixed with
+    names) or have too many distinct values are left as they are.
+    """
+    df = df.copy(deep=False)
+    for column in categories:
+        if column not in df.columns or isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        series = df[column]
+        if not len(series) or not _is_text(series):
+            continue
+        # One hashing pass gives both the distinct count and the codes
+        codes, uniques = pd.factorize(series, sort=True)
+        if len(uniques) <= MAX_CATEGORY_RATIO * len(series):
+            df[column] = pd.Series(pd.Categorical.from_codes(codes, uniques), index=series.index)
+
+    for column in parts:
+        if column in df.columns and pd.api.types.is_object_dtype(df[column]) and _is_text(df[column]):
+            df[column] = intern_strings(df[column])
+    return df
+
+
+def as_plain(df):
+    """Returns df with categorical columns back as object columns."""
+    columns = [column for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)]
+    if not columns:
+        return df
+    return df.astype({column: object for column in columns})
+
+
+def _stock_frame(rows):
+    """Synthetic compiled Base Stock export with object text columns, as read from Excel."""
+    rng = np.random.default_rng(0)
+    parts = np.array([f"{n:06d}{s}" for n, s in zip(rng.integers(100000, 999999, 40000), rng.choice(list("ABCR"), 40000))])
+    df = pd.DataFrame({
+        "Part #": rng.choice(parts, rows),
+        "Qty": rng.integers(1, 50, rows),
+        "Inventory Location": rng.choice([f"C1.{i}LOC.RET" for i in range(60)], rows),
+        "Availability": rng.choice(["On Hand", "Reserved", "Blocked"], rows),
+        "Status": rng.choice(["On Hand", "In Transit", "Received"], rows),
+        "Division Name": rng.choice([f"DIV{i:03d}" for i in range(60)], rows),
+        "Vendor": rng.choice(["TATA Motors", "Non TATA"], rows),
+    })
+    # One string object per cell, like the frames read_excel returns
+    text = [column for column in df.columns if column != "Qty"]
+    return df.astype({column: object for column in text})
+
+
+def _run(df):
+    """Seconds for the filters and groupbys of the stock reports."""
+    start = time.perf_counter()
+    reserved = df[df["Availability"] == "Reserved"]
+    in_transit = df[df["Status"] == "In Transit"]
+    filter_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reserved.groupby(["Inventory Location", "Availability"], observed=True)["Qty"].sum()
+    in_transit.groupby(["Vendor", "Division Name"], observed=True)["Qty"].sum()
+    df.groupby(["Inventory Location", "Status"], observed=True)["Qty"].sum()
+    groupby_seconds = time.perf_counter() - start
+    return filter_seconds, groupby_seconds
+
+
+def benchmark(rows=2000000):
+    """Memory and filter/groupby time of a synthetic stock frame before and after compact_frame."""
+    df = _stock_frame(rows)
+    before_mb = df.memory_usage(deep=True).sum() / 2**20
+    before = _run(df)
+
+    start = time.perf_counter()
+    compact = compact_frame(df)
+    convert_seconds = time.perf_counter() - start
+    after_mb = compact.memory_usage(deep=True).sum() / 2**20
+    after = _run(compact)
+    return {"rows": rows, "memory_mb": (before_mb, after_mb), "filter": (before[0], after[0]),
+            "groupby": (before[1], after[1]), "convert": convert_seconds}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Categorical / interned column benchmark")
+    parser.add_argument("--benchmark", action="store_true", help="Compare object columns with compact_frame")
+    parser.add_argument("--rows", type=int, default=2000000, help="Rows in the synthetic stock frame")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        result = benchmark(args.rows)
+        print(f"{result['rows']} rows {'object':>10} {'compact':>10}")
+        print(f"{'memory':>12} {result['memory_mb'][0]:>8.0f}MB {result['memory_mb'][1]:>8.0f}MB")
+        print(f"{'filters':>12} {result['filter'][0]:>9.2f}s {result['filter'][1]:>9.2f}s")
+        print(f"{'groupbys':>12} {result['groupby'][0]:>9.2f}s {result['groupby'][1]:>9.2f}s")
+        print(f"{'conversion':>12} {'':>10} {result['convert']:>9.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
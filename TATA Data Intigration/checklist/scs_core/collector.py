@@ -0,0 +1,166 @@
+"""Batched accumulation of per-file DataFrames.
+
+Growing a frame with `combined = pd.concat([combined, df])` inside a file loop copies
+everything collected so far on every file, so the time grows with the square of the
+number of files. FrameCollector keeps the per-file frames and concatenates them once.
+
+    python -m scs_core.collector --benchmark
+"""
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from scs_core.categories import compact_frame
+
+
+def _target_dtype(dtypes, has_gaps):
+    """Common dtype of one column across files (None leaves it to pandas)."""
+    if not dtypes:
+        return None
+    unique = list(dict.fromkeys(dtypes))
+    if len(unique) == 1:
+        target = unique[0]
+    elif all(pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in unique):
+        try:
+            target = np.result_type(*unique)  # int + float -> float
+        except TypeError:
+            target = np.dtype(object)
+    else:
+        # e.g. numbers in one dealer file and text in another
+        target = np.dtype(object)
+
+    # Files without the column (or with blanks in it) leave NA gaps, which ints and bools cannot hold
+    if has_gaps and pd.api.types.is_integer_dtype(target) and isinstance(target, np.dtype):
+        return np.dtype("float64")
+    if has_gaps and pd.api.types.is_bool_dtype(target) and isinstance(target, np.dtype):
+        return np.dtype(object)
+    return target
+
+
+class FrameCollector:
+    """Collects the frames of a file loop and builds the combined frame once.
+
+    columns fixes the output columns (missing ones are filled with NA, others dropped);
+    by default the output has the union of all columns in first-seen order. Each
+    column gets one dtype across files, so an all-NA or missing column in one file
+    does not turn the others into object. Values passed as provenance to add() become
+    categorical columns (e.g. {'Source File': name}) at the end of the result.
+    With compact=True the combined frame goes through scs_core.categories.compact_frame
+    (Location, Status, ... as categoricals, part numbers interned).
+    """
+
+    def __init__(self, columns=None, compact=False):
+        self.columns = list(columns) if columns is not None else None
+        self.compact = compact
+        self._frames = []
+        self._provenance = []
+        self.sources = []  # (source, rows) per added frame, for run reports
+
+    def add(self, df, source=None, provenance=None):
+        if df is None:
+            return
+        self._frames.append(df)
+        self._provenance.append(provenance or {})
+        self.sources.append((source, len(df)))
+
+    def __len__(self):
+        return sum(len(df) for df in self._frames)
+
+    def _union_columns(self):
+        columns = {}
+        for df in self._frames:
+            columns.update(dict.fromkeys(df.columns))
+        return list(columns)
+
+    def build(self):
+        """Returns the combined frame; the collector keeps its frames for further adds."""
+        columns = self.columns if self.columns is not None else self._union_columns()
+        if not self._frames:
+            return pd.DataFrame(columns=columns)
+
+        targets = {}
+        for column in columns:
+            present = [df[column] for df in self._frames if column in df.columns]
+            dtypes = [s.dtype for s in present if len(s) and s.notna().any()]
+            has_gaps = len(present) < len(self._frames) or any(s.hasnans for s in present)
+            targets[column] = _target_dtype(dtypes, has_gaps)
+
+        frames = []
+        for df in self._frames:
+            df = df.reindex(columns=columns)
+            for column, target in targets.items():
+                if target is not None and df[column].dtype != target:
+                    df[column] = df[column].astype(target)
+            frames.append(df)
+
+        combined = pd.concat(frames, ignore_index=True)
+        self._add_provenance(combined)
+        return compact_frame(combined) if self.compact else combined
+
+    def _add_provenance(self, combined):
+        names = list(dict.fromkeys(name for provenance in self._provenance for name in provenance))
+        lengths = [len(df) for df in self._frames]
+        for name in names:
+            values = [provenance.get(name) for provenance in self._provenance]
+            categories = list(dict.fromkeys(v for v in values if v is not None))
+            position = {v: i for i, v in enumerate(categories)}
+            codes = [position[v] if v is not None else -1 for v in values]
+            combined[name] = pd.Categorical.from_codes(np.repeat(codes, lengths), categories=categories)
+
+
+def _dealer_frame(i, rows):
+    """Synthetic dealer export; every 7th file lacks a column and Qty alternates int/float."""
+    rng = np.random.default_rng(i)
+    df = pd.DataFrame({
+        "Part #": rng.integers(100000, 999999, rows).astype(str),
+        "Qty": rng.integers(0, 50, rows) if i % 2 else rng.random(rows) * 50,
+        "Location": f"DLR{i % 40:03d}",
+        "Order Date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+    })
+    if i % 7 == 0:
+        df = df.drop(columns=["Order Date"])
+    return df
+
+
+def benchmark(file_counts=(50, 100, 200, 400), rows=2000):
+    """Times the concat-in-a-loop pattern against FrameCollector for growing file counts."""
+    results = []
+    for count in file_counts:
+        frames = [_dealer_frame(i, rows) for i in range(count)]
+
+        start = time.perf_counter()
+        combined = pd.DataFrame()
+        for df in frames:
+            combined = pd.concat([combined, df], ignore_index=True)
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        collector = FrameCollector()
+        for i, df in enumerate(frames):
+            collector.add(df, provenance={"Source File": f"dealer_{i}.xlsx"})
+        collector.build()
+        collector_seconds = time.perf_counter() - start
+
+        results.append((count, loop_seconds, collector_seconds))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FrameCollector benchmark")
+    parser.add_argument("--benchmark", action="store_true", help="Compare with concat-in-a-loop")
+    parser.add_argument("--files", type=int, nargs="+", default=[50, 100, 200, 400], help="Dealer file counts")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows per dealer file")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(f"{'files':>6} {'concat loop':>12} {'collector':>10} {'per file':>10}")
+        for count, loop_seconds, collector_seconds in benchmark(args.files, args.rows):
+            print(f"{count:>6} {loop_seconds:>11.2f}s {collector_seconds:>9.2f}s "
+                  f"{collector_seconds / count * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from scs_core.cache import file_fingerprint
+from scs_core.reader import read_excel
+from scs_core.collector import FrameCollector
+from scs_core.jobs import Progress
+
+# One line of the per-file report shown at the end of a compile run; cached is True
+# for a file taken unchanged from the compile manifest (scs_core.manifest)
+FileReport = namedtuple("FileReport", ["file", "rows", "seconds", "error", "cached"], defaults=(False,))
+
+
+def list_excel_files(folder_path):
+    """Returns the .xlsx files of a folder in a stable (name) order."""
+    files = sorted(os.listdir(folder_path), key=str.lower)
+    return [os.path.join(folder_path, f) for f in files if f.endswith('.xlsx') and not f.startswith('~$')]
+
+
+def read_workbook(file_path):
+    """Reads every sheet of one workbook and stacks them in sheet order.
+
+    Runs inside the worker processes, so it must stay a plain module-level function.
+    """
+    start = time.perf_counter()
+    name = os.path.basename(file_path)
+    try:
+        sheets = read_excel(file_path, sheet_name=None)  # Read all sheets
+        frames = list(sheets.values())
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return df, FileReport(name, len(df), time.perf_counter() - start, None)
+    except Exception as e:
+        return None, FileReport(name, 0, time.perf_counter() - start, str(e))
+
+
+def _reported(result, progress):
+    df, report = result
+    progress.step(report.file, rows=report.rows)
+    return result
+
+
+def _read_files(file_paths, parallel, workers, progress):
+    if parallel and len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                return [_reported(result, progress) for result in pool.map(read_workbook, file_paths)]
+            except BaseException:
+                # Workbooks not started yet are dropped instead of read for nothing
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    return [_reported(read_workbook(path), progress) for path in file_paths]
+
+
+def _from_manifest(file_path, manifest, progress):
+    start = time.perf_counter()
+    name = os.path.basename(file_path)
+    try:
+        df = manifest.block(file_path)
+    except Exception as e:
+        logging.warning(f"Re-reading {name}: its compile manifest block is unreadable ({e})")
+        return None
+    if df is None:
+        logging.info(f"Re-reading {name}: its block was evicted from the parse cache")
+        return None
+    progress.step(name, rows=len(df))
+    return df, FileReport(name, len(df), time.perf_counter() - start, None, True)
+
+
+def _read_incremental(file_paths, manifest, parallel, workers, progress):
+    # Unchanged files come from their stored blocks; the rest are read (in the pool when
+    # parallel) and stored, then everything is put back in file order
+    results = {}
+    to_read = []
+    fingerprints = {}
+    for path in file_paths:
+        fingerprint = manifest.changed(path)
+        result = _from_manifest(path, manifest, progress) if fingerprint is None else None
+        if result is None:
+            fingerprints[path] = fingerprint or file_fingerprint(path)
+            to_read.append(path)
+        else:
+            results[path] = result
+
+    for path, result in zip(to_read, _read_files(to_read, parallel, workers, progress)):
+        df, report = result
+        if not report.error:
+            manifest.store(fingerprints[path], df)
+        results[path] = result
+    manifest.save()
+    return [results[path] for path in file_paths]
+
+
+def compile_files(file_paths, parallel=False, workers=None, source_column=None, progress=None, manifest=None):
+    """Reads the given workbooks and combines them in the same order as file_paths.
+
+    With parallel=True the workbooks are parsed in a process pool; the output row
+    order is still the file order. source_column adds the file name of each row.
+    Every workbook read is reported to progress (scs_core.jobs), which stops the
+    run when it has been cancelled. With a manifest (scs_core.manifest) only new
+    or changed workbooks are parsed and the others come from their stored rows.
+    Returns (compiled_df, reports).
+    """
+    progress = progress or Progress()
+    progress.expect(len(file_paths))
+    if manifest is not None:
+        results = _read_incremental(file_paths, manifest, parallel, workers, progress)
+    else:
+        results = _read_files(file_paths, parallel, workers, progress)
+
+    collector = FrameCollector()
+    for df, report in results:
+        collector.add(df, report.file, {source_column: report.file} if source_column else None)
+    reports = [report for df, report in results]
+    return collector.build(), reports
+
+
+def format_report(title, reports):
+    """Formats per-file timings and failures as plain text."""
+    lines = [title]
+    for report in reports:
+        status = f"FAILED: {report.error}" if report.error else f"{report.rows} rows"
+        if report.cached:
+            status += ", unchanged"
+        lines.append(f"  {report.file}: {status} ({report.seconds:.2f}s)")
+    failed = [r for r in reports if r.error]
+    total = sum(r.seconds for r in reports)
+    cached = sum(1 for r in reports if r.cached)
+    unchanged = f", {cached} unchanged" if cached else ""
+    lines.append(f"  {len(reports)} files, {len(failed)} failed{unchanged}, {total:.2f}s reading")
+    return "\n".join(lines)
@@ -0,0 +1,223 @@
+"""Compiling the whole dealer tree (<brand>/<dealer>/<keyword>) in one run.
+
+"Both Brand Dealer subfolder.py" lays the monthly exports out as one folder per
+brand, dealer and keyword (TATA PCBU/Bimal Cars/OTC INVOICE, ...). compile_tree()
+finds every keyword folder that holds workbooks and compiles each dealer x keyword
+as one job in a process pool, largest jobs first, then writes:
+
+    <output>/<brand>/<dealer>.xlsx      one sheet per keyword (written as soon as the dealer is done)
+    <output>/<brand>.xlsx               one sheet per keyword, all dealers, with a Dealer column
+    <output>/Dealer Compile Summary.xlsx  rows, failed files and seconds of every job
+
+    python -m scs_core.dealertree D:\\Monthly --output D:\\Monthly\\Compiled --workers 6
+"""
+import os
+import sys
+import time
+import argparse
+from collections import namedtuple, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from scs_core.batch import PipelineError, completed, nothing_to_do, run_pipeline, print_result, add_output_arguments
+from scs_core.collector import FrameCollector
+from scs_core.compiler import list_excel_files, read_workbook
+from scs_core.jobs import Progress
+from scs_core.splitter import safe_filename
+from scs_core.writer import ReportWriter
+
+# Keyword subfolders created under every dealer (same names as the monthly compilers)
+KEYWORDS = [
+    "OTC INVOICE", "PURCHASE LINE PO", "Purchase Line Items",
+    "SPARE CONSUMPTION", "CLOSING STOCK", "stock transaction",
+    "channel partner", "Job Line Invoice", "sap purchase order reason"
+]
+
+SUMMARY_FILE = "Dealer Compile Summary.xlsx"
+
+# Data rows per sheet (Excel's limit less the header); larger keywords continue on "<keyword> (2)"
+EXCEL_MAX_ROWS = 1048575
+
+# One dealer x keyword folder to compile, with its workbooks and their total size (for scheduling)
+DealerJob = namedtuple("DealerJob", ["brand", "dealer", "keyword", "folder", "files", "bytes"])
+
+# One line of the summary table
+JobSummary = namedtuple("JobSummary", ["brand", "dealer", "keyword", "files", "rows", "failed", "seconds", "error"])
+
+
+def discover_jobs(root_folder, keywords=KEYWORDS):
+    """Every <brand>/<dealer>/<keyword> folder under root_folder that holds .xlsx files.
+
+    Keyword folders are matched case-insensitively and other folders are ignored.
+    """
+    by_name = {keyword.lower(): keyword for keyword in keywords}
+    jobs = []
+    for brand in sorted(os.listdir(root_folder), key=str.lower):
+        brand_folder = os.path.join(root_folder, brand)
+        if not os.path.isdir(brand_folder):
+            continue
+        for dealer in sorted(os.listdir(brand_folder), key=str.lower):
+            dealer_folder = os.path.join(brand_folder, dealer)
+            if not os.path.isdir(dealer_folder):
+                continue
+            for name in sorted(os.listdir(dealer_folder), key=str.lower):
+                folder = os.path.join(dealer_folder, name)
+                keyword = by_name.get(name.lower())
+                if keyword is None or not os.path.isdir(folder):
+                    continue
+                files = list_excel_files(folder)
+                if files:
+                    size = sum(os.path.getsize(path) for path in files)
+                    jobs.append(DealerJob(brand, dealer, keyword, folder, files, size))
+    return jobs
+
+
+def compile_job(job):
+    """Reads the workbooks of one dealer x keyword folder and stacks them in file order.
+
+    Runs inside the worker processes, so it must stay a plain module-level function.
+    Returns (job, compiled_df, reports, seconds, error); error is set (and the frame
+    empty) when the files could not be combined.
+    """
+    start = time.perf_counter()
+    collector = FrameCollector()
+    reports = []
+    for path in job.files:
+        df, report = read_workbook(path)
+        collector.add(df, report.file)
+        reports.append(report)
+    try:
+        return job, collector.build(), reports, time.perf_counter() - start, None
+    except Exception as e:
+        return job, pd.DataFrame(), reports, time.perf_counter() - start, str(e)
+
+
+def _run_jobs(jobs, workers):
+    """Yields the compile_job results as they finish; the largest jobs are started first."""
+    ordered = sorted(jobs, key=lambda job: job.bytes, reverse=True)
+    if workers == 1 or len(jobs) < 2:
+        for job in ordered:
+            yield compile_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(compile_job, job) for job in ordered]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        except BaseException:
+            # Jobs not started yet are dropped instead of read for nothing
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def write_sheets(file_path, frames):
+    """Writes {sheet: DataFrame} to one workbook, spilling sheets past Excel's row limit."""
+    with ReportWriter(file_path) as writer:
+        for sheet_name, df in frames.items():
+            for part, start in enumerate(range(0, max(len(df), 1), EXCEL_MAX_ROWS), start=1):
+                name = sheet_name if part == 1 else f"{sheet_name} ({part})"
+                writer.write_sheet(df.iloc[start:start + EXCEL_MAX_ROWS], name)
+
+
+def _summary_frame(summaries):
+    df = pd.DataFrame(summaries, columns=JobSummary._fields)
+    df.columns = ["Brand", "Dealer", "Keyword", "Files", "Rows", "Failed files", "Seconds", "Error"]
+    df["Seconds"] = df["Seconds"].round(2)
+    return df.sort_values(["Brand", "Dealer", "Keyword"], key=lambda s: s.str.lower(), ignore_index=True)
+
+
+def compile_tree(root_folder, output_folder, workers=None, progress=None, keywords=KEYWORDS):
+    """Compiles every dealer x keyword folder under root_folder in a process pool.
+
+    workers is the number of worker processes (default: CPU count; 1 reads in this
+    process). Every workbook read is reported to progress (scs_core.jobs). Writes
+    the per-dealer, per-brand and summary workbooks and returns a RunResult whose
+    warnings list the files that could not be read.
+    """
+    if not os.path.isdir(root_folder):
+        raise PipelineError(f"The dealer folder '{root_folder}' does not exist.")
+    jobs = discover_jobs(root_folder, keywords)
+    if not jobs:
+        return nothing_to_do(f"No <brand>/<dealer>/<keyword> folders with Excel files found under {root_folder}.")
+    os.makedirs(output_folder, exist_ok=True)
+
+    progress = progress or Progress()
+    progress.expect(sum(len(job.files) for job in jobs))
+    start = time.perf_counter()
+
+    remaining = defaultdict(int)
+    for job in jobs:
+        remaining[(job.brand, job.dealer)] += 1
+    dealer_frames = defaultdict(dict)   # (brand, dealer) -> {keyword: df}
+    brand_frames = defaultdict(lambda: defaultdict(dict))  # brand -> keyword -> {dealer: df}
+    summaries = []
+    outputs = []
+    warnings = []
+    taken = defaultdict(set)
+
+    for job, df, reports, seconds, error in _run_jobs(jobs, workers):
+        for report in reports:
+            progress.step(f"{job.dealer} / {report.file}", rows=report.rows)
+        failed = [report for report in reports if report.error]
+        warnings.extend(f"{job.brand}/{job.dealer}/{job.keyword}/{r.file}: {r.error}" for r in failed)
+        if error:
+            warnings.append(f"{job.brand}/{job.dealer}/{job.keyword}: {error}")
+        summaries.append(JobSummary(job.brand, job.dealer, job.keyword, len(reports), len(df), len(failed),
+                                    seconds, error))
+        if not df.empty:
+            dealer_frames[(job.brand, job.dealer)][job.keyword] = df
+            brand_frames[job.brand][job.keyword][job.dealer] = df
+
+        # A dealer's workbook is written as soon as its last keyword is in, while the pool reads on
+        key = (job.brand, job.dealer)
+        remaining[key] -= 1
+        if remaining[key] == 0 and dealer_frames.get(key):
+            frames = dealer_frames.pop(key)
+            brand_folder = os.path.join(output_folder, job.brand)
+            os.makedirs(brand_folder, exist_ok=True)
+            file_path = os.path.join(brand_folder, safe_filename(job.dealer, taken[job.brand]))
+            write_sheets(file_path, {keyword: frames[keyword] for keyword in keywords if keyword in frames})
+            outputs.append(file_path)
+
+    # Brand workbooks list the dealers in folder order, whatever order their jobs finished in
+    for brand in sorted(brand_frames, key=str.lower):
+        sheets = {}
+        for keyword in keywords:
+            by_dealer = brand_frames[brand].get(keyword)
+            if by_dealer:
+                collector = FrameCollector()
+                for dealer in sorted(by_dealer, key=str.lower):
+                    collector.add(by_dealer[dealer], dealer, {"Dealer": dealer})
+                sheets[keyword] = collector.build()
+        file_path = os.path.join(output_folder, safe_filename(brand, taken[""]))
+        write_sheets(file_path, sheets)
+        outputs.append(file_path)
+
+    summary_df = _summary_frame(summaries)
+    summary_path = os.path.join(output_folder, SUMMARY_FILE)
+    write_sheets(summary_path, {"Summary": summary_df})
+    outputs.append(summary_path)
+
+    dealers = len({(job.brand, job.dealer) for job in jobs})
+    message = (f"Compiled {len(jobs)} folders of {dealers} dealers: {int(summary_df['Rows'].sum()):,} rows from "
+               f"{int(summary_df['Files'].sum())} files ({len(warnings)} failed) in {time.perf_counter() - start:.1f}s. "
+               f"Summary: {summary_path}")
+    return completed(message, outputs, warnings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile every <brand>/<dealer>/<keyword> folder of the dealer tree")
+    parser.add_argument("root", help="Folder holding the brand folders (TATA PCBU, TATA CVBU)")
+    parser.add_argument("--output", required=True, help="Output folder")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
+    result = run_pipeline(compile_tree, args.root, args.output, workers=args.workers)
+    return print_result(result, args.json)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Excel engine selection for the shared reader.
+
+pandas can parse workbooks with several engines: openpyxl (always installed),
+calamine (Rust, via the python-calamine package) and xlrd (legacy .xls). The reader
+asks pick_engine() for every file, so switching engines never touches the scripts:
+
+    SCS_EXCEL_ENGINE=calamine            force one engine everywhere
+    python -m scs_core.engines --benchmark "Base Stock.xlsx" "Intransit.xlsx" "Sap BO.xls"
+
+The benchmark times each installed engine on real exports and remembers the fastest
+one per file type; without a benchmark the usual fastest available engine is used.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import importlib.util
+
+import pandas as pd
+
+from scs_core.cache import default_cache_dir
+
+# Engine name -> module that has to be importable for pandas to use it
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "openpyxl": "openpyxl",
+    "xlrd": "xlrd",
+}
+
+# Engines able to read each file type, fastest first when nothing was benchmarked
+ENGINE_PREFERENCE = {
+    ".xlsx": ["calamine", "openpyxl"],
+    ".xlsm": ["calamine", "openpyxl"],
+    ".xls": ["xlrd", "calamine"],
+}
+
+BENCHMARK_FILE = "engine_benchmark.json"
+
+_available = {}
+_benchmark = None
+
+
+def engine_available(engine):
+    if engine not in _available:
+        module = ENGINE_MODULES.get(engine)
+        _available[engine] = bool(module) and importlib.util.find_spec(module) is not None
+    return _available[engine]
+
+
+def available_engines(extension):
+    """Installed engines able to read this file type, in preference order."""
+    return [e for e in ENGINE_PREFERENCE.get(extension.lower(), []) if engine_available(e)]
+
+
+def _benchmark_path():
+    return os.path.join(default_cache_dir(), BENCHMARK_FILE)
+
+
+def load_benchmark():
+    """Returns the saved {extension: {engine: seconds}} benchmark, or {}."""
+    global _benchmark
+    if _benchmark is None:
+        try:
+            with open(_benchmark_path(), "r", encoding="utf-8") as f:
+                _benchmark = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _benchmark = {}
+    return _benchmark
+
+
+def pick_engine(file_path):
+    """Returns the engine the reader should use for file_path (None lets pandas decide).
+
+    Order: SCS_EXCEL_ENGINE when it is installed and can read the file type, then the
+    fastest engine of the saved benchmark, then ENGINE_PREFERENCE.
+    """
+    extension = os.path.splitext(str(file_path))[1].lower()
+    candidates = available_engines(extension)
+    if not candidates:
+        return None
+
+    forced = os.environ.get("SCS_EXCEL_ENGINE", "").strip().lower()
+    if forced:
+        if forced in candidates:
+            return forced
+        logging.warning(f"SCS_EXCEL_ENGINE={forced} cannot read {extension} files here; using {candidates[0]}")
+
+    timings = load_benchmark().get(extension, {})
+    measured = [e for e in candidates if e in timings]
+    if measured:
+        return min(measured, key=timings.get)
+    return candidates[0]
+
+
+def benchmark(file_paths, repeats=3):
+    """Times every installed engine on the given files and saves the fastest per type.
+
+    Returns {extension: {engine: seconds}}, the best-of-repeats total per engine.
+    An engine that fails on any file of a type is left out for that type.
+    """
+    global _benchmark
+    results = {}
+    for file_path in file_paths:
+        extension = os.path.splitext(file_path)[1].lower()
+        for engine in available_engines(extension):
+            timings = results.setdefault(extension, {})
+            if timings.get(engine) is None and engine in timings:
+                continue  # already failed on another file of this type
+            try:
+                best = None
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    pd.read_excel(file_path, sheet_name=None, engine=engine)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                timings[engine] = timings.get(engine, 0) + best
+            except Exception as e:
+                logging.warning(f"{engine} could not read {file_path}: {e}")
+                timings[engine] = None
+
+    saved = load_benchmark()
+    for extension, timings in results.items():
+        saved[extension] = {engine: seconds for engine, seconds in timings.items() if seconds is not None}
+
+    os.makedirs(default_cache_dir(), exist_ok=True)
+    with open(_benchmark_path(), "w", encoding="utf-8") as f:
+        json.dump(saved, f, indent=2)
+    _benchmark = saved
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TATA SCS Excel engine selection")
+    parser.add_argument("--benchmark", nargs="+", metavar="FILE", help="Time every installed engine on these exports")
+    parser.add_argument("--repeats", type=int, default=3, help="Reads per engine and file (best one counts)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        for extension, timings in benchmark(args.benchmark, args.repeats).items():
+            print(f"{extension}:")
+            for engine, seconds in sorted(timings.items(), key=lambda item: (item[1] is None, item[1] or 0)):
+                print(f"  {engine:<10} {'failed' if seconds is None else f'{seconds:.2f}s'}")
+
+    for extension in ENGINE_PREFERENCE:
+        installed = ", ".join(available_engines(extension)) or "none"
+        print(f"{extension}: using {pick_engine('file' + extension)} (installed: {installed})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Report pipelines on a worker thread, with per-file progress and Cancel.
+
+A pipeline run on the Tk thread freezes the window for minutes, and one run on
+another thread must not touch the widgets or messagebox. JobRunner runs the
+pipeline on a worker thread and hands its progress and its RunResult back
+through a queue that the Tk loop polls with after():
+
+    panel = JobPanel(root, title="Pending GRN").pack(pady=10)
+    ...
+    panel.start(process_pending_grn, input_folder, output_folder)
+
+A pipeline takes a progress=None argument and reports every file it has read;
+step() is also where a cancelled run stops (Cancelled, a "cancelled" RunResult):
+
+    progress = progress or Progress()
+    progress.expect(len(file_paths))
+    for file in file_paths:
+        df = read_excel(file)
+        progress.step(os.path.basename(file), rows=len(df))
+
+Without a runner (command line, batches) Progress() counts and never cancels.
+
+A launcher that opens tool windows learns about their runs with recording_runs():
+the panels built inside the block report every finished run and its wall time.
+"""
+import time
+import queue
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+from scs_core.batch import Cancelled, RunResult, CANCELLED, ERROR, run_pipeline, show_result
+
+# Progress as the window sees it: files done of files expected, the last file,
+# rows read so far and seconds since the run started
+ProgressUpdate = namedtuple("ProgressUpdate", ["done", "total", "label", "rows", "elapsed"])
+
+# How often the Tk loop looks for progress (milliseconds)
+POLL_MS = 100
+
+# recorder(result, seconds) of the window being built, see recording_runs()
+_run_recorder = None
+
+
+class Progress:
+    """Per-file progress of one run, shared by the pipeline and the window."""
+
+    def __init__(self, updates=None):
+        self._updates = updates
+        self._cancel = threading.Event()
+        self._start = time.perf_counter()
+        self._end = None
+        self.done = 0
+        self.total = 0
+        self.rows = 0
+
+    def expect(self, count):
+        """Adds count files to the total (called once per folder or stage)."""
+        self.total += count
+        self._send("")
+
+    def step(self, label="", rows=0):
+        """Counts one file (and its rows) as done; raises Cancelled once the user has cancelled."""
+        self.check()
+        self.done += 1
+        self.rows += rows
+        self._send(label)
+
+    def check(self):
+        """Raises Cancelled when the run has been cancelled."""
+        if self._cancel.is_set():
+            raise Cancelled(f"Cancelled after {self.done} of {self.total} files.")
+
+    def cancel(self):
+        self._cancel.set()
+
+    def finish(self):
+        """Stops the clock (the run is over)."""
+        self._end = time.perf_counter()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def update(self, label=""):
+        elapsed = (self._end or time.perf_counter()) - self._start
+        return ProgressUpdate(self.done, self.total, label, self.rows, elapsed)
+
+    def _send(self, label):
+        if self._updates is not None:
+            self._updates.put(self.update(label))
+
+
+def format_update(update):
+    """'3/12 files, 45,000 rows in 12.3s (3,650 rows/s) - Lucknow.xlsx'"""
+    rate = update.rows / update.elapsed if update.elapsed > 0 else 0
+    text = f"{update.done}/{update.total} files, {update.rows:,} rows in {update.elapsed:.1f}s ({rate:,.0f} rows/s)"
+    return f"{text} - {update.label}" if update.label else text
+
+
+class JobRunner:
+    """Runs one pipeline at a time on a worker thread, reporting through the Tk loop.
+
+    on_progress(ProgressUpdate) and on_finish(RunResult) are called on the Tk
+    thread, so they may update widgets and show dialogs.
+    """
+
+    def __init__(self, root, on_progress=None, on_finish=None, poll_ms=POLL_MS):
+        self._root = root
+        self._on_progress = on_progress
+        self._on_finish = on_finish
+        self._poll_ms = poll_ms
+        self._updates = None
+        self.progress = None
+        self.running = False
+
+    def start(self, pipeline, *args, **kwargs):
+        """Starts pipeline(*args, progress=..., **kwargs) on a worker thread."""
+        if self.running:
+            raise RuntimeError("A job is already running.")
+        self._updates = queue.Queue()
+        self.progress = Progress(self._updates)
+        updates, progress = self._updates, self.progress
+
+        def work():
+            result = run_pipeline(pipeline, *args, progress=progress, **kwargs)
+            progress.finish()
+            updates.put(result)
+
+        self.running = True
+        threading.Thread(target=work, name=f"job {getattr(pipeline, '__name__', 'pipeline')}", daemon=True).start()
+        self._root.after(self._poll_ms, self._poll)
+
+    def cancel(self):
+        """Asks the running pipeline to stop at its next file."""
+        if self.running:
+            self.progress.cancel()
+
+    def _poll(self):
+        latest = None
+        result = None
+        while True:
+            try:
+                item = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, RunResult):
+                result = item
+            else:
+                latest = item
+        # Only the newest update is shown; the window cannot keep up with every file anyway
+        if latest is not None and self._on_progress:
+            self._on_progress(latest)
+        if result is None:
+            self._root.after(self._poll_ms, self._poll)
+            return
+        self.running = False
+        if self._on_finish:
+            self._on_finish(result)
+
+
+@contextmanager
+def recording_runs(recorder):
+    """JobPanels created inside the block call recorder(result, seconds) after each run (on the Tk thread)."""
+    global _run_recorder
+    previous, _run_recorder = _run_recorder, recorder
+    try:
+        yield
+    finally:
+        _run_recorder = previous
+
+
+class JobPanel:
+    """Progress bar, status line and Cancel button of a tool window, driving a JobRunner.
+
+    The result is shown with show_result(result, title) unless on_finish is given.
+    """
+
+    def __init__(self, master, title=None, on_finish=None, length=400):
+        import tkinter as tk
+        from tkinter import ttk
+
+        self.title = title
+        self._on_finish = on_finish
+        self.frame = tk.Frame(master)
+        self.bar = ttk.Progressbar(self.frame, orient="horizontal", length=length, mode="determinate")
+        self.bar.grid(row=0, column=0, padx=5, pady=2)
+        self.cancel_button = tk.Button(self.frame, text="Cancel", command=self.cancel, state="disabled")
+        self.cancel_button.grid(row=0, column=1, padx=5, pady=2)
+        self.status = tk.Label(self.frame, text="", anchor="w", wraplength=length + 80, justify="left")
+        self.status.grid(row=1, column=0, columnspan=2, sticky="w", padx=5)
+        self.runner = JobRunner(master, self._show_progress, self._finished)
+        self._recorder = _run_recorder
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+        return self
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+        return self
+
+    def busy(self):
+        return self.runner.running
+
+    def start(self, pipeline, *args, **kwargs):
+        """Starts the pipeline unless one is still running; returns True when it started."""
+        if self.runner.running:
+            from tkinter import messagebox
+            messagebox.showwarning(self.title or "Busy", "A report is still running. Wait for it or press Cancel.")
+            return False
+        self.bar.configure(mode="indeterminate")
+        self.bar.start()
+        self.status.config(text="Starting...")
+        self.cancel_button.config(state="normal")
+        self.runner.start(pipeline, *args, **kwargs)
+        return True
+
+    def cancel(self):
+        if self.runner.running:
+            self.runner.cancel()
+            self.status.config(text="Cancelling after the current file...")
+
+    def _show_progress(self, update):
+        if update.total:
+            # The bar moves per file once the pipeline knows how many it will read
+            if str(self.bar.cget("mode")) == "indeterminate":
+                self.bar.stop()
+                self.bar.configure(mode="determinate")
+            self.bar.configure(maximum=update.total, value=update.done)
+        if not self.runner.progress.cancelled:
+            self.status.config(text=format_update(update))
+
+    def _finished(self, result):
+        self.bar.stop()
+        self.bar.configure(mode="determinate", maximum=1, value=0 if result.status in (ERROR, CANCELLED) else 1)
+        self.cancel_button.config(state="disabled")
+        update = self.runner.progress.update()
+        self.status.config(text=f"{result.status.capitalize()}: {format_update(update)}")
+        if self._recorder:
+            self._recorder(result, update.elapsed)
+        if self._on_finish:
+            self._on_finish(result)
+        else:
+            show_result(result, self.title)
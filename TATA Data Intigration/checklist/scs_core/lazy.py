@@ -0,0 +1,148 @@
+"""Import-on-first-use and background warm-up of the heavy libraries.
+
+pandas, openpyxl, xlsxwriter and pyarrow take a second or more to import on the
+office PCs (longer from a PyInstaller build), and a tool that imports them at the
+top shows nothing until they are loaded. The tools instead bind a stand-in that
+imports the module on first attribute access, open their window, and start a
+background import of what the run will need while the user picks the folders:
+
+    pd = lazy_import("pandas")          # module top: costs nothing
+    ...
+    root = Tk()
+    warm_up("pandas", "openpyxl", "scs_core.reader")
+
+A run started before the warm-up is done simply waits on Python's import lock for
+the module being loaded. To compare how long a tool takes to open its window:
+
+    python -m scs_core.lazy --startup "Final Pending GRN (1).py"
+"""
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+import importlib.util
+import subprocess
+
+# Loaded by warm_up() when a tool does not name its own modules
+DEFAULT_WARM_UP = ("pandas", "openpyxl", "xlsxwriter")
+
+# Top-level imports listed per tool by --startup
+PROFILE_LIMIT = 8
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """The module itself when it is already imported, else a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def is_available(name):
+    """True when the module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def warm_up(*names):
+    """Imports names (DEFAULT_WARM_UP when none) on a background thread; returns the thread."""
+    names = names or DEFAULT_WARM_UP
+
+    def load():
+        start = time.perf_counter()
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                logging.warning(f"Warm-up could not import {name}: {e}")
+        logging.info(f"Warm-up of {', '.join(names)} took {time.perf_counter() - start:.2f}s")
+
+    thread = threading.Thread(target=load, name="warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# Runs a tool until it creates its window, then exits (no window is shown)
+_UNTIL_WINDOW = r"""
+import sys, time, runpy, tkinter
+start = time.perf_counter()
+class _Opened(Exception):
+    pass
+def _stop(*args, **kwargs):
+    raise _Opened()
+tkinter.Tk.__init__ = _stop
+sys.argv = [sys.argv[1]]
+sys.path.insert(0, __import__("os").path.dirname(__import__("os").path.abspath(sys.argv[0])))
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except _Opened:
+    pass
+sys.stderr.write(f"window after {time.perf_counter() - start:.3f}s\n")
+"""
+
+
+def startup_profile(script):
+    """(seconds until the window is created, [(cumulative ms, module)] of the slowest
+    top-level imports) for one tool, from a fresh interpreter run with -X importtime.
+    """
+    script = os.path.abspath(script)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", _UNTIL_WINDOW, script],
+                            capture_output=True, text=True, cwd=os.path.dirname(script))
+    seconds = None
+    imports = []
+    for line in result.stderr.splitlines():
+        if line.startswith("window after "):
+            seconds = float(line.split()[2].rstrip("s"))
+        elif line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            # Top-level imports only (nested ones are indented under them)
+            if cumulative.strip().isdigit() and not module.startswith("  ", 1):
+                imports.append((int(cumulative) / 1000, module.strip()))
+    if seconds is None:
+        raise RuntimeError(f"{script} did not open a window:\n{result.stderr[-2000:]}")
+    return seconds, sorted(imports, reverse=True)[:PROFILE_LIMIT]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time until a tool's window opens")
+    parser.add_argument("--startup", nargs="+", metavar="SCRIPT", help="Tool scripts to profile")
+    args = parser.parse_args(argv)
+
+    for script in args.startup or []:
+        seconds, imports = startup_profile(script)
+        print(f"{os.path.basename(script)}: window after {seconds:.2f}s")
+        for ms, module in imports:
+            print(f"  {ms:8.0f} ms  {module}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""One location resolver for every mapping scheme used by the reports.
+
+    kind        key                 location            table
+    code        Code                Final Location      Location Master (OEM, PO, Stock upload, Reserve)
+    division    Division (a Code)   Final Location      Location Master (WIP, SAP purchase BO)
+    ship_from   ZShip From          Location Name       'Monthly data locations' sheet (CBO)
+    sold_to     Sold_To_Party       Location            TOC / BPR location file
+    site        SM Auto site        Location            built in (SM AUTO STOCK FINAL)
+
+Each table is read once per file version into a hash index, so every script of a
+session shares one copy; resolve() looks up a whole column at once and counts the
+keys it could not resolve:
+
+    resolver = get_resolver()
+    df['Location'] = resolver.resolve(df['Location'], 'code', mapping_file, default=df['Location'])
+    print(resolver.unmatched_report())
+"""
+import os
+import logging
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from scs_core.reader import read_excel
+from scs_core.masters import DEFAULT_MASTERS, read_master, master_version
+
+# Where the keys and locations of one kind are found in its table
+LocationTable = namedtuple("LocationTable", ["sheet_name", "key", "value"])
+
+KINDS = {
+    "code": LocationTable(0, "Code", "Final Location"),
+    "division": LocationTable(0, "Code", "Final Location"),
+    "ship_from": LocationTable("Monthly data locations", "ZShip From", "Location Name"),
+    "sold_to": LocationTable(0, "Sold_To_Party", "Location"),
+    "site": None,
+}
+
+# Tables used when a script does not pass its own location file
+DEFAULT_SOURCES = {
+    "code": DEFAULT_MASTERS["Location Master"],
+    "division": DEFAULT_MASTERS["Location Master"],
+}
+
+# SM Auto stock sites
+SM_AUTO_SITES = {
+    'C1.2VNS.RET': 'Varanasi Retail',
+    'C1.2VNS.SER': 'Varanasi Tass',
+    'C1.3LKO.INS': 'Lucknow STU Retail',
+    'C1.3LKO.RET': 'Lucknow Retail',
+    'C1.3LKO.SER': 'Lucknowes TASS',
+    'C1.3LKO.VOR': 'Lucknowvor Retail',
+    'C1.4GKP.RET': 'Gorakhpur Retail',
+    'C1.5ALD.RET': 'Allahabad Retail',
+    'C1.6SON.RET': 'Chopan Retail',
+    'C1.7FZP.RET': 'Faizabad Retail',
+    'C1.9FTP.RET': 'Fatehpur Retail',
+}
+
+# Unmatched keys listed per kind in unmatched_report()
+REPORT_LIMIT = 20
+
+
+def _key_text(value):
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _spread(values, codes):
+    """values[codes] with None where codes is -1 (blank); works when values is empty."""
+    out = np.full(len(codes), None, dtype=object)
+    present = codes >= 0
+    if present.any():
+        out[present] = np.asarray(values, dtype=object)[codes[present]]
+    return out
+
+
+def location_keys(values):
+    """Keys as stripped text; whole numbers read as floats (1234.0) match '1234'.
+
+    Each distinct value is normalised on its own, so a float 1002.0 in a column
+    mixing numbers and text still matches the master key 1002.
+    """
+    series = pd.Series(values)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    text = [_key_text(value) for value in uniques]
+    return pd.Series(_spread(text, codes), index=series.index, dtype="string")
+
+
+def build_index(keys, locations):
+    """key -> location Series; for repeated keys the last row wins, as with dict(zip(...))."""
+    index = pd.Series(pd.Series(locations).to_numpy(), index=location_keys(keys).to_numpy())
+    index = index[index.index.notna()]
+    return index[~index.index.duplicated(keep="last")]
+
+
+def _is_share_path(path):
+    return str(path).startswith(("\\\\", "//"))
+
+
+def _version(path):
+    # Masters on the share are served from their local snapshot (scs_core.masters)
+    if _is_share_path(path):
+        return master_version(path)
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read(path, sheet_name):
+    if _is_share_path(path):
+        return read_master(path, sheet_name=sheet_name)
+    if str(path).lower().endswith('.csv'):
+        return pd.read_csv(path)
+    return read_excel(path, sheet_name=sheet_name)
+
+
+class LocationResolver:
+    """Hash indexes of every location table, loaded on first use and shared by all scripts."""
+
+    def __init__(self):
+        self._indexes = {}
+        self._builtin = {"site": build_index(list(SM_AUTO_SITES), list(SM_AUTO_SITES.values()))}
+        self._lock = threading.Lock()
+        self.unmatched = {}  # kind -> {key: rows}, for the run report
+
+    def index(self, kind, source=None, sheet_name=None):
+        """key -> location index of one kind, read from source (or the kind's default table)."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown location kind '{kind}'; use one of {', '.join(KINDS)}.")
+        if source is None and kind in self._builtin:
+            return self._builtin[kind]
+
+        table = KINDS[kind]
+        source = source or DEFAULT_SOURCES.get(kind)
+        if not source or table is None:
+            raise ValueError(f"A location file is needed to resolve '{kind}' keys.")
+        sheet_name = table.sheet_name if sheet_name is None else sheet_name
+
+        version = _version(source)
+        cache_key = (os.path.normcase(str(source)).lower(), sheet_name, table.key, table.value)
+        with self._lock:
+            cached = self._indexes.get(cache_key)
+            if cached is None or cached[0] != version:
+                df = _read(source, sheet_name)
+                if table.key not in df.columns or table.value not in df.columns:
+                    raise ValueError(f"Location file {os.path.basename(str(source))} must contain "
+                                     f"'{table.key}' and '{table.value}' columns.")
+                cached = (version, build_index(df[table.key], df[table.value]))
+                self._indexes[cache_key] = cached
+            return cached[1]
+
+    def resolve(self, series, kind, source=None, sheet_name=None, default=None):
+        """Locations for a whole column of keys, aligned with series.
+
+        default fills the rows without a location (e.g. the original code, or a
+        Series of it); the keys that found no location are counted in unmatched.
+        """
+        index = self.index(kind, source, sheet_name)
+
+        # Keys are normalised and looked up once per distinct value, then spread to the rows
+        codes, uniques = pd.factorize(pd.Series(series), use_na_sentinel=True)
+        keys = location_keys(uniques)
+        found = keys.map(index).astype(object).to_numpy()
+        resolved = pd.Series(_spread(found, codes), index=series.index, dtype=object)
+
+        missing = pd.isna(found) & keys.notna().to_numpy()
+        if missing.any():
+            rows = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            counts = dict(zip(keys[missing], rows[missing]))
+            with self._lock:
+                unmatched = self.unmatched.setdefault(kind, {})
+                for key, count in counts.items():
+                    unmatched[key] = unmatched.get(key, 0) + int(count)
+            logging.warning(f"{sum(counts.values())} rows ({len(counts)} {kind} keys) have no location, "
+                            f"e.g. {', '.join(map(str, list(counts)[:5]))}")
+
+        if default is not None:
+            resolved = resolved.fillna(default)
+        return resolved
+
+    def unmatched_report(self):
+        """Plain-text list of the keys no location was found for, per kind."""
+        if not self.unmatched:
+            return "All location keys resolved."
+        lines = ["Unresolved location keys:"]
+        for kind, counts in self.unmatched.items():
+            ranked = sorted(counts.items(), key=lambda item: -item[1])
+            lines.append(f"  {kind}: {len(counts)} keys, {sum(counts.values())} rows")
+            lines.extend(f"    {key}: {rows} rows" for key, rows in ranked[:REPORT_LIMIT])
+        return "\n".join(lines)
+
+    def clear_unmatched(self):
+        with self._lock:
+            self.unmatched = {}
+
+
+_resolver = None
+
+
+def get_resolver():
+    """Returns the process-wide resolver shared by every pipeline."""
+    global _resolver
+    if _resolver is None:
+        _resolver = LocationResolver()
+    return _resolver
@@ -0,0 +1,161 @@
+"""Manifest of the workbooks a compile has already read from one input folder.
+
+Dealers send their monthly exports over several days, so the same keyword folder
+is compiled again and again with only a few new or replaced files. The manifest
+keeps, per input folder, every file read so far (path, size, mtime, content hash);
+their parsed rows are stored as blocks in the parse cache (scs_core.cache), so they
+count towards its size limit and are evicted with its least recently used entries.
+An incremental compile parses only the files that are new or changed (or whose
+block was evicted), drops the ones that were deleted and writes the output from
+the blocks:
+
+    manifest = CompileManifest(folder_path)
+    manifest.prune(excel_files)                 # forget deleted files
+    compiled_df, reports = compile_files(excel_files, manifest=manifest)
+
+A file whose size and mtime match its entry is taken as unchanged without being
+hashed; one that only had its mtime touched is hashed and still not re-parsed.
+
+    python -m scs_core.manifest --info FOLDER
+    python -m scs_core.manifest --clear FOLDER
+"""
+import os
+import sys
+import json
+import hashlib
+import logging
+import argparse
+
+from scs_core.cache import default_cache_dir, file_fingerprint, get_cache
+
+MANIFEST_FILE = "manifest.json"
+
+# Bumped when read_workbook changes what a block holds; older manifests are discarded
+MANIFEST_VERSION = 2
+
+# Read options of the blocks in the parse cache, apart from the reader's own entries
+BLOCK_OPTIONS = {"compile_block": MANIFEST_VERSION}
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def manifest_dir(folder_path):
+    """Folder holding the manifest of one input folder (under the parse cache folder)."""
+    return os.path.join(default_cache_dir(), "manifests", _digest(os.path.normcase(os.path.abspath(folder_path))))
+
+
+class CompileManifest:
+    """Files already compiled from one input folder, with their parsed rows."""
+
+    def __init__(self, folder_path, store_dir=None, cache=None):
+        self.folder_path = folder_path
+        self.store_dir = store_dir or manifest_dir(folder_path)
+        self.cache = cache or get_cache()
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.entries = self._load()
+
+    def _manifest_path(self):
+        return os.path.join(self.store_dir, MANIFEST_FILE)
+
+    def _load(self):
+        try:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            logging.info(f"Discarding the compile manifest of {self.folder_path} (older format)")
+            return {}
+        return data.get("files", {})
+
+    @staticmethod
+    def key(file_path):
+        return os.path.normcase(os.path.abspath(file_path))
+
+    def changed(self, file_path):
+        """None when file_path is unchanged since it was stored, else its new fingerprint."""
+        entry = self.entries.get(self.key(file_path))
+        stat = os.stat(file_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return None
+        fingerprint = file_fingerprint(file_path)
+        if entry and entry["hash"] == fingerprint["hash"]:
+            # Copied again or touched, same content: keep the block
+            entry["mtime"] = fingerprint["mtime"]
+            entry["size"] = fingerprint["size"]
+            return None
+        return fingerprint
+
+    def rows(self, file_path):
+        return self.entries[self.key(file_path)]["rows"]
+
+    @staticmethod
+    def _block_fingerprint(entry):
+        # Path and content only: a file that was just touched keeps its block
+        return {"path": entry["path"], "hash": entry["hash"]}
+
+    def block(self, file_path):
+        """Parsed rows stored for file_path, or None when the parse cache evicted them."""
+        entry = self.entries[self.key(file_path)]
+        return self.cache.get(entry["path"], BLOCK_OPTIONS, fingerprint=self._block_fingerprint(entry))
+
+    def store(self, fingerprint, df):
+        """Stores the parsed rows of one version of a file (the cache drops its older block)."""
+        self.cache.put(fingerprint["path"], BLOCK_OPTIONS, df, fingerprint=self._block_fingerprint(fingerprint))
+        self.entries[fingerprint["path"]] = dict(fingerprint, rows=len(df))
+
+    def prune(self, file_paths):
+        """Forgets the files not in file_paths (deleted or moved away); returns how many."""
+        keep = {self.key(path) for path in file_paths}
+        removed = [key for key in self.entries if key not in keep]
+        for key in removed:
+            self.cache.invalidate(self.entries.pop(key)["path"])
+        return len(removed)
+
+    def clear(self):
+        self.prune([])
+        self.save()
+
+    def save(self):
+        # Write to a temporary file first so a crash never leaves a half-written manifest
+        tmp_path = f"{self._manifest_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "folder": os.path.abspath(self.folder_path),
+                       "files": self.entries}, f)
+        os.replace(tmp_path, self._manifest_path())
+        self._sweep()
+
+    def _sweep(self):
+        # Blocks the first manifest format kept next to manifest.json, outside the size limit
+        for file_name in os.listdir(self.store_dir):
+            if file_name.endswith((".parquet", ".pkl")):
+                try:
+                    os.remove(os.path.join(self.store_dir, file_name))
+                except OSError:
+                    pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile manifests of the monthly input folders")
+    parser.add_argument("folders", nargs="+", metavar="FOLDER", help="Input (keyword) folders")
+    parser.add_argument("--clear", action="store_true", help="Forget every file of the folders (next compile reads all)")
+    parser.add_argument("--info", action="store_true", help="List the files stored for the folders")
+    args = parser.parse_args(argv)
+
+    for folder in args.folders:
+        manifest = CompileManifest(folder)
+        if args.clear:
+            count = len(manifest.entries)
+            manifest.clear()
+            print(f"{folder}: forgot {count} files")
+        if args.info or not args.clear:
+            print(f"{folder} ({manifest.store_dir}): {len(manifest.entries)} files, "
+                  f"{sum(e['rows'] for e in manifest.entries.values())} rows")
+            for entry in sorted(manifest.entries.values(), key=lambda e: e["path"]):
+                print(f"  {os.path.basename(entry['path'])}: {entry['rows']} rows")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
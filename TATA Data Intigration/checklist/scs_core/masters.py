@@ -0,0 +1,203 @@
+"""Local snapshots of the master files kept on the \\\\tata_server share.
+
+Opening the Location Master and the Partmasters over SMB and parsing them with
+openpyxl is slow, and fails outright when the share is down. read_master() serves
+a local Parquet snapshot of every sheet instead; the snapshot is pulled again only
+when the size or modification time of the file on the share changes, and an old
+snapshot keeps the scripts running while the share is unavailable.
+
+    python -m scs_core.masters --sync       pull every master listed in MASTER_PATHS_FILE
+    python -m scs_core.masters --status     snapshot age and staleness
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+
+from scs_core.cache import default_cache_dir, write_frame, read_frame
+from scs_core.reader import read_excel
+
+# Masters used by the reports, as listed for the team in the checklist folder
+MASTER_PATHS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "Paths for location master and part master cv&pc.txt")
+DEFAULT_MASTERS = {
+    "Location Master": r"\\tata_server\TATASERVER\TATA Data Intigration\checklist\All Location TATA CVBU & PCBU.xlsx",
+    "Partmaster PC": r"\\tata_server\TATASERVER\TATA Data Intigration\checklist\Partmaster.xlsx",
+    "Partmaster CV": r"\\tata_server\TATASERVER\TATA Data Intigration\checklist\PartmasterCVBU.xlsx",
+}
+
+INDEX_FILE = "masters.json"
+
+_lock = threading.Lock()
+
+
+def master_paths(paths_file=MASTER_PATHS_FILE):
+    """{name: path} from the paths file (a name line followed by a path line)."""
+    try:
+        with open(paths_file, "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f if line.strip()]
+    except OSError:
+        return dict(DEFAULT_MASTERS)
+    return {name: path for name, path in zip(lines[::2], lines[1::2])} or dict(DEFAULT_MASTERS)
+
+
+def snapshot_dir():
+    """Snapshot folder: SCS_MASTERS_DIR, else a 'masters' folder in the cache folder."""
+    return os.environ.get("SCS_MASTERS_DIR") or os.path.join(default_cache_dir(), "masters")
+
+
+def _key(path):
+    # The share is reached as \\tata_server and \\Tata_Server; both are the same file
+    return os.path.normcase(os.path.normpath(path)).lower()
+
+
+def _load_index():
+    try:
+        with open(os.path.join(snapshot_dir(), INDEX_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_index(index):
+    index_path = os.path.join(snapshot_dir(), INDEX_FILE)
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+
+
+def _pull(path, entry):
+    """Reads every sheet of the master on the share into new snapshot files."""
+    stat = os.stat(path)
+    sheets = read_excel(path, sheet_name=None, use_cache=False)
+    prefix = hashlib.sha1(_key(path).encode("utf-8")).hexdigest()[:12]
+    version = f"{stat.st_size}-{stat.st_mtime_ns}"
+    files = {sheet: write_frame(snapshot_dir(), f"{prefix}-{version}-{i}", df) for i, (sheet, df) in enumerate(sheets.items())}
+
+    # Snapshot files of the previous version are no longer needed
+    for file_name in (entry or {}).get("files", {}).values():
+        if file_name not in files.values():
+            try:
+                os.remove(os.path.join(snapshot_dir(), file_name))
+            except FileNotFoundError:
+                pass
+    return {"path": path, "size": stat.st_size, "mtime": stat.st_mtime_ns, "synced_at": time.time(), "files": files}
+
+
+def sync_master(path, force=False):
+    """Pulls path into its snapshot when the file on the share changed; returns the index entry.
+
+    When the share cannot be reached the existing snapshot entry is returned (and a
+    warning logged); without a snapshot the OSError is raised.
+    """
+    with _lock:
+        os.makedirs(snapshot_dir(), exist_ok=True)
+        index = _load_index()
+        entry = index.get(_key(path))
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            if entry is None:
+                raise
+            logging.warning(f"{path} is not reachable ({e}); using the snapshot from "
+                            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['synced_at']))}")
+            return entry
+
+        if force or entry is None or (entry["size"], entry["mtime"]) != (stat.st_size, stat.st_mtime_ns):
+            entry = _pull(path, entry)
+            index[_key(path)] = entry
+            _save_index(index)
+        return entry
+
+
+def read_master(path, sheet_name=0):
+    """Reads a sheet of a master from its local snapshot, syncing the snapshot first.
+
+    sheet_name is a sheet name or position like in pd.read_excel (None for all sheets).
+    """
+    files = sync_master(path)["files"]
+    if sheet_name is None:
+        return {sheet: read_frame(snapshot_dir(), file_name) for sheet, file_name in files.items()}
+    if isinstance(sheet_name, int):
+        sheet_name = list(files)[sheet_name]
+    if sheet_name not in files:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found in {os.path.basename(path)}")
+    return read_frame(snapshot_dir(), files[sheet_name])
+
+
+def master_version(path):
+    """(size, mtime) of the snapshot read_master would serve for path."""
+    entry = sync_master(path)
+    return entry["size"], entry["mtime"]
+
+
+def status(masters=None):
+    """Snapshot age and staleness of each master: a list of dicts for reports and the CLI.
+
+    stale is True when the file on the share changed since the last sync, None when
+    the share cannot be reached to check.
+    """
+    masters = masters or master_paths()
+    index = _load_index()
+    results = []
+    for name, path in masters.items():
+        entry = index.get(_key(path))
+        try:
+            stat = os.stat(path)
+            reachable = True
+        except OSError:
+            stat, reachable = None, False
+
+        if entry is None:
+            stale = True if reachable else None
+        elif reachable:
+            stale = (entry["size"], entry["mtime"]) != (stat.st_size, stat.st_mtime_ns)
+        else:
+            stale = None
+        results.append({
+            "name": name,
+            "path": path,
+            "reachable": reachable,
+            "synced_at": entry["synced_at"] if entry else None,
+            "age_hours": (time.time() - entry["synced_at"]) / 3600 if entry else None,
+            "stale": stale,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local snapshots of the TATA SCS masters")
+    parser.add_argument("--sync", action="store_true", help="Pull masters that changed on the share")
+    parser.add_argument("--force", action="store_true", help="With --sync, pull every master again")
+    parser.add_argument("--status", action="store_true", help="Show snapshot age and staleness")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    if args.sync:
+        for name, path in master_paths().items():
+            try:
+                start = time.perf_counter()
+                sync_master(path, force=args.force)
+                print(f"{name}: up to date ({time.perf_counter() - start:.2f}s)")
+            except Exception as e:
+                failed += 1
+                print(f"{name}: FAILED: {e}")
+
+    print(f"Snapshots: {snapshot_dir()}")
+    for result in status():
+        if result["synced_at"] is None:
+            age = "no snapshot"
+        else:
+            age = f"synced {result['age_hours']:.1f}h ago"
+        state = {True: "STALE", False: "current", None: "share not reachable"}[result["stale"]]
+        print(f"  {result['name']}: {age}, {state}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
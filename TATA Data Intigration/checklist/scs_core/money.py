@@ -0,0 +1,155 @@
+"""Parsing of amount columns exported as text ("Rs. 1,234.50").
+
+Only the declared amount columns are cleaned and parsed, a whole column at a time
+(with pyarrow's string kernels when it is installed), instead of an applymap over
+every cell of the frame. The values that still are not numbers become NaN and are
+counted per column:
+
+    df, failed = parse_amounts(df, AMOUNT_COLUMNS)
+    print(format_failures(failed))
+
+    python -m scs_core.money --benchmark
+"""
+import sys
+import time
+import logging
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from scs_core.lazy import lazy_import, is_available
+
+# pyarrow is optional and only imported by the first column that uses it
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+HAS_ARROW = is_available("pyarrow")
+
+# Text removed from amounts before they are read as numbers (spaces around the
+# number are allowed)
+CURRENCY_PREFIX = "Rs."
+THOUSANDS_SEPARATOR = ","
+
+# What is left of an amount once the currency prefix and separators are removed
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+# Failed values listed per column in the log
+EXAMPLE_LIMIT = 5
+
+
+def _parse_arrow(values):
+    # All-text column: pyarrow strips and parses the strings without a Python loop
+    text = pa.array(values, type=pa.string(), from_pandas=True)
+    text = pc.utf8_trim_whitespace(pc.replace_substring(pc.replace_substring(text, CURRENCY_PREFIX, ""),
+                                                         THOUSANDS_SEPARATOR, ""))
+    is_number = pc.fill_null(pc.match_substring_regex(text, NUMBER_PATTERN), False)
+    amounts = pc.cast(pc.if_else(is_number, text, None), pa.float64()).to_numpy(zero_copy_only=False)
+    blank = pc.fill_null(pc.equal(text, ""), True)
+    failed = pc.and_(pc.invert(is_number), pc.invert(blank)).to_numpy(zero_copy_only=False)
+    return amounts, failed
+
+
+def _parse_python(values):
+    # Mixed numbers and text: two plain str.replace calls per text value
+    cleaned = np.array([value.replace(CURRENCY_PREFIX, "").replace(THOUSANDS_SEPARATOR, "")
+                        if isinstance(value, str) else value for value in values], dtype=object)
+    amounts = pd.to_numeric(pd.Series(cleaned), errors="coerce").to_numpy(dtype=float)
+    failed = np.isnan(amounts) & pd.notna(cleaned)
+    if failed.any():
+        failed[failed] = [str(value).strip() != "" for value in cleaned[failed]]
+    return amounts, failed
+
+
+def parse_amount_column(series):
+    """(amounts, failed) for one column: amounts as float (NaN where not a number), and
+    the original values that could not be read as a number (blank text is not counted).
+    """
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return pd.to_numeric(series, errors="coerce"), series.iloc[:0]
+
+    values = series.to_numpy(dtype=object)
+    amounts = None
+    if HAS_ARROW:
+        try:
+            amounts, failed = _parse_arrow(values)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            amounts = None  # numbers mixed with text
+    if amounts is None:
+        amounts, failed = _parse_python(values)
+    return pd.Series(amounts, index=series.index, name=series.name), series[failed]
+
+
+def parse_amounts(df, columns):
+    """Parses the amount columns of df that are present; returns (df, failed).
+
+    failed is {column: Series of the values that could not be read} for the columns
+    with any; they are logged with format_failures().
+    """
+    failed = {}
+    for column in columns:
+        if column not in df.columns:
+            continue
+        df[column], bad = parse_amount_column(df[column])
+        if len(bad):
+            failed[column] = bad
+    if failed:
+        logging.warning(format_failures(failed))
+    return df, failed
+
+
+def format_failures(failed):
+    """Plain-text count of the values each column could not parse, with examples."""
+    if not failed:
+        return "All amounts parsed."
+    lines = ["Amounts that could not be parsed (left blank):"]
+    for column, values in failed.items():
+        distinct = pd.unique(values)
+        examples = ", ".join(repr(v) for v in distinct[:EXAMPLE_LIMIT])
+        lines.append(f"  {column}: {len(values)} values ({len(distinct)} distinct), e.g. {examples}")
+    return "\n".join(lines)
+
+
+def _amount_frame(rows, amount_columns=24, text_columns=26):
+    """Synthetic Intransit export: text amount columns and other text columns."""
+    rng = np.random.default_rng(0)
+    values = rng.random(rows) * 100000
+    amounts = pd.Series(values).map(lambda v: f"Rs. {v:,.2f}")
+    df = pd.DataFrame({f"Amount {i}": amounts for i in range(amount_columns)})
+    for i in range(text_columns):
+        df[f"Text {i}"] = rng.choice(["CPPUR123", "Lucknow, UP", "In Transit", "TATA Motors"], rows)
+    return df.astype(object)
+
+
+def benchmark(rows=200000):
+    """Times the whole-frame applymap against parse_amounts on the amount columns."""
+    df = _amount_frame(rows)
+    amount_columns = [c for c in df.columns if c.startswith("Amount")]
+
+    start = time.perf_counter()
+    old = df.map(lambda x: str(x).replace('Rs.', '').replace(',', '') if isinstance(x, str) else x)
+    for column in amount_columns:
+        old[column] = pd.to_numeric(old[column], errors='coerce')
+    applymap_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new, failed = parse_amounts(df.copy(), amount_columns)
+    parse_seconds = time.perf_counter() - start
+
+    same = all(np.allclose(old[c], new[c], equal_nan=True) for c in amount_columns)
+    return applymap_seconds, parse_seconds, same
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Amount column parsing benchmark")
+    parser.add_argument("--benchmark", action="store_true", help="Compare applymap with parse_amounts")
+    parser.add_argument("--rows", type=int, default=200000, help="Rows in the synthetic export")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        applymap_seconds, parse_seconds, same = benchmark(args.rows)
+        print(f"{args.rows} rows x 50 columns: applymap {applymap_seconds:.2f}s, "
+              f"parse_amounts {parse_seconds:.2f}s ({'same' if same else 'DIFFERENT'} amounts)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Order-number prefix families (Non TATA purchases, SAP backorders, ...).
+
+The prefixes live in PREFIXES_FILE next to the scripts, one list per family:
+
+    "Non TATA": ["CPPUR", "ECPUR", "ICPPUR", "EICPUR"],
+    "SAP-000": ["SAP-000"]
+
+order_families() tags a whole column of order numbers with their family in one
+pass (pyarrow's starts_with kernel per prefix when pyarrow is installed, else one
+anchored regex per distinct order number) and returns a categorical, so the
+filters are plain comparisons:
+
+    families = order_families(df['Order #'])
+    df = df[~families.isin(['Non TATA', 'SAP-000', 'SAP-200', 'SAP-300'])]
+
+    python -m scs_core.orders --benchmark
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from scs_core.lazy import lazy_import, is_available
+
+# pyarrow is optional and only imported by the first column that uses it
+pa = lazy_import("pyarrow")
+pc = lazy_import("pyarrow.compute")
+HAS_ARROW = is_available("pyarrow")
+
+PREFIXES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Order prefixes.json")
+
+# Families used when PREFIXES_FILE is missing
+DEFAULT_FAMILIES = {
+    "Non TATA": ["CPPUR", "ECPUR", "ICPPUR", "EICPUR"],
+    "SAP-000": ["SAP-000"],
+    "SAP-200": ["SAP-200"],
+    "SAP-300": ["SAP-300"],
+}
+
+# Compiled families: the anchored regex of every prefix, prefix -> family and the
+# prefixes longest first (a longer prefix wins over one it starts with)
+OrderFamilies = namedtuple("OrderFamilies", ["families", "pattern", "by_prefix", "ordered"])
+
+_loaded = {}
+
+
+def compile_families(families):
+    """OrderFamilies from {family: [prefixes]}; the longest matching prefix wins."""
+    by_prefix = {}
+    for family, prefixes in families.items():
+        for prefix in prefixes:
+            if prefix in by_prefix and by_prefix[prefix] != family:
+                raise ValueError(f"Prefix '{prefix}' is listed under both '{by_prefix[prefix]}' and '{family}'.")
+            by_prefix[prefix] = family
+    ordered = sorted(by_prefix, key=len, reverse=True)
+    pattern = re.compile(f"^(?:{'|'.join(map(re.escape, ordered))})") if ordered else None
+    return OrderFamilies(list(families), pattern, by_prefix, ordered)
+
+
+def load_families(prefixes_file=PREFIXES_FILE):
+    """Compiled families of prefixes_file (DEFAULT_FAMILIES when it does not exist), read once per file version."""
+    try:
+        version = os.stat(prefixes_file).st_mtime_ns
+    except FileNotFoundError:
+        version = None
+    cached = _loaded.get(prefixes_file)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    if version is None:
+        logging.warning(f"{prefixes_file} not found; using the built-in order prefixes")
+        families = DEFAULT_FAMILIES
+    else:
+        with open(prefixes_file, "r", encoding="utf-8") as f:
+            families = json.load(f)
+    compiled = compile_families(families)
+    _loaded[prefixes_file] = (version, compiled)
+    return compiled
+
+
+def family_prefixes(family, families=None):
+    """Prefixes of one family, as listed in the prefixes file."""
+    families = families or load_families()
+    if family not in families.families:
+        raise ValueError(f"Unknown order family '{family}'; use one of {', '.join(families.families)}.")
+    return [prefix for prefix, name in families.by_prefix.items() if name == family]
+
+
+def _codes_arrow(values, families):
+    # All-text column: one starts_with kernel per prefix over the whole column
+    text = pa.array(values, type=pa.string(), from_pandas=True)
+    codes = np.full(len(values), -1, dtype=np.int8)
+    position = {family: i for i, family in enumerate(families.families)}
+    for prefix in families.ordered:
+        matched = pc.fill_null(pc.starts_with(text, prefix), False).to_numpy(zero_copy_only=False)
+        codes[matched & (codes < 0)] = position[families.by_prefix[prefix]]
+    return codes
+
+
+def _codes_python(values, families):
+    # Mixed numbers and text: the anchored regex once per distinct order number
+    codes, uniques = pd.factorize(pd.Series(values))
+    position = {prefix: families.families.index(family) for prefix, family in families.by_prefix.items()}
+    match = families.pattern.match
+    labels = np.fromiter((position[m.group(0)] if m else -1
+                          for m in (match(str(value)) for value in uniques)), dtype=np.int8, count=len(uniques))
+    return np.where(codes < 0, -1, labels[codes])
+
+
+def order_families(orders, families=None):
+    """Family of every order number as a categorical aligned with orders (NaN for none).
+
+    Order numbers are matched as text, so numbers read from Excel and blank cells
+    simply belong to no family.
+    """
+    families = families or load_families()
+    orders = pd.Series(orders)
+    if families.pattern is None:
+        codes = np.full(len(orders), -1, dtype=np.int8)
+    else:
+        values = orders.to_numpy(dtype=object)
+        codes = None
+        if HAS_ARROW:
+            try:
+                codes = _codes_arrow(values, families)
+            except (pa.ArrowTypeError, pa.ArrowInvalid):
+                codes = None  # numbers mixed with text
+        if codes is None:
+            codes = _codes_python(values, families)
+    return pd.Series(pd.Categorical.from_codes(codes, families.families), index=orders.index, name="Order family")
+
+
+def _order_column(rows):
+    """Synthetic Intransit / PO export order numbers."""
+    rng = np.random.default_rng(0)
+    prefixes = ["CPPUR", "ECPUR", "ICPPUR", "EICPUR", "SAP-000", "SAP-200", "SAP-300", "SO", "TMPUR"]
+    orders = [f"{rng.choice(prefixes)}{n}" for n in rng.integers(100000, 999999, rows // 4)]
+    return pd.Series(rng.choice(orders, rows), dtype=object, name="Order #")
+
+
+def benchmark(rows=1000000):
+    """Times the joined str.contains filter of the PO scripts against order_families."""
+    orders = _order_column(rows)
+    patterns_to_remove = ['EICPUR', 'ICPPUR', 'CPPUR', 'ECPUR', 'SAP-200', 'SAP-300', 'SAP-000']
+    families = compile_families(DEFAULT_FAMILIES)
+
+    start = time.perf_counter()
+    contains = ~orders.str.contains('|'.join(patterns_to_remove), na=False)
+    contains_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tagged = order_families(orders, families)
+    kept = ~tagged.isin(families.families)
+    family_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tagged == "SAP-000"
+    compare_seconds = time.perf_counter() - start
+
+    same = contains.equals(kept)
+    return contains_seconds, family_seconds, compare_seconds, same
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Order-number prefix families")
+    parser.add_argument("--benchmark", action="store_true", help="Compare str.contains with order_families")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows in the synthetic order column")
+    parser.add_argument("--show", action="store_true", help="Print the families in use")
+    args = parser.parse_args(argv)
+
+    if args.show:
+        families = load_families()
+        for family in families.families:
+            print(f"{family}: {', '.join(family_prefixes(family, families))}")
+
+    if args.benchmark:
+        contains_seconds, family_seconds, compare_seconds, same = benchmark(args.rows)
+        print(f"{args.rows} rows: str.contains {contains_seconds:.2f}s, order_families {family_seconds:.2f}s "
+              f"(then {compare_seconds:.3f}s per family comparison; {'same' if same else 'DIFFERENT'} rows kept)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Partmaster lookups shared by every report of a session.
+
+The Partmaster is read once per file version (from its local snapshot, see
+scs_core.masters) and indexed by part number; each input file then gets all the
+attributes it needs (Category, LandedCost, ...) from one lookup, instead of one
+merge per attribute and a fresh read of the master per run. Both sides are keyed
+with part_keys(), so a part number read as 12345.0 on one side still matches
+"12345" on the other.
+
+    partmaster = get_partmaster(PARTMASTER_PATH)
+    df = partmaster.attach(df, 'Part #', {'Category': 'Catg', 'LandedCost': 'Rate'})
+"""
+import os
+import re
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+from scs_core.masters import read_master, master_version
+
+PARTMASTER_PC_PATH = r"\\tata_server\TATASERVER\TATA Data Intigration\checklist\Partmaster.xlsx"
+PARTMASTER_CV_PATH = r"\\tata_server\TATASERVER\TATA Data Intigration\checklist\PartmasterCVBU.xlsx"
+
+KEY_COLUMN = "Part Number"
+
+
+# Text of a whole number that went through float: "12345.0"
+FLOAT_ARTEFACT = re.compile(r"(\d+)\.0+")
+
+# What astype(str) makes of blank cells
+BLANK_TEXT = {"", "nan", "NaN", "None", "<NA>", "NaT"}
+
+
+def part_number(value):
+    """Display text of one part number: 12345.0 and "12345.0 " both become "12345".
+
+    Blank cells (NaN, None, "nan" left by astype(str)) give None.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    text = str(value).strip()
+    if text in BLANK_TEXT:
+        return None
+    match = FLOAT_ARTEFACT.fullmatch(text)
+    return match.group(1) if match else text
+
+
+def _per_unique(values, convert):
+    # Each distinct value is converted once and the result spread back to the rows
+    series = pd.Series(values)
+    codes, uniques = pd.factorize(series)
+    converted = np.array([convert(value) for value in uniques] + [None], dtype=object)
+    return pd.Series(converted[codes], index=series.index, name=series.name, dtype=object)
+
+
+def _part_key(value):
+    text = part_number(value)
+    return text.upper() if text is not None else None
+
+
+def part_text(values):
+    """Part numbers as text for the reports, instead of astype(str) (see part_number)."""
+    return _per_unique(values, part_number)
+
+
+def part_keys(values):
+    """Canonical join keys of part numbers: part_text, upper-cased.
+
+    Partmaster rows and input files are keyed the same way, so 12345 read as a
+    number, "12345.0" and " 12345" all find the Partmaster row of "12345".
+    """
+    return _per_unique(values, _part_key)
+
+
+class PartMaster:
+    """Partmaster table indexed by canonical part key (the first row wins for duplicates)."""
+
+    def __init__(self, table, key_column=KEY_COLUMN, source="Partmaster"):
+        if key_column not in table.columns:
+            raise ValueError(f"Partmaster must have a '{key_column}' column.")
+        keys = part_keys(table[key_column])
+        table = table[keys.notna().to_numpy()].set_index(keys.dropna().to_numpy())
+        duplicates = table.index.duplicated()
+        if duplicates.any():
+            logging.warning(f"{source}: {duplicates.sum()} duplicate part numbers, using the first row of each")
+            table = table[~duplicates]
+        self.table = table
+        self.source = source
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, value):
+        key = _part_key(value)
+        return key is not None and key in self.table.index
+
+    def lookup(self, parts, attributes):
+        """Partmaster attributes for each part, as a frame aligned with parts (NaN when not found)."""
+        keys = part_keys(parts)
+        found = self.table[list(attributes)].reindex(keys.to_numpy())
+        found.index = keys.index
+        return found
+
+    def attach(self, df, on, attributes):
+        """Returns df with Partmaster attributes added as columns, in one lookup per file.
+
+        attributes is a list of Partmaster columns or {Partmaster column: new column}.
+        """
+        if not isinstance(attributes, dict):
+            attributes = {column: column for column in attributes}
+        found = self.lookup(df[on], list(attributes))
+        df = df.copy()
+        for column, new_column in attributes.items():
+            df[new_column] = found[column].to_numpy()
+        return df
+
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def get_partmaster(path=PARTMASTER_PC_PATH, key_column=KEY_COLUMN):
+    """Returns the PartMaster of path, reading it only when the file changed since the last call."""
+    version = master_version(path)
+    with _lock:
+        cached = _loaded.get((path, key_column))
+        if cached is None or cached[0] != version:
+            cached = (version, PartMaster(read_master(path), key_column, source=os.path.basename(path)))
+            _loaded[(path, key_column)] = cached
+        return cached[1]
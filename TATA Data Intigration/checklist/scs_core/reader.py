@@ -0,0 +1,97 @@
+"""Shared workbook reader used by every TATA SCS script."""
+import os
+
+import pandas as pd
+
+from scs_core.cache import get_cache, cache_enabled, file_fingerprint
+from scs_core.engines import pick_engine
+from scs_core.sheetxml import read_selections, SchemaError
+
+CACHEABLE_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+STREAMABLE_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def read_excel(file_path, sheet_name=0, columns=None, optional_columns=None, where=None, use_cache=True, **kwargs):
+    """Reads a workbook like pd.read_excel, serving unchanged files from the parse cache.
+
+    columns lists the columns a pipeline needs: only those are parsed, and a
+    SchemaError naming the missing ones is raised when the file lacks any of them.
+    optional_columns are parsed when present and skipped silently otherwise.
+    where is a row filter such as {'Availability': 'Reserved'}; it is applied while
+    the sheet is parsed, so only matching rows are ever built into the DataFrame.
+    The parsing engine comes from scs_core.engines unless engine= is passed; reads
+    with columns or where use the streaming reader (scs_core.sheetxml) for .xlsx
+    files whatever engine is the default.
+    """
+    if columns or optional_columns or where:
+        return read_excel_selections(file_path, {"": where}, sheet_name, columns, optional_columns,
+                                     use_cache, **kwargs)[""]
+
+    file_path = str(file_path)
+    kwargs["engine"] = kwargs.get("engine") or pick_engine(file_path)
+    return _cached(file_path, dict(kwargs, sheet_name=sheet_name), use_cache,
+                   lambda: pd.read_excel(file_path, sheet_name=sheet_name, **kwargs))
+
+
+def read_excel_selections(file_path, selections, sheet_name=0, columns=None, optional_columns=None,
+                          use_cache=True, **kwargs):
+    """Reads a sheet once and returns {name: DataFrame} for several row filters.
+
+    Used when one export feeds several reports, e.g. On Hand stock, Reserved stock
+    and In Transit (Pending GRN) rows of the same Base Stock file.
+    """
+    file_path = str(file_path)
+    options = dict(kwargs, sheet_name=sheet_name, columns=columns, optional_columns=optional_columns,
+                   selections=selections)
+    return _cached(file_path, options, use_cache,
+                   lambda: _read_selected(file_path, selections, sheet_name, columns or [], optional_columns or [],
+                                          kwargs))
+
+
+def _cached(file_path, options, use_cache, load):
+    if not (use_cache and cache_enabled() and file_path.lower().endswith(CACHEABLE_EXTENSIONS)):
+        return load()
+
+    cache = get_cache()
+    fingerprint = file_fingerprint(file_path)
+    result = cache.get(file_path, options, fingerprint)
+    if result is None:
+        result = load()
+        cache.put(file_path, options, result, fingerprint)
+    return result
+
+
+def _read_selected(file_path, selections, sheet_name, columns, optional_columns, kwargs):
+    # The streaming reader only builds the wanted cells of the matching rows, so it is used
+    # for every projected/filtered .xlsx read; the default engine (calamine when installed)
+    # would parse the whole sheet first. Only an engine= or other pandas options passed by
+    # the caller go through pandas
+    if file_path.lower().endswith(STREAMABLE_EXTENSIONS) and not kwargs:
+        return read_selections(file_path, selections, sheet_name, columns, optional_columns)
+
+    # .xls, a caller's engine or extra pandas options: let pandas skip the other columns, then filter the rows
+    kwargs = dict(kwargs, engine=kwargs.get("engine") or pick_engine(file_path))
+    filter_columns = [c for where in selections.values() for c in (where or {})]
+    header = pd.read_excel(file_path, sheet_name=sheet_name, nrows=0, **kwargs).columns
+    missing = [c for c in list(columns) + filter_columns if c not in header]
+    if missing:
+        raise SchemaError(file_path, missing, header)
+
+    wanted = set(columns) | set(optional_columns)
+    usecols = (lambda c: c in wanted or c in filter_columns) if wanted else None
+    df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=usecols, **kwargs)
+
+    result = {}
+    for name, where in selections.items():
+        mask = pd.Series(True, index=df.index)
+        for column, value in (where or {}).items():
+            allowed = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            mask &= df[column].isin(allowed)
+        selected = df[mask].reset_index(drop=True)
+        result[name] = selected[[c for c in selected.columns if c in wanted]] if wanted else selected
+    return result
+
+
+def invalidate(file_path=None):
+    """Drops cached parses of one file (or of everything)."""
+    return get_cache().invalidate(os.fspath(file_path) if file_path else None)
@@ -0,0 +1,178 @@
+"""In-process registry of the report scripts the launchers run.
+
+Each report is registered under its menu name with its script file and, when the
+script has them, its window function and its headless entry function. The
+launcher runs it in its own process, so pandas, the location / part masters and
+the parse cache one run has loaded are still there for the next run:
+
+    registry = ScriptRegistry(on_record=show_record)
+    registry.register("Final Pending GRN", "Final Pending GRN.py", window="run_gui")
+    registry.open_window("Final Pending GRN", root)   # on the Tk thread
+    ...
+    def show_record(record):                          # after every run from the window
+        print(f"{record.name}: {record.seconds:.1f}s")
+
+Tk may only be driven from the thread running the launcher's mainloop, and a
+second Tk() would leave the tool's StringVars on the launcher's interpreter. So
+a window function takes the launcher's root and builds a Toplevel of it with
+tool_window(master) (its own Tk root when the script is started on its own).
+The report then runs on the window's JobPanel worker (scs_core.jobs), which
+reports each finished run and its wall time to the registry's history.
+
+Console launchers call run(name) instead: a script's entry function is called,
+or a script without functions runs as if started with python (run_name
+"__main__", its own folder first on sys.path). Scripts are imported once (again
+when the file changes).
+"""
+import os
+import sys
+import time
+import runpy
+import logging
+import threading
+import importlib.util
+from collections import namedtuple
+
+from scs_core.batch import CANCELLED, ERROR
+from scs_core.jobs import recording_runs
+
+# One registered report: menu name, script file, headless entry function and window function (or None)
+Report = namedtuple("Report", ["name", "path", "entry", "window"])
+
+# One finished run: wall time in seconds and the error text (None when it succeeded)
+RunRecord = namedtuple("RunRecord", ["name", "seconds", "error", "finished"])
+
+
+def tool_window(master=None):
+    """Window of a report: a Toplevel of the launcher's root, or its own Tk root when run alone."""
+    import tkinter as tk
+    return tk.Toplevel(master) if master is not None else tk.Tk()
+
+
+def run_window(window):
+    """Runs the Tk loop of a report started on its own; a launcher's Toplevel runs in the launcher's loop."""
+    import tkinter as tk
+    if isinstance(window, tk.Tk):
+        window.mainloop()
+
+
+def _module_name(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return "scs_report_" + "".join(c if c.isalnum() else "_" for c in stem)
+
+
+class ScriptRegistry:
+    """Report scripts by menu name, run in this process one after another."""
+
+    def __init__(self, on_record=None):
+        self._reports = {}
+        self._modules = {}  # path -> (mtime, module)
+        self._lock = threading.Lock()  # one report at a time: they share sys.argv and the masters
+        self.on_record = on_record  # called with each RunRecord added to history
+        self.history = []
+
+    def register(self, name, path, entry=None, window=None):
+        """Registers a report; a path without an extension gets ".py"."""
+        if not os.path.splitext(path)[1]:
+            path += ".py"
+        self._reports[name] = Report(name, path, entry, window)
+        return self._reports[name]
+
+    def names(self):
+        return list(self._reports)
+
+    def report(self, name):
+        if name not in self._reports:
+            raise KeyError(f"No report registered as '{name}'.")
+        return self._reports[name]
+
+    def _load(self, path):
+        # Imported once per file version; sibling imports (scs_core) resolve from its folder
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._modules.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        folder = os.path.dirname(os.path.abspath(path))
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+        spec = importlib.util.spec_from_file_location(_module_name(path), path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        self._modules[path] = (mtime, module)
+        return module
+
+    def _call(self, report):
+        if not os.path.exists(report.path):
+            raise FileNotFoundError(f"Script not found: {report.path}")
+        if report.window and not report.entry:
+            raise ValueError(f"'{report.name}' is a window; open it with open_window() on the Tk thread.")
+        if report.entry:
+            return getattr(self._load(report.path), report.entry)()
+
+        folder = os.path.dirname(os.path.abspath(report.path))
+        argv, sys.argv = sys.argv, [report.path]
+        sys.path.insert(0, folder)
+        try:
+            runpy.run_path(report.path, run_name="__main__")
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                raise RuntimeError(f"exited with code {e.code}") from None
+        finally:
+            sys.argv = argv
+            if sys.path and sys.path[0] == folder:
+                sys.path.pop(0)
+
+    def _record(self, name, seconds, error):
+        record = RunRecord(name, seconds, error, time.strftime("%H:%M:%S"))
+        self.history.append(record)
+        if self.on_record:
+            self.on_record(record)
+        return record
+
+    def run(self, name):
+        """Runs a report here and now; returns its RunRecord (errors are logged, not raised)."""
+        report = self.report(name)
+        with self._lock:
+            start = time.perf_counter()
+            error = None
+            try:
+                result = self._call(report)
+                # Headless pipelines return a RunResult (scs_core.batch)
+                if getattr(result, "status", None) == ERROR:
+                    error = result.message
+            except Exception as e:
+                logging.exception(f"Report '{name}' failed")
+                error = str(e)
+            seconds = time.perf_counter() - start
+        return self._record(name, seconds, error)
+
+    def open_window(self, name, master):
+        """Opens a report's window as a Toplevel of master; call it on the Tk thread.
+
+        Returns None once the window is open, else the error text (also recorded).
+        Every run started from the window is recorded when it finishes, with the
+        wall time of the run itself.
+        """
+        report = self.report(name)
+
+        def record_run(result, seconds):
+            self._record(name, seconds, result.message if result.status in (ERROR, CANCELLED) else None)
+
+        try:
+            if not report.window:
+                raise ValueError(f"'{name}' has no window function.")
+            if not os.path.exists(report.path):
+                raise FileNotFoundError(f"Script not found: {report.path}")
+            with recording_runs(record_run):
+                getattr(self._load(report.path), report.window)(master)
+        except Exception as e:
+            logging.exception(f"Report '{name}' could not be opened")
+            self._record(name, 0.0, str(e))
+            return str(e)
+        return None
+
+
+def format_record(record):
+    """One line per run: time finished, report, wall time and the outcome."""
+    outcome = f"error: {record.error}" if record.error else "ok"
+    return f"{record.finished}  {record.name}  {record.seconds:.1f}s  {outcome}"
@@ -0,0 +1,302 @@
+"""Streaming reader for .xlsx sheets.
+
+Walks the sheet XML once and converts only the cells of the requested columns, so
+wide exports (Intransit has 50+ columns) cost little more than the columns a
+pipeline actually uses. Values are handed to pandas' own TextParser, which gives the
+same NA handling and dtype inference as pd.read_excel.
+"""
+import os
+import zipfile
+import posixpath
+from datetime import datetime
+from xml.etree.ElementTree import iterparse, fromstring
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.datetime import from_excel
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_DOC_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+TAG_ROW = NS_MAIN + "row"
+TAG_CELL = NS_MAIN + "c"
+TAG_VALUE = NS_MAIN + "v"
+TAG_TEXT = NS_MAIN + "t"
+TAG_INLINE = NS_MAIN + "is"
+TAG_RUN = NS_MAIN + "r"
+TAG_SHEET_DATA = NS_MAIN + "sheetData"
+
+
+class SchemaError(ValueError):
+    """Raised when a workbook lacks columns a pipeline declared as required."""
+
+    def __init__(self, file_path, missing, available):
+        self.file_path = file_path
+        self.missing = list(missing)
+        self.available = list(available)
+        super().__init__(
+            f"{os.path.basename(str(file_path))} is missing required column(s): {', '.join(map(str, self.missing))}"
+        )
+
+
+def _sheet_part(zf, sheet_name):
+    """Returns the zip member of a sheet given its name or 0-based position."""
+    workbook = fromstring(zf.read("xl/workbook.xml"))
+    rels = fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(NS_PKG_REL + "Relationship")}
+
+    sheets = [(s.get("name"), s.get(NS_DOC_REL + "id")) for s in workbook.iter(NS_MAIN + "sheet")]
+    if isinstance(sheet_name, int):
+        if sheet_name >= len(sheets):
+            raise ValueError(f"Worksheet index {sheet_name} is invalid, {len(sheets)} worksheets found")
+        rel_id = sheets[sheet_name][1]
+    else:
+        matches = [rid for name, rid in sheets if name == sheet_name]
+        if not matches:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        rel_id = matches[0]
+
+    target = targets[rel_id]
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def _shared_strings(zf):
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, elem in iterparse(f):
+            if elem.tag == NS_MAIN + "si":
+                strings.append(_string_item(elem))
+                elem.clear()
+    return strings
+
+
+def _string_item(elem):
+    """Text of a shared/inline string item (plain or rich text, without phonetic runs)."""
+    text = elem.find(TAG_TEXT)
+    if text is not None:
+        return text.text or ""
+    return "".join(run.findtext(TAG_TEXT) or "" for run in elem.iter(TAG_RUN))
+
+
+def _date_styles(zf):
+    """Returns the cell style indexes whose number format displays a date."""
+    if "xl/styles.xml" not in zf.namelist():
+        return set()
+    styles = fromstring(zf.read("xl/styles.xml"))
+    formats = dict(BUILTIN_FORMATS)
+    num_fmts = styles.find(NS_MAIN + "numFmts")
+    if num_fmts is not None:
+        for fmt in num_fmts:
+            formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+
+    date_styles = set()
+    cell_xfs = styles.find(NS_MAIN + "cellXfs")
+    if cell_xfs is not None:
+        for idx, xf in enumerate(cell_xfs):
+            code = formats.get(int(xf.get("numFmtId", 0)))
+            if code and is_date_format(code):
+                date_styles.add(idx)
+    return date_styles
+
+
+def _cell_value(cell, shared_strings, date_styles):
+    # Blank and error cells come back as "" (what pandas' openpyxl reader hands to TextParser),
+    # so they are NaN in every column, also in object columns
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        inline = cell.find(TAG_INLINE)
+        return _string_item(inline) if inline is not None else ""
+
+    raw = cell.findtext(TAG_VALUE)
+    if raw is None:
+        return ""
+    if cell_type == "s":
+        return shared_strings[int(raw)]
+    if cell_type == "str":
+        return raw
+    if cell_type == "d":
+        return datetime.fromisoformat(raw)
+    if cell_type == "b":
+        return raw == "1"
+    if cell_type == "e":
+        return ""
+
+    # Numbers: whole numbers come back as int, like pd.read_excel does
+    number = float(raw)
+    style = cell.get("s")
+    if style is not None and int(style) in date_styles:
+        return from_excel(number)
+    if number.is_integer():
+        return int(number)
+    return number
+
+
+def _has_value(cell):
+    return cell.find(TAG_VALUE) is not None or cell.find(TAG_INLINE) is not None
+
+
+def _last_column(cells):
+    """Position after the last cell of a row that holds a value (0 for a blank row)."""
+    return max((i + 1 for i, cell in cells.items() if _has_value(cell)), default=0)
+
+
+def _column_index(ref):
+    letters = ref.rstrip("0123456789")
+    return column_index_from_string(letters) - 1
+
+
+def iter_sheet_rows(file_path, sheet_name=0):
+    """Yields (row_number, {column_index: cell_element}) for each row of a sheet, from row 1.
+
+    Rows the sheet XML leaves out (blank rows) are yielded with no cells, so row
+    numbers follow the sheet like pd.read_excel's rows do. Cells are not converted
+    here; callers convert only the columns they keep.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        part = _sheet_part(zf, sheet_name)
+        with zf.open(part) as f:
+            sheet_data = None
+            row_number = 0
+            for event, elem in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == TAG_SHEET_DATA:
+                        sheet_data = elem
+                    continue
+                if elem.tag != TAG_ROW:
+                    continue
+
+                number = int(elem.get("r", row_number + 1))
+                while row_number + 1 < number:
+                    row_number += 1
+                    yield row_number, {}
+                row_number = number
+
+                cells = {}
+                position = 0
+                for cell in elem.iter(TAG_CELL):
+                    ref = cell.get("r")
+                    position = _column_index(ref) if ref else position
+                    cells[position] = cell
+                    position += 1
+                yield row_number, cells
+
+                # Drop the parsed row so memory stays flat on large sheets
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+
+def _header_names(values):
+    """Pandas-style header names: blanks become 'Unnamed: n', duplicates get '.1', '.2'."""
+    names = []
+    seen = {}
+    for idx, value in enumerate(values):
+        name = f"Unnamed: {idx}" if value is None or value == "" else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _allowed_values(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return set(value)
+    return {value}
+
+
+def read_selections(file_path, selections, sheet_name=0, columns=None, optional_columns=None):
+    """Streams a sheet once and routes matching rows into one DataFrame per selection.
+
+    selections maps a name to a row filter {column: value or list of values}; a row
+    belongs to a selection when every listed column holds one of the allowed values
+    (an empty filter keeps every row). Filter cells are converted first and the rest
+    of the row only for rows that match, so memory follows the output, not the file.
+
+    columns are required: a SchemaError is raised from the header row, before any
+    data is parsed, when one is missing (filter columns are always required).
+    optional_columns are kept when present. With no columns at all, every column is
+    read. An empty sheet gives empty frames with the requested columns.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        shared_strings = _shared_strings(zf)
+        date_styles = _date_styles(zf)
+
+    required = list(columns or [])
+    filter_columns = [c for where in selections.values() for c in (where or {}) if c not in required]
+    wanted = required + [c for c in (optional_columns or []) if c not in required]
+    rows_iter = iter_sheet_rows(file_path, sheet_name)
+
+    # The header is sheet row 1, like pd.read_excel's header=0 (blank there gives 'Unnamed: n')
+    header_cells = next(rows_iter, (0, None))[1]
+    if header_cells is None:
+        return {name: pd.DataFrame(columns=wanted) for name in selections}
+    header_values = [_cell_value(header_cells[i], shared_strings, date_styles) if i in header_cells else ""
+                     for i in range(_last_column(header_cells))]
+    header = _header_names(header_values)
+
+    missing = [c for c in required + filter_columns if c not in header]
+    if missing:
+        raise SchemaError(file_path, missing, header)
+    # Projected reads keep the wanted columns; a full read keeps every column up to the widest row
+    positions = [i for i, name in enumerate(header) if name in wanted] if wanted else None
+    width = len(header)
+
+    filters = {
+        name: [(header.index(column), _allowed_values(value)) for column, value in (where or {}).items()]
+        for name, where in selections.items()
+    }
+    rows = {name: [] for name in selections}
+
+    for _, cells in rows_iter:
+        converted = {}
+
+        def value_at(i):
+            if i not in converted:
+                converted[i] = _cell_value(cells[i], shared_strings, date_styles) if i in cells else ""
+            return converted[i]
+
+        last = _last_column(cells)
+        width = max(width, last)
+        matched = [name for name, conditions in filters.items()
+                   if all(value_at(i) in allowed for i, allowed in conditions)]
+        if not matched:
+            continue
+
+        # A row is blank when no cell holds a value, also outside the kept columns
+        if positions is None:
+            row = (last > 0, [value_at(i) for i in range(last)])
+        else:
+            row = (last > 0, [value_at(i) for i in positions])
+        for name in matched:
+            rows[name].append(row)
+
+    if positions is None:
+        header = _header_names(header_values + [""] * (width - len(header_values)))
+        positions = list(range(width))
+    names = [header[i] for i in positions]
+    result = {}
+    for name, selected in rows.items():
+        # Trailing blank rows are dropped by pd.read_excel; blank rows in between are kept as NaN rows
+        while selected and not selected[-1][0]:
+            selected.pop()
+        data = [values + [""] * (len(names) - len(values)) for _, values in selected]
+        result[name] = TextParser([names] + data, header=0, skip_blank_lines=False).read()
+    return result
+
+
+def read_sheet(file_path, sheet_name=0, columns=None, optional_columns=None, where=None):
+    """Reads one sheet into a DataFrame, converting only the requested columns.
+
+    where is an optional row filter applied while parsing; see read_selections.
+    """
+    return read_selections(file_path, {"": where}, sheet_name, columns, optional_columns)[""]
@@ -0,0 +1,152 @@
+"""Splitting a DataFrame into one Excel file per location (or any other key column).
+
+Filtering the whole frame once per location (df[df['Location'] == location]) scans
+every row for every location. split_to_files() partitions the frame in one groupby
+pass and hands the partitions to a bounded pool of writer threads:
+
+    manifest = split_to_files(df, 'Location', output_folder, write=save_location_file)
+    print(format_manifest("Location files", manifest))
+
+    python -m scs_core.splitter --benchmark
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from scs_core.writer import ReportWriter
+
+# One line of the manifest returned by split_to_files
+SplitResult = namedtuple("SplitResult", ["key", "file", "rows", "seconds", "error"])
+
+DEFAULT_WORKERS = 4
+MAX_NAME_LENGTH = 120
+
+# Characters Windows does not allow in file names, and names it reserves for devices
+INVALID_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+RESERVED_NAMES = {"CON", "PRN", "AUX", "NUL"} | {f"{p}{i}" for p in ("COM", "LPT") for i in range(1, 10)}
+
+
+def safe_filename(value, taken=None, suffix=".xlsx"):
+    """File name for a key value: invalid characters become '_', and a name already in
+    taken (compared case-insensitively, as Windows does) gets _2, _3, ... appended.
+    The chosen name is added to taken.
+    """
+    name = INVALID_CHARS.sub("_", str(value)).strip().rstrip(".")[:MAX_NAME_LENGTH] or "blank"
+    if name.upper() in RESERVED_NAMES:
+        name = f"{name}_"
+
+    candidate = f"{name}{suffix}"
+    if taken is not None:
+        count = 1
+        while candidate.lower() in taken:
+            count += 1
+            candidate = f"{name}_{count}{suffix}"
+        taken.add(candidate.lower())
+    return candidate
+
+
+def save_partition(df, file_path):
+    """Default partition writer: one plain sheet with fitted column widths."""
+    with ReportWriter(file_path) as writer:
+        writer.write_sheet(df, "Sheet1")
+
+
+def _write(write, key, df, file_path):
+    start = time.perf_counter()
+    try:
+        write(df, file_path)
+        return SplitResult(key, file_path, len(df), time.perf_counter() - start, None)
+    except Exception as e:
+        return SplitResult(key, file_path, len(df), time.perf_counter() - start, str(e))
+
+
+def split_to_files(df, column, output_folder, write=save_partition, name=None, columns=None,
+                   workers=DEFAULT_WORKERS, dropna=True):
+    """Writes one file per distinct value of df[column] and returns the manifest.
+
+    write(partition, file_path) writes one file; name(key) gives the file name before
+    sanitising (default: the key itself); columns limits the columns written. Rows
+    with a blank key are skipped unless dropna=False. At most `workers` files are
+    written at the same time and only twice as many partitions wait in memory.
+    The manifest is a list of SplitResult in first-seen key order.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    workers = max(1, workers or 1)
+    taken = set()
+    slots = threading.BoundedSemaphore(workers * 2)
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key, part in df.groupby(column, sort=False, dropna=dropna, observed=True):
+            if columns is not None:
+                part = part[columns]
+            file_path = os.path.join(output_folder, safe_filename(name(key) if name else key, taken))
+
+            slots.acquire()
+            future = pool.submit(_write, write, key, part, file_path)
+            future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+
+    return [future.result() for future in futures]
+
+
+def format_manifest(title, manifest):
+    """Formats the files written by split_to_files as plain text."""
+    lines = [title]
+    for result in manifest:
+        status = f"FAILED: {result.error}" if result.error else f"{result.rows} rows"
+        lines.append(f"  {os.path.basename(result.file)}: {status} ({result.seconds:.2f}s)")
+    failed = [r for r in manifest if r.error]
+    total = sum(r.seconds for r in manifest)
+    lines.append(f"  {len(manifest)} files, {len(failed)} failed, {total:.2f}s writing")
+    return "\n".join(lines)
+
+
+def benchmark(rows=200000, locations=(10, 50, 200)):
+    """Times partitioning by mask per location against one groupby pass (no files written)."""
+    rng = np.random.default_rng(0)
+    results = []
+    for count in locations:
+        df = pd.DataFrame({
+            "Partnumber": rng.integers(100000, 999999, rows).astype(str),
+            "Qty": rng.integers(1, 50, rows),
+            "Location": rng.choice([f"LOC {i}/{i % 7}" for i in range(count)], rows),
+        })
+
+        start = time.perf_counter()
+        for location in df["Location"].unique():
+            df[df["Location"] == location]
+        mask_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _, part in df.groupby("Location", sort=False):
+            pass
+        groupby_seconds = time.perf_counter() - start
+
+        results.append((count, mask_seconds, groupby_seconds))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-location splitter benchmark")
+    parser.add_argument("--benchmark", action="store_true", help="Compare mask-per-location with groupby")
+    parser.add_argument("--rows", type=int, default=200000, help="Rows in the synthetic frame")
+    parser.add_argument("--locations", type=int, nargs="+", default=[10, 50, 200], help="Location counts")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        print(f"{'locations':>9} {'mask loop':>10} {'groupby':>8}")
+        for count, mask_seconds, groupby_seconds in benchmark(args.rows, args.locations):
+            print(f"{count:>9} {mask_seconds:>9.2f}s {groupby_seconds:>7.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Column widths computed from DataFrame columns instead of worksheet cells.
+
+Looping over openpyxl cells with len(str(cell.value)) costs minutes on 200k-row
+sheets; the same widths come from one vectorised string-length pass per column.
+"""
+import pandas as pd
+
+DEFAULT_MAX_WIDTH = 60
+
+# Widths of values Excel displays in a fixed shape
+DATETIME_WIDTH = 19  # yyyy-mm-dd hh:mm:ss
+BOOL_WIDTH = 5       # FALSE
+NUMBER_WIDTH = 11    # Excel's General format shows at most 11 characters of a number
+
+
+def longest_value(series, sample=None):
+    """Display length of the longest value of a column (0 when it is empty)."""
+    series = series.dropna()
+    if not len(series):
+        return 0
+    if sample and len(series) > sample:
+        series = series.sample(n=sample, random_state=0)
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return DATETIME_WIDTH
+    if pd.api.types.is_bool_dtype(series):
+        return BOOL_WIDTH
+    if pd.api.types.is_integer_dtype(series):
+        # The widest integer is the largest or the most negative one
+        return max(len(str(series.max())), len(str(series.min())))
+    if pd.api.types.is_float_dtype(series):
+        return min(int(series.astype(str).str.len().max()), NUMBER_WIDTH)
+    return int(series.astype(str).str.len().max())
+
+
+def column_widths(df, padding=2, sample=None, max_width=DEFAULT_MAX_WIDTH, index=False):
+    """Width of each column of df as written to Excel: longest value or header plus padding.
+
+    sample limits the rows measured per column (a random sample, so very long rare
+    values may be missed); max_width caps the result (None for no cap). With index=True
+    the index levels are measured too, for frames written with their index (pivots).
+    """
+    if index:
+        df = df.reset_index()
+    widths = []
+    for column in df.columns:
+        header = len(str(column[-1] if isinstance(column, tuple) else column))
+        width = max(longest_value(df[column], sample), header) + padding
+        widths.append(min(width, max_width) if max_width else width)
+    return widths
+
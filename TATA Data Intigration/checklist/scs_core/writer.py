@@ -0,0 +1,155 @@
+"""Single-pass styled Excel report writer.
+
+Data, header fills, borders, number formats, column widths and extra sheets (pivots,
+summaries) are written in one streaming pass with xlsxwriter's constant_memory mode,
+so a report is never written with to_excel and then reopened to be styled.
+
+    with ReportWriter(output_file) as writer:
+        writer.write_sheet(df, "Sheet1", header=HEADER, body=BORDERED)
+        writer.write_sheet(pivot_df, "Summary", header=dict(HEADER, bg_color=LIGHT_BLUE))
+
+Styles are plain xlsxwriter format dicts; equal dicts share one workbook format, and
+styles that need no border (alignment, number formats) are set once per column
+instead of on every cell. header_scheme() builds a report's header colours.
+"""
+import datetime
+
+import pandas as pd
+import xlsxwriter
+
+from scs_core.widths import column_widths
+
+LIGHT_GREEN = "#CCFFCC"
+LIGHT_BLUE = "#ADD8E6"
+YELLOW = "#FFFF00"
+
+# Header style of DataFrame.to_excel: bold, thin border, centred
+HEADER = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+CENTERED = {"align": "center", "valign": "vcenter"}
+BORDERED = {"border": 1}
+TEXT = {"num_format": "@"}
+
+# Same display as DataFrame.to_excel for datetime columns
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+# Borders stop at the last data row, so they have to be set on the cells themselves
+BORDER_KEYS = ("border", "top", "bottom", "left", "right")
+
+
+def header_scheme(columns, computed=(), computed_color=LIGHT_GREEN, source_color=LIGHT_BLUE):
+    """header_styles colouring computed columns (added by the script) and source columns."""
+    computed = set(computed)
+    return {column: {"bg_color": computed_color if column in computed else source_color} for column in columns}
+
+
+def _merge(styles):
+    props = {}
+    for style in styles:
+        if style:
+            props.update(style)
+    return props
+
+
+def _column_values(series):
+    """Python values of a column with NA as None (Timestamps are datetimes already)."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+class ReportWriter:
+    """Streams DataFrames into a styled .xlsx, one sheet after the other."""
+
+    def __init__(self, file_path, constant_memory=True):
+        self.file_path = file_path
+        self.workbook = xlsxwriter.Workbook(file_path, {
+            "constant_memory": constant_memory,
+            "nan_inf_to_errors": True,
+            "strings_to_urls": False,
+            "default_date_format": DATETIME_FORMAT,
+        })
+        self._formats = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        self.workbook.close()
+
+    def format(self, *styles):
+        """Returns the workbook format for the merged style dicts (created once per style)."""
+        props = _merge(styles)
+        if not props:
+            return None
+        key = tuple(sorted(props.items()))
+        if key not in self._formats:
+            self._formats[key] = self.workbook.add_format(props)
+        return self._formats[key]
+
+    def write_sheet(self, df, sheet_name="Sheet1", header=HEADER, header_styles=None, body=None,
+                    column_styles=None, last_row=None, widths="auto"):
+        """Writes df as one sheet in a single pass.
+
+        header styles the header row and header_styles {column: style} adds to single
+        header cells (e.g. a fill per column group). body styles every data cell,
+        column_styles {column: style} adds to the cells of single columns (number
+        formats, bold totals) and last_row adds to the last data row (grand totals).
+        widths is "auto" (see scs_core.widths), a list of widths, or None.
+        Returns the worksheet.
+        """
+        worksheet = self.workbook.add_worksheet(sheet_name)
+        columns = list(df.columns)
+        header_styles = header_styles or {}
+        column_styles = dict(column_styles or {})
+
+        # Datetime columns keep a date display even when the cells carry their own style
+        datetime_columns = {column for column in columns if pd.api.types.is_datetime64_any_dtype(df[column])}
+        for column in datetime_columns:
+            if "num_format" not in column_styles.get(column, {}):
+                column_styles[column] = dict(column_styles.get(column, {}), num_format=DATETIME_FORMAT)
+
+        if widths == "auto":
+            widths = column_widths(df)
+        widths = widths or [None] * len(columns)
+
+        # Borderless column styles become the column's own format and the cells carry none.
+        # Datetime cells always carry theirs, as a cell without one gets the default date format.
+        body_formats = []
+        for idx, column in enumerate(columns):
+            props = _merge((body, column_styles.get(column)))
+            column_format = self.format(props)
+            per_cell = column in datetime_columns or any(key in props for key in BORDER_KEYS)
+            if widths[idx] is not None or (column_format is not None and not per_cell):
+                worksheet.set_column(idx, idx, widths[idx], None if per_cell else column_format)
+            body_formats.append(column_format if per_cell else None)
+
+        for idx, column in enumerate(columns):
+            worksheet.write_string(0, idx, str(column), self.format(header, header_styles.get(column)))
+
+        last_formats = [self.format(body, column_styles.get(column), last_row) for column in columns]
+        values = [_column_values(df[column]) for column in columns]
+        row_count = len(df)
+
+        for row_idx in range(row_count):
+            formats = last_formats if last_row and row_idx == row_count - 1 else body_formats
+            for col_idx, column_values in enumerate(values):
+                self._write_cell(worksheet, row_idx + 1, col_idx, column_values[row_idx], formats[col_idx])
+        return worksheet
+
+    @staticmethod
+    def _write_cell(worksheet, row, col, value, cell_format):
+        if value is None:
+            if cell_format is not None:
+                worksheet.write_blank(row, col, None, cell_format)
+        elif isinstance(value, str):
+            worksheet.write_string(row, col, value, cell_format)
+        elif isinstance(value, bool):
+            worksheet.write_boolean(row, col, value, cell_format)
+        elif isinstance(value, (int, float)):
+            worksheet.write_number(row, col, value, cell_format)
+        elif isinstance(value, (datetime.datetime, datetime.date)):
+            worksheet.write_datetime(row, col, value, cell_format)
+        else:
+            worksheet.write(row, col, str(value), cell_format)
@@ -0,0 +1,20 @@
+"""Shared fixtures for the scs_core tests (run with: python -m pytest checklist/tests)."""
+import os
+import sys
+
+import pytest
+
+# scs_core lives in the checklist folder, next to the report scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Every test gets its own parse cache folder, so nothing is read from or left in the user's cache."""
+    from scs_core import cache
+
+    folder = tmp_path / "cache"
+    monkeypatch.setenv("SCS_CACHE_DIR", str(folder))
+    # The process-wide cache is created again in the test's folder
+    monkeypatch.setattr(cache, "_default_cache", None)
+    return folder
@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import openpyxl
+import pandas as pd
+
+from scs_core.cache import ParseCache, file_fingerprint
+from scs_core.reader import read_excel
+
+
+def _touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+def _text_file(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_fingerprint_follows_content_not_mtime(tmp_path):
+    path = _text_file(tmp_path, "a.xlsx", "one")
+    before = file_fingerprint(path)
+    _touch(path)
+    touched = file_fingerprint(path)
+    assert touched["hash"] == before["hash"] and touched["mtime"] != before["mtime"]
+
+    (tmp_path / "a.xlsx").write_text("two")
+    assert file_fingerprint(path)["hash"] != before["hash"]
+
+
+def test_get_and_put(tmp_path, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    path = _text_file(tmp_path, "a.xlsx", "one")
+    df = pd.DataFrame({"Part #": ["0012", "P1"], "Qty": [1, 2]})
+    cache.put(path, {"sheet_name": 0}, df)
+
+    pd.testing.assert_frame_equal(cache.get(path, {"sheet_name": 0}), df)
+    # Other read options are another entry
+    assert cache.get(path, {"sheet_name": 1}) is None
+
+
+def test_sheet_dicts_keep_their_order(tmp_path, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    path = _text_file(tmp_path, "a.xlsx", "one")
+    sheets = {"Zeta": pd.DataFrame({"a": [1]}), "Alpha": pd.DataFrame({"b": ["x"]})}
+    cache.put(path, {"sheet_name": None}, sheets)
+    assert list(cache.get(path, {"sheet_name": None})) == ["Zeta", "Alpha"]
+
+
+def test_new_version_replaces_the_old_entries(tmp_path, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    path = _text_file(tmp_path, "a.xlsx", "one")
+    cache.put(path, {}, pd.DataFrame({"a": [1]}))
+    (tmp_path / "a.xlsx").write_text("two")
+    assert cache.get(path, {}) is None
+
+    cache.put(path, {}, pd.DataFrame({"a": [2]}))
+    assert cache.info()[0] == 1
+    assert cache.get(path, {})["a"].tolist() == [2]
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    paths = [_text_file(tmp_path, f"{name}.xlsx", name) for name in "abc"]
+    for path in paths[:2]:
+        cache.put(path, {}, pd.DataFrame({"a": range(100)}))
+    size = cache.info()[1] / 2
+
+    # Room for two entries: "a" was used last, so "b" goes
+    cache.max_bytes = int(size * 2.5)
+    assert cache.get(paths[0], {}) is not None
+    cache.put(paths[2], {}, pd.DataFrame({"a": range(100)}))
+    assert cache.get(paths[1], {}) is None
+    assert cache.get(paths[0], {}) is not None and cache.get(paths[2], {}) is not None
+
+
+def _put_many(cache_dir, folder, worker):
+    cache = ParseCache(cache_dir)
+    for i in range(5):
+        path = os.path.join(folder, f"{worker}_{i}.xlsx")
+        with open(path, "w") as f:
+            f.write(f"{worker} {i}")
+        cache.put(path, {}, pd.DataFrame({"worker": [worker], "i": [i]}))
+
+
+def test_concurrent_processes_keep_every_entry(tmp_path, cache_dir):
+    # Every index update is made under the lock file, so no process overwrites another's entries
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_put_many, [str(cache_dir)] * 4, [str(tmp_path)] * 4, range(4)))
+    assert ParseCache(str(cache_dir)).info()[0] == 20
+
+
+def test_read_excel_sees_a_replaced_workbook(tmp_path):
+    path = str(tmp_path / "stock.xlsx")
+    for qty in (1, 2):
+        wb = openpyxl.Workbook()
+        wb.active.append(["Part #", "Qty"])
+        wb.active.append(["P1", qty])
+        wb.save(path)
+        assert read_excel(path)["Qty"].tolist() == [qty]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from scs_core.collector import FrameCollector
+
+
+def _build(*frames, **kwargs):
+    collector = FrameCollector(**kwargs)
+    for df in frames:
+        collector.add(df)
+    return collector.build()
+
+
+def test_int_and_float_files_combine_as_float():
+    df = _build(pd.DataFrame({"Qty": [1, 2]}), pd.DataFrame({"Qty": [0.5]}))
+    assert df["Qty"].dtype == np.float64
+    assert df["Qty"].tolist() == [1.0, 2.0, 0.5]
+
+
+def test_all_na_column_does_not_turn_the_others_into_object():
+    dates = pd.DataFrame({"Date": pd.to_datetime(["2024-05-01"])})
+    blank = pd.DataFrame({"Date": [np.nan, np.nan]})
+    df = _build(dates, blank)
+    assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+    assert df["Date"].isna().tolist() == [False, True, True]
+
+
+def test_missing_column_leaves_ints_as_float_gaps():
+    df = _build(pd.DataFrame({"Part #": ["P1"], "Qty": [3]}), pd.DataFrame({"Part #": ["P2"]}))
+    assert list(df.columns) == ["Part #", "Qty"]
+    assert df["Qty"].dtype == np.float64 and np.isnan(df["Qty"].iloc[1])
+
+
+def test_numbers_and_text_combine_as_object():
+    # e.g. a dealer whose Part # column was read as numbers
+    df = _build(pd.DataFrame({"Part #": [12345]}), pd.DataFrame({"Part #": ["A-1"]}))
+    assert df["Part #"].dtype == object
+    assert df["Part #"].tolist() == [12345, "A-1"]
+
+
+def test_bools_with_gaps_stay_bools():
+    df = _build(pd.DataFrame({"VOR": [True]}), pd.DataFrame({"Part #": ["P2"]}))
+    assert df["VOR"].tolist()[0] is True and pd.isna(df["VOR"].iloc[1])
+
+
+def test_fixed_columns_and_provenance():
+    collector = FrameCollector(columns=["Qty", "Location"])
+    collector.add(pd.DataFrame({"Qty": [1, 2], "Extra": ["x", "y"]}), provenance={"Source File": "a.xlsx"})
+    collector.add(pd.DataFrame({"Location": ["LKO"]}), provenance={"Source File": "b.xlsx"})
+    df = collector.build()
+    assert list(df.columns) == ["Qty", "Location", "Source File"]
+    assert isinstance(df["Source File"].dtype, pd.CategoricalDtype)
+    assert df["Source File"].tolist() == ["a.xlsx", "a.xlsx", "b.xlsx"]
+
+
+def test_no_frames_gives_the_columns():
+    assert list(_build(columns=["Part #", "Qty"]).columns) == ["Part #", "Qty"]
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scs_core.locations import LocationResolver, build_index, location_keys
+
+
+@pytest.fixture
+def master(tmp_path):
+    path = tmp_path / "All Location.csv"
+    pd.DataFrame({"Code": [1002, "LKO1", 1002], "Final Location": ["Kanpur", "Lucknow", "Kanpur City"]}).to_csv(path, index=False)
+    return str(path)
+
+
+def test_keys_are_stripped_text_and_whole_floats_lose_the_point():
+    keys = location_keys([1002.0, " LKO1 ", 1002, np.nan, 12.5])
+    assert keys.tolist()[:3] == ["1002", "LKO1", "1002"]
+    assert pd.isna(keys.iloc[3]) and keys.iloc[4] == "12.5"
+
+
+def test_mixed_column_matches_numeric_master_keys(master):
+    # Dealer exports mix codes read as floats with text codes in one column
+    codes = pd.Series([1002.0, "LKO1", "1002 "], dtype=object)
+    assert LocationResolver().resolve(codes, "code", master).tolist() == ["Kanpur City", "Lucknow", "Kanpur City"]
+
+
+def test_repeated_master_keys_keep_the_last_row():
+    index = build_index([1002, 1002.0, "LKO1"], ["Kanpur", "Kanpur City", "Lucknow"])
+    assert index.to_dict() == {"1002": "Kanpur City", "LKO1": "Lucknow"}
+
+
+def test_unmatched_keys_are_counted_and_default_fills_them(master):
+    resolver = LocationResolver()
+    codes = pd.Series(["X9", "LKO1", "X9", np.nan], index=[10, 11, 12, 13])
+    resolved = resolver.resolve(codes, "code", master, default=codes)
+    assert resolved.index.tolist() == [10, 11, 12, 13]
+    assert resolved.tolist()[:3] == ["X9", "Lucknow", "X9"]
+    # Blank keys are neither resolved nor reported
+    assert pd.isna(resolved.iloc[3])
+    assert resolver.unmatched == {"code": {"X9": 2}}
+
+
+def test_blank_column_resolves_to_the_default(master):
+    codes = pd.Series([np.nan, np.nan])
+    assert LocationResolver().resolve(codes, "code", master, default="").tolist() == ["", ""]
+
+
+def test_changed_master_is_read_again(master):
+    resolver = LocationResolver()
+    assert resolver.resolve(pd.Series(["LKO1"]), "code", master).tolist() == ["Lucknow"]
+    pd.DataFrame({"Code": ["LKO1"], "Final Location": ["Lucknow Retail"]}).to_csv(master, index=False)
+    stat = os.stat(master)
+    os.utime(master, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert resolver.resolve(pd.Series(["LKO1"]), "code", master).tolist() == ["Lucknow Retail"]
+
+
+def test_built_in_sm_auto_sites():
+    assert LocationResolver().resolve(pd.Series(["C1.3LKO.RET"]), "site").tolist() == ["Lucknow Retail"]
+
+
+def test_missing_columns_are_reported(tmp_path):
+    path = tmp_path / "locations.csv"
+    pd.DataFrame({"Code": [1]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="Final Location"):
+        LocationResolver().index("code", str(path))
@@ -0,0 +1,85 @@
+import os
+
+import openpyxl
+import pytest
+
+from scs_core.cache import ParseCache
+from scs_core.compiler import compile_files, list_excel_files
+from scs_core.manifest import CompileManifest
+
+
+def _save(folder, name, rows):
+    """Writes rows (the first one is the header) to the first sheet of a new workbook."""
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    path = os.path.join(folder, name)
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "OTC INVOICE"
+    folder.mkdir()
+    _save(folder, "a.xlsx", [["Part", "Qty"], ["P1", 1], ["P2", 2]])
+    _save(folder, "b.xlsx", [["Part", "Qty"], ["P3", 3]])
+    return str(folder)
+
+
+def _compile(folder, cache):
+    manifest = CompileManifest(folder, cache=cache)
+    files = list_excel_files(folder)
+    manifest.prune(files)
+    df, reports = compile_files(files, manifest=manifest)
+    return df, {report.file: report.cached for report in reports}
+
+
+def test_unchanged_files_come_from_the_manifest(folder, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    first, cached = _compile(folder, cache)
+    assert cached == {"a.xlsx": False, "b.xlsx": False}
+
+    second, cached = _compile(folder, cache)
+    assert cached == {"a.xlsx": True, "b.xlsx": True}
+    assert second.equals(first)
+
+
+def test_touched_file_keeps_its_block(folder, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    _compile(folder, cache)
+    path = os.path.join(folder, "a.xlsx")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    manifest = CompileManifest(folder, cache=cache)
+    assert manifest.changed(path) is None
+    assert manifest.block(path)["Part"].tolist() == ["P1", "P2"]
+
+
+def test_changed_and_deleted_files(folder, cache_dir):
+    cache = ParseCache(str(cache_dir))
+    _compile(folder, cache)
+    _save(folder, "a.xlsx", [["Part", "Qty"], ["P9", 9]])
+    os.remove(os.path.join(folder, "b.xlsx"))
+
+    df, cached = _compile(folder, cache)
+    assert cached == {"a.xlsx": False}
+    assert df["Part"].tolist() == ["P9"]
+    # The old version and the deleted file leave nothing behind in the cache
+    key = CompileManifest.key(os.path.join(folder, "a.xlsx"))
+    current = CompileManifest(folder, cache=cache).entries[key]["hash"]
+    assert {(entry["path"], entry["hash"]) for entry in cache._load_index().values()} == {(key, current)}
+
+
+def test_blocks_are_bounded_by_the_cache_size(folder, cache_dir):
+    # Room for about one block: the least recently used one is evicted and read again
+    cache = ParseCache(str(cache_dir), max_bytes=1)
+    _compile(folder, cache)
+    assert cache.info()[0] <= 1
+
+    df, cached = _compile(folder, cache)
+    assert df["Part"].tolist() == ["P1", "P2", "P3"]
+    assert not all(cached.values())
+    assert not [name for name in os.listdir(CompileManifest(folder, cache=cache).store_dir)
+                if name.endswith((".parquet", ".pkl"))]
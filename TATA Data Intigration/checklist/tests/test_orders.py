@@ -0,0 +1,69 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scs_core import orders
+from scs_core.orders import DEFAULT_FAMILIES, compile_families, family_prefixes, load_families, order_families
+
+
+@pytest.fixture(params=["arrow", "python"])
+def engine(request, monkeypatch):
+    # Both code paths must tag the same way
+    if request.param == "arrow" and not orders.HAS_ARROW:
+        pytest.skip("pyarrow is not installed")
+    monkeypatch.setattr(orders, "HAS_ARROW", request.param == "arrow")
+    return request.param
+
+
+def _tags(values, families):
+    return order_families(pd.Series(values, dtype=object), compile_families(families)).tolist()
+
+
+def test_longest_prefix_wins(engine):
+    families = {"Short": ["ICP"], "Long": ["ICPPUR"]}
+    tags = _tags(["ICPPUR12", "ICP99", "ICX1"], families)
+    assert tags[:2] == ["Long", "Short"] and pd.isna(tags[2])
+
+
+def test_only_prefixes_match_not_substrings(engine):
+    # The old str.contains filter also dropped orders that merely contained a prefix
+    tags = _tags(["CPPUR1", "SO-CPPUR1", "XSAP-2001", "SAP-2001"], DEFAULT_FAMILIES)
+    assert tags[0] == "Non TATA" and tags[3] == "SAP-200"
+    assert pd.isna(tags[1]) and pd.isna(tags[2])
+
+
+def test_numbers_and_blanks_belong_to_no_family(engine):
+    tags = _tags([123456, np.nan, None, "EICPUR7"], DEFAULT_FAMILIES)
+    assert [pd.isna(tag) for tag in tags] == [True, True, True, False]
+
+
+def test_result_is_a_categorical_aligned_with_the_input():
+    values = pd.Series(["SAP-0001", "TMPUR1"], index=[7, 3])
+    tagged = order_families(values, compile_families(DEFAULT_FAMILIES))
+    assert tagged.index.tolist() == [7, 3]
+    assert list(tagged.cat.categories) == list(DEFAULT_FAMILIES)
+
+
+def test_prefix_in_two_families_is_rejected():
+    with pytest.raises(ValueError, match="CPPUR"):
+        compile_families({"Non TATA": ["CPPUR"], "Other": ["CPPUR"]})
+
+
+def test_prefixes_file_is_read_again_when_it_changes(tmp_path):
+    path = tmp_path / "Order prefixes.json"
+    path.write_text(json.dumps({"Non TATA": ["CPPUR"]}))
+    assert family_prefixes("Non TATA", load_families(str(path))) == ["CPPUR"]
+
+    path.write_text(json.dumps({"Non TATA": ["CPPUR", "ECPUR"]}))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert family_prefixes("Non TATA", load_families(str(path))) == ["CPPUR", "ECPUR"]
+    with pytest.raises(ValueError, match="SAP-000"):
+        family_prefixes("SAP-000", load_families(str(path)))
+
+
+def test_missing_prefixes_file_uses_the_defaults(tmp_path):
+    assert load_families(str(tmp_path / "missing.json")).families == list(DEFAULT_FAMILIES)
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scs_core.partmaster import PartMaster, get_partmaster, part_keys, part_number, part_text
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        "Part Number": ["12345", "A-1", "12345", np.nan],
+        "Category": ["Fast", "Slow", "Dead", "Blank"],
+        "LandedCost": [10.0, 2.5, 99.0, 1.0],
+    })
+
+
+@pytest.mark.parametrize("value, expected", [
+    (12345, "12345"), (12345.0, "12345"), ("12345.0 ", "12345"), (" 0012", "0012"),
+    ("AB-12.50", "AB-12.50"), (np.nan, None), (None, None), ("nan", None), ("", None),
+])
+def test_part_number_text(value, expected):
+    assert part_number(value) == expected
+
+
+def test_keys_are_upper_cased_text():
+    values = pd.Series([12345.0, "ab-1", "AB-1", np.nan], index=[3, 1, 2, 0])
+    assert part_keys(values).tolist() == ["12345", "AB-1", "AB-1", None]
+    # Report text keeps the case of the input
+    assert part_text(values).tolist() == ["12345", "ab-1", "AB-1", None]
+    assert part_keys(values).index.tolist() == [3, 1, 2, 0]
+
+
+def test_numbers_and_text_find_the_same_row(table):
+    # One dealer file reads Part # as numbers, another as text with a float artefact
+    partmaster = PartMaster(table)
+    parts = pd.Series([12345, 12345.0, "12345.0", " 12345", "a-1"], dtype=object)
+    assert partmaster.lookup(parts, ["Category"])["Category"].tolist() == ["Fast", "Fast", "Fast", "Fast", "Slow"]
+    assert 12345.0 in partmaster and "a-1" in partmaster and np.nan not in partmaster
+
+
+def test_duplicate_part_numbers_keep_the_first_row(table):
+    # A merge against the raw master repeated the input row for every duplicate
+    partmaster = PartMaster(table)
+    assert len(partmaster) == 2
+    assert partmaster.lookup(pd.Series(["12345"]), ["Category"])["Category"].tolist() == ["Fast"]
+
+
+def test_attach_keeps_the_rows_and_index_of_the_input(table):
+    df = pd.DataFrame({"Part #": ["12345", "ZZZ", "A-1", "12345"], "Qty": [1, 2, 3, 4]}, index=[5, 6, 7, 8])
+    out = PartMaster(table).attach(df, "Part #", {"Category": "Catg", "LandedCost": "Rate"})
+    assert out.index.tolist() == [5, 6, 7, 8]
+    assert out["Catg"].fillna("-").tolist() == ["Fast", "-", "Slow", "Fast"]
+    assert out["Rate"].fillna(-1).tolist() == [10.0, -1, 2.5, 10.0]
+    assert "Catg" not in df.columns
+
+
+def test_missing_key_column():
+    with pytest.raises(ValueError, match="Part Number"):
+        PartMaster(pd.DataFrame({"Part": ["1"]}))
+
+
+def test_get_partmaster_reads_again_only_when_the_file_changed(tmp_path, table):
+    path = str(tmp_path / "Partmaster.xlsx")
+    table.to_excel(path, index=False)
+    first = get_partmaster(path)
+    assert get_partmaster(path) is first
+
+    table.assign(Category="New").to_excel(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_partmaster(path) is not first
+    assert get_partmaster(path).lookup(pd.Series(["A-1"]), ["Category"])["Category"].tolist() == ["New"]
@@ -0,0 +1,82 @@
+import datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from scs_core.sheetxml import SchemaError, read_sheet, read_selections
+
+
+def _save(tmp_path, name, cells):
+    """Writes {cell reference: value} to the first sheet of a new workbook."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for ref, value in cells.items():
+        ws[ref] = value
+    path = tmp_path / name
+    wb.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def intransit(tmp_path):
+    # Blank middle row (4), data right of the last header (E5), blanks in text columns
+    return _save(tmp_path, "intransit.xlsx", {
+        "A1": "Part #", "B1": "Qty", "C1": "Status", "D1": "Date",
+        "A2": "P1", "B2": 5, "C2": "In Transit", "D2": datetime.datetime(2024, 5, 1),
+        "A3": "P2", "B3": 2.5, "C3": "Reserved",
+        "A5": "P3", "C5": "In Transit", "E5": "note",
+        "A6": "P1", "B6": 7, "C6": "In Transit", "D6": datetime.datetime(2024, 5, 3),
+    })
+
+
+def test_full_read_matches_read_excel(intransit):
+    pd.testing.assert_frame_equal(read_sheet(intransit), pd.read_excel(intransit, engine="openpyxl"))
+
+
+def test_blank_first_row_matches_read_excel(tmp_path):
+    path = _save(tmp_path, "offset.xlsx", {"A2": "Part #", "B2": "Qty", "A3": "P1", "B3": 1})
+    pd.testing.assert_frame_equal(read_sheet(path), pd.read_excel(path, engine="openpyxl"))
+
+
+def test_blank_first_row_has_no_named_header(tmp_path):
+    path = _save(tmp_path, "offset.xlsx", {"A2": "Part #", "A3": "P1"})
+    with pytest.raises(SchemaError):
+        read_sheet(path, columns=["Part #"])
+
+
+def test_projection_matches_read_excel(intransit):
+    expected = pd.read_excel(intransit, engine="openpyxl", usecols=["Part #", "Status"])
+    pd.testing.assert_frame_equal(read_sheet(intransit, columns=["Part #", "Status"]), expected)
+
+
+def test_filter_matches_masked_read_excel(intransit):
+    full = pd.read_excel(intransit, engine="openpyxl")
+    expected = full[full["Status"] == "In Transit"][["Part #", "Qty"]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(read_sheet(intransit, columns=["Part #", "Qty"], where={"Status": "In Transit"}),
+                                  expected)
+
+
+def test_blanks_are_nan_not_none(intransit):
+    df = read_sheet(intransit)
+    assert not df.map(lambda value: value is None).any(axis=None)
+    assert df.loc[2, "Part #"] != df.loc[2, "Part #"]  # blank middle row is NaN
+    assert "None" not in df["Status"].astype(str).tolist()
+
+
+def test_selections_share_one_pass(intransit):
+    frames = read_selections(intransit, {"transit": {"Status": "In Transit"}, "reserved": {"Status": "Reserved"}},
+                             columns=["Part #"])
+    assert frames["transit"]["Part #"].tolist() == ["P1", "P3", "P1"]
+    assert frames["reserved"]["Part #"].tolist() == ["P2"]
+
+
+def test_missing_columns_raise_schema_error(intransit):
+    with pytest.raises(SchemaError) as error:
+        read_sheet(intransit, columns=["Part #", "Vendor"])
+    assert error.value.missing == ["Vendor"]
+
+
+def test_optional_columns_are_skipped_when_absent(intransit):
+    df = read_sheet(intransit, columns=["Part #"], optional_columns=["Vendor", "Qty"])
+    assert list(df.columns) == ["Part #", "Qty"]
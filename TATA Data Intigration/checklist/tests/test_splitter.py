@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from scs_core.splitter import safe_filename, split_to_files
+
+
+def _record(written):
+    def write(df, file_path):
+        written[os.path.basename(file_path)] = df.reset_index(drop=True)
+    return write
+
+
+def test_rows_without_location_are_skipped(tmp_path):
+    # The old mask loop wrote these rows to "nan.xlsx"
+    df = pd.DataFrame({"Partnumber": ["1", "2", "3", "4"], "Location": ["Lucknow", np.nan, "Kanpur", None]})
+    written = {}
+    manifest = split_to_files(df, "Location", str(tmp_path), write=_record(written))
+    assert sorted(written) == ["Kanpur.xlsx", "Lucknow.xlsx"]
+    assert sum(result.rows for result in manifest) == 2
+
+
+def test_rows_without_location_kept_with_dropna_false(tmp_path):
+    df = pd.DataFrame({"Partnumber": ["1", "2"], "Location": ["Lucknow", np.nan]})
+    written = {}
+    split_to_files(df, "Location", str(tmp_path), write=_record(written), dropna=False)
+    assert len(written) == 2
+
+
+def test_colliding_names_get_numbered(tmp_path):
+    # "A/B", "A\\B" and "a_b" all sanitise to the same name on Windows (case-insensitive)
+    df = pd.DataFrame({"Partnumber": ["1", "2", "3"], "Location": ["A/B", "A\\B", "a_b"]})
+    written = {}
+    manifest = split_to_files(df, "Location", str(tmp_path), write=_record(written))
+    assert [os.path.basename(result.file) for result in manifest] == ["A_B.xlsx", "A_B_2.xlsx", "a_b_3.xlsx"]
+    assert [written[name]["Partnumber"].tolist() for name in ["A_B.xlsx", "A_B_2.xlsx", "a_b_3.xlsx"]] == \
+        [["1"], ["2"], ["3"]]
+
+
+def test_safe_filename_reserved_and_invalid_names():
+    taken = set()
+    assert safe_filename("CON", taken) == "CON_.xlsx"
+    assert safe_filename('Pune: "East"?', taken) == "Pune_ _East__.xlsx"
+    assert safe_filename("  ", taken) == "blank.xlsx"
+
+
+def test_write_errors_are_reported_not_raised(tmp_path):
+    def write(df, file_path):
+        if "Kanpur" in file_path:
+            raise OSError("file is open in Excel")
+
+    df = pd.DataFrame({"Partnumber": ["1", "2"], "Location": ["Lucknow", "Kanpur"]})
+    manifest = split_to_files(df, "Location", str(tmp_path), write=write)
+    assert [(result.key, result.error) for result in manifest] == [("Lucknow", None), ("Kanpur", "file is open in Excel")]
+
+
+def test_default_writer_writes_each_partition(tmp_path):
+    df = pd.DataFrame({"Partnumber": ["1", "2", "3"], "Qty": [1, 2, 3], "Location": ["X", "Y", "X"]})
+    split_to_files(df, "Location", str(tmp_path), columns=["Partnumber", "Qty"])
+    assert pd.read_excel(tmp_path / "X.xlsx")["Qty"].tolist() == [1, 3]